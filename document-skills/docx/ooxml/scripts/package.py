@@ -0,0 +1,196 @@
+"""
+Zip-native access to the parts of an Office file (.docx/.pptx/.xlsx).
+
+Package opens the file directly instead of unpacking it: a part is read (and
+inflated) only when it is accessed, and save() writes a new file in which every
+member that was not modified is copied as its still-compressed bytes. Untouched
+media and parts therefore cost one sequential copy, with no inflate/deflate
+round trip; only modified parts are compressed again.
+
+Usage:
+    from ooxml.scripts.package import Package
+
+    with Package("report.docx") as package:
+        xml = package.read("word/document.xml")
+        package.write("word/document.xml", xml.replace(b"Draft", b"Final"))
+        package.save("report-final.docx")  # Or save() to replace report.docx
+
+    # Edit a part with the docx XMLEditor, without extracting it
+    editor = XMLEditor("word/document.xml", package=package)
+    editor.save()  # Writes the part back into the package
+"""
+
+import io
+import os
+import shutil
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+try:
+    from pack import _compress_member, _copy_raw_member, _write_raw_member
+except ImportError:  # Imported as part of the ooxml.scripts package
+    from .pack import _compress_member, _copy_raw_member, _write_raw_member
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+
+class Package:
+    """Parts of an Office file, read lazily and saved by raw-copying unchanged members.
+
+    Part names are zip member names, e.g. "word/document.xml" or
+    "ppt/slides/slide1.xml". Writes are kept in memory until save().
+    """
+
+    def __init__(self, path):
+        """
+        Open an Office file.
+
+        Args:
+            path: Path to the .docx/.pptx/.xlsx file
+
+        Raises:
+            ValueError: If the file does not exist or is not a zip file
+        """
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise ValueError(f"File not found: {path}")
+        if not zipfile.is_zipfile(self.path):
+            raise ValueError(f"Not an Office file (zip): {path}")
+        self._open()
+
+    def _open(self):
+        self._zip = zipfile.ZipFile(self.path)
+        self._infos = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+        self._modified = {}  # Part name -> new bytes (also for added parts)
+        self._deleted = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the underlying file; unsaved changes are discarded."""
+        self._zip.close()
+
+    def __contains__(self, name):
+        return name in self._modified or (
+            name in self._infos and name not in self._deleted
+        )
+
+    def parts(self):
+        """Return the part names in package order; added parts come last."""
+        names = [name for name in self._infos if name not in self._deleted]
+        names.extend(name for name in self._modified if name not in self._infos)
+        return names
+
+    def is_modified(self, name):
+        """Return True if the part was added or its content changed since opening."""
+        return name in self._modified
+
+    def read(self, name):
+        """
+        Return the (uncompressed) content of a part.
+
+        Raises:
+            ValueError: If the part does not exist
+        """
+        if name in self._modified:
+            return self._modified[name]
+        if name not in self:
+            raise ValueError(f"Part not found: {name}")
+        return self._zip.read(self._infos[name])
+
+    def open(self, name):
+        """Return a binary stream of a part's content, inflated as it is read."""
+        if name in self._modified:
+            return io.BytesIO(self._modified[name])
+        if name not in self:
+            raise ValueError(f"Part not found: {name}")
+        return self._zip.open(self._infos[name])
+
+    def extract(self, name, target):
+        """Write the content of a part to the file target (parents are created)."""
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self.open(name) as source, open(target, "wb") as out:
+            shutil.copyfileobj(source, out)
+
+    def write(self, name, data):
+        """
+        Set the content of a part, adding it if it does not exist.
+
+        Content identical to the part as opened (same size and CRC-32) is not
+        recorded as a change, so save() keeps copying its compressed bytes.
+        """
+        self._deleted.discard(name)
+        info = self._infos.get(name)
+        if (
+            info is not None
+            and info.file_size == len(data)
+            and info.CRC == zlib.crc32(data)
+        ):
+            self._modified.pop(name, None)
+        else:
+            self._modified[name] = bytes(data)
+
+    def delete(self, name):
+        """Remove a part from the package."""
+        if name not in self:
+            raise ValueError(f"Part not found: {name}")
+        self._modified.pop(name, None)
+        if name in self._infos:
+            self._deleted.add(name)
+
+    def save(self, output=None):
+        """
+        Write the package to output (default: over the file it was opened from).
+
+        Unchanged members are copied without being decompressed; modified and
+        added parts are compressed. The file is written next to output and moved
+        into place, so saving over the opened file is safe. After that, the
+        package reflects the saved file.
+
+        Args:
+            output: Path of the .docx/.pptx/.xlsx file to write
+        """
+        output = Path(output) if output is not None else self.path
+        output.parent.mkdir(parents=True, exist_ok=True)
+        temp_name = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        # [Content_Types].xml goes first, as some consumers expect
+        names = sorted(self.parts(), key=lambda name: name != CONTENT_TYPES_PART)
+        try:
+            with zipfile.ZipFile(temp_name, "w") as zf:
+                for name in names:
+                    if name in self._modified:
+                        info = self._new_info(name)
+                        payload = _compress_member(info, self._modified[name])
+                        _write_raw_member(zf, info, payload)
+                    else:
+                        _copy_raw_member(zf, self._zip, self._infos[name])
+            os.replace(temp_name, output)
+        except BaseException:
+            temp_name.unlink(missing_ok=True)
+            raise
+
+        if output.resolve() == self.path.resolve():
+            self._zip.close()
+            self._open()
+
+    def _new_info(self, name):
+        """Return a ZipInfo for a modified or added part."""
+        original = self._infos.get(name)
+        if original is None:
+            return zipfile.ZipInfo(name, time.localtime()[:6])
+        info = zipfile.ZipInfo(name, original.date_time)
+        info.external_attr = original.external_attr
+        return info
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
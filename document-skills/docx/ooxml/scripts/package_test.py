@@ -0,0 +1,131 @@
+import unittest
+import tempfile
+import zipfile
+from pathlib import Path
+from pack import _read_raw_member
+from package import Package
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPackage(unittest.TestCase):
+
+    PARTS = {
+        "[Content_Types].xml": b'<?xml version="1.0"?><Types/>',
+        "word/document.xml": b"<w:document>" + b"<w:p/>" * 1000 + b"</w:document>",
+        "word/styles.xml": b"<w:styles/>",
+        "word/media/image1.png": bytes(range(256)) * 64,
+    }
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+        self.path = self.create_docx("source.docx")
+
+    def create_docx(self, name):
+        """Helper to create a file holding PARTS; level 1 makes recompressed members differ"""
+        path = self.temp_dir / name
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for part, data in self.PARTS.items():
+                zf.writestr(part, data)
+        return path
+
+    def open_package(self, path=None):
+        """Helper to open a Package closed at the end of the test"""
+        package = Package(path or self.path)
+        self.addCleanup(package.close)
+        return package
+
+    def raw_members(self, path):
+        """Helper to read the still-compressed bytes of every member of a file"""
+        with zipfile.ZipFile(path) as zf:
+            self.assertIsNone(zf.testzip())
+            return {info.filename: _read_raw_member(zf, info) for info in zf.infolist()}
+
+    def test_unchanged_members_keep_their_bytes(self):
+        """Test unchanged members are copied compressed, not recompressed"""
+        package = self.open_package()
+        package.write("word/styles.xml", b"<w:styles><w:style/></w:styles>")
+        output = self.temp_dir / "output.docx"
+        package.save(output)
+
+        source = self.raw_members(self.path)
+        saved = self.raw_members(output)
+        for name in ("[Content_Types].xml", "word/document.xml", "word/media/image1.png"):
+            self.assertEqual(saved[name], source[name])
+        self.assertNotEqual(saved["word/styles.xml"], source["word/styles.xml"])
+
+    def test_modified_added_and_deleted_parts(self):
+        """Test save() writes modified and added parts and leaves out deleted ones"""
+        package = self.open_package()
+        package.write("word/document.xml", b"<w:document/>")
+        package.write("word/footer1.xml", b"<w:ftr/>")
+        package.delete("word/styles.xml")
+        self.assertTrue(package.is_modified("word/document.xml"))
+        self.assertTrue(package.is_modified("word/footer1.xml"))
+        self.assertNotIn("word/styles.xml", package)
+        with self.assertRaises(ValueError):
+            package.read("word/styles.xml")
+
+        output = self.temp_dir / "output.docx"
+        package.save(output)
+        with zipfile.ZipFile(output) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(
+                zf.namelist(),
+                ["[Content_Types].xml", "word/document.xml", "word/media/image1.png", "word/footer1.xml"],
+            )
+            self.assertEqual(zf.read("word/document.xml"), b"<w:document/>")
+            self.assertEqual(zf.read("word/footer1.xml"), b"<w:ftr/>")
+            self.assertEqual(zf.read("word/media/image1.png"), self.PARTS["word/media/image1.png"])
+
+        # Saving elsewhere leaves the source file as it was
+        with zipfile.ZipFile(self.path) as zf:
+            self.assertEqual(zf.namelist(), list(self.PARTS))
+
+    def test_delete_missing_part(self):
+        """Test deleting a part that does not exist raises ValueError"""
+        package = self.open_package()
+        with self.assertRaises(ValueError):
+            package.delete("word/missing.xml")
+
+    def test_save_in_place_and_read_again(self):
+        """Test saving over the opened file, then reading it through the same Package"""
+        package = self.open_package()
+        package.write("word/document.xml", b"<w:document/>")
+        package.delete("word/styles.xml")
+        package.save()
+
+        self.assertFalse(package.is_modified("word/document.xml"))
+        self.assertEqual(package.read("word/document.xml"), b"<w:document/>")
+        self.assertEqual(package.read("word/media/image1.png"), self.PARTS["word/media/image1.png"])
+        self.assertNotIn("word/styles.xml", package)
+        self.assertEqual(list(self.temp_dir.iterdir()), [self.path])
+
+        reopened = self.open_package()
+        self.assertEqual(reopened.parts(), ["[Content_Types].xml", "word/document.xml", "word/media/image1.png"])
+        self.assertEqual(reopened.read("word/document.xml"), b"<w:document/>")
+
+    def test_identical_write_is_not_a_change(self):
+        """Test writing a part's original content does not mark it modified"""
+        package = self.open_package()
+        package.write("word/styles.xml", b"<w:styles><w:style/></w:styles>")
+        package.write("word/styles.xml", self.PARTS["word/styles.xml"])
+        package.write("word/document.xml", self.PARTS["word/document.xml"])
+        self.assertFalse(package.is_modified("word/styles.xml"))
+        self.assertFalse(package.is_modified("word/document.xml"))
+
+        output = self.temp_dir / "output.docx"
+        package.save(output)
+        self.assertEqual(self.raw_members(output), self.raw_members(self.path))
+
+    def test_not_a_zip_file(self):
+        """Test opening a file that is not a zip archive raises ValueError"""
+        path = self.temp_dir / "plain.docx"
+        path.write_text("not a zip")
+        with self.assertRaises(ValueError):
+            Package(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,29 +1,75 @@
 #!/usr/bin/env python3
 """Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
 
+import hashlib
+import io
 import random
 import sys
-import defusedxml.minidom
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+import lxml.etree
+
+try:
+    from pack import MAX_WORKERS, write_unpack_manifest
+except ImportError:  # Imported as part of the ooxml.scripts package
+    from .pack import MAX_WORKERS, write_unpack_manifest
+
+
+def unpack_document(input_file, output_dir):
+    """Extract an Office file into output_dir, pretty-printing its XML parts.
+
+    Members are streamed from the zip straight to their final location, and a
+    manifest of what was written lets pack.py copy untouched parts back as-is.
+
+    Args:
+        input_file: Path to the .docx/.pptx/.xlsx file
+        output_dir: Directory to extract into (created if missing)
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    output_root = output_path.resolve()
+
+    with zipfile.ZipFile(input_file) as zf:
+        members = [info for info in zf.infolist() if not info.is_dir()]
+
+        def extract(info):
+            target = (output_root / info.filename).resolve()
+            if not target.is_relative_to(output_root):
+                raise ValueError(f"Refusing to extract {info.filename} outside {output_dir}")
+
+            data = zf.read(info)
+            if target.name.lower().endswith((".xml", ".rels")):
+                data = pretty_print_xml_bytes(data)
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            return info.filename, hashlib.sha1(data).hexdigest()
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            part_hashes = dict(executor.map(extract, members))
+
+    write_unpack_manifest(output_path, input_file, part_hashes)
+
+
+def pretty_print_xml_bytes(content):
+    """Return content indented by two spaces and encoded as ASCII."""
+    parser = lxml.etree.XMLParser(resolve_entities=False, huge_tree=True)
+    tree = lxml.etree.parse(io.BytesIO(content), parser)
+    lxml.etree.indent(tree, space="  ")
+    body = lxml.etree.tostring(tree, encoding="ascii")
+    return b'<?xml version="1.0" encoding="ascii"?>\n' + body + b"\n"
+
+
+if __name__ == "__main__":
+    # Get command line arguments
+    assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
+    input_file, output_dir = sys.argv[1], sys.argv[2]
+
+    unpack_document(input_file, output_dir)
+
+    # For .docx files, suggest an RSID for tracked changes
+    if input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
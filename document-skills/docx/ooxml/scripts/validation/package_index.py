@@ -0,0 +1,233 @@
+"""
+Index of the parts, content types and relationships of an Office package.
+
+PackageIndex is built in a single pass over an unpacked directory or a
+.docx/.pptx/.xlsx file and answers the cross-part questions that validators
+and editing tools keep asking: which parts exist, what content type each one
+has, where each relationship points, and where each r:id is used.
+"""
+
+import posixpath
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+CONTENT_TYPES_PART = "[Content_Types].xml"
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+OFFICE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+
+# Written by unpack.py into the unpacked directory; not part of the package
+UNPACK_MANIFEST = ".unpack-manifest.json"
+
+
+class Relationship:
+    """A <Relationship> entry of a .rels part."""
+
+    def __init__(self, rels_part, rid, rel_type, target, target_mode, sourceline):
+        self.rels_part = rels_part
+        self.rid = rid
+        self.type = rel_type
+        self.target = target
+        self.target_mode = target_mode
+        self.sourceline = sourceline
+        # Part name the target resolves to, or None for external/empty targets
+        self.target_part = None
+        if target and not self.is_external:
+            base = posixpath.dirname(PackageIndex.source_part_for(rels_part))
+            if target.startswith("/"):
+                self.target_part = posixpath.normpath(target.lstrip("/"))
+            else:
+                self.target_part = posixpath.normpath(posixpath.join(base, target))
+
+    @property
+    def is_external(self):
+        """True for hyperlinks and other targets outside the package."""
+        return self.target_mode == "External" or self.target.startswith(
+            ("http", "mailto:")
+        )
+
+    @property
+    def type_name(self):
+        """Last segment of the relationship type URI, e.g. 'image'."""
+        return self.type.split("/")[-1] if "/" in self.type else self.type
+
+
+class RelationshipUsage:
+    """An r:* attribute in a part, e.g. r:id="rId3" on <w:hyperlink>."""
+
+    def __init__(self, part, attribute, rid, element, sourceline):
+        self.part = part
+        self.attribute = attribute  # Local name: "id", "embed", "link", ...
+        self.rid = rid
+        self.element = element  # Local name of the element carrying it
+        self.sourceline = sourceline
+
+
+class PackageIndex:
+    """Part names, content types, the relationship graph and r:id usage sites.
+
+    Build with from_dir() or from_zip(). Every part is parsed at most once;
+    large XML parts are streamed, so memory stays bounded.
+    """
+
+    def __init__(self):
+        self.parts = []  # Part names in package order, e.g. "word/document.xml"
+        self.part_set = set()
+        self.defaults = {}  # Lowercase extension -> content type
+        self.overrides = {}  # Part name -> content type
+        self.relationships = {}  # .rels part name -> [Relationship]
+        self.usages = {}  # Part name -> [RelationshipUsage]
+        self.root_tags = {}  # XML part name -> local name of its root element
+        self.errors = {}  # Part name -> exception raised while parsing it
+
+    @classmethod
+    def from_dir(cls, unpacked_dir, other_parts=()):
+        """Index an unpacked package directory.
+
+        Args:
+            unpacked_dir: The unpacked package
+            other_parts: Names of further parts of the package that are not in
+                unpacked_dir, e.g. media left in a .docx. Only their names are
+                indexed, so they must not be XML, .rels or [Content_Types].xml.
+        """
+        unpacked_dir = Path(unpacked_dir)
+        index = cls()
+        for path in unpacked_dir.rglob("*"):
+            if path.is_file() and path.name != UNPACK_MANIFEST:
+                index._add_part(
+                    path.relative_to(unpacked_dir).as_posix(),
+                    lambda path=path: open(path, "rb"),
+                )
+        for name in other_parts:
+            if name.endswith((".xml", ".rels")):
+                raise ValueError(f"XML part {name} must be in {unpacked_dir}")
+            if name not in index.part_set:
+                index._add_part(name, None)
+        return index
+
+    @classmethod
+    def from_zip(cls, package_file):
+        """Index a .docx/.pptx/.xlsx file without extracting it."""
+        index = cls()
+        with zipfile.ZipFile(package_file) as zf:
+            for info in zf.infolist():
+                if not info.is_dir():
+                    index._add_part(info.filename, lambda info=info: zf.open(info))
+        return index
+
+    @staticmethod
+    def rels_part_for(part):
+        """Return the .rels part holding the relationships of part.
+
+        e.g. "word/document.xml" -> "word/_rels/document.xml.rels" and
+        "" (the package itself) -> "_rels/.rels".
+        """
+        directory, name = posixpath.split(part)
+        return posixpath.join(directory, "_rels", f"{name}.rels")
+
+    @staticmethod
+    def source_part_for(rels_part):
+        """Inverse of rels_part_for(): the part whose relationships rels_part holds."""
+        rels_dir, name = posixpath.split(rels_part)
+        return posixpath.join(posixpath.dirname(rels_dir), name[: -len(".rels")])
+
+    def relationships_of(self, part):
+        """Return the Relationships whose source is part ("" for the package)."""
+        return self.relationships.get(self.rels_part_for(part), [])
+
+    def content_type(self, part):
+        """Return the declared content type of part, or None."""
+        if part in self.overrides:
+            return self.overrides[part]
+        extension = posixpath.splitext(part)[1].lstrip(".").lower()
+        return self.defaults.get(extension)
+
+    def referenced_parts(self):
+        """Return the set of parts targeted by at least one internal relationship."""
+        return {
+            rel.target_part
+            for rels in self.relationships.values()
+            for rel in rels
+            if rel.target_part is not None
+        }
+
+    def _add_part(self, name, open_part):
+        self.parts.append(name)
+        self.part_set.add(name)
+        try:
+            if name == CONTENT_TYPES_PART:
+                with open_part() as stream:
+                    self._index_content_types(stream)
+            elif name.endswith(".rels"):
+                with open_part() as stream:
+                    self._index_relationships(name, stream)
+            elif name.endswith(".xml"):
+                with open_part() as stream:
+                    self._index_xml_part(name, stream)
+        except Exception as e:
+            self.errors[name] = e
+
+    def _index_content_types(self, stream):
+        root = lxml.etree.parse(stream).getroot()
+        for override in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Override"):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                self.overrides[part_name.lstrip("/")] = override.get("ContentType")
+        for default in root.iter(f"{{{CONTENT_TYPES_NAMESPACE}}}Default"):
+            extension = default.get("Extension")
+            if extension is not None:
+                self.defaults[extension.lower()] = default.get("ContentType")
+
+    def _index_relationships(self, name, stream):
+        root = lxml.etree.parse(stream).getroot()
+        self.relationships[name] = [
+            Relationship(
+                name,
+                rel.get("Id"),
+                rel.get("Type", ""),
+                rel.get("Target", ""),
+                rel.get("TargetMode"),
+                rel.sourceline,
+            )
+            for rel in root.iter(f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship")
+        ]
+
+    def _index_xml_part(self, name, stream):
+        prefix = f"{{{OFFICE_RELATIONSHIPS_NAMESPACE}}}"
+        usages = []
+        for event, elem in lxml.etree.iterparse(
+            stream, events=("start", "end"), huge_tree=True
+        ):
+            if event == "start":
+                if name not in self.root_tags:
+                    self.root_tags[name] = lxml.etree.QName(elem).localname
+                for attr, value in elem.items():
+                    if attr.startswith(prefix):
+                        usages.append(
+                            RelationshipUsage(
+                                name,
+                                attr[len(prefix) :],
+                                value,
+                                lxml.etree.QName(elem).localname,
+                                elem.sourceline,
+                            )
+                        )
+            else:
+                # Release the finished subtree and any earlier siblings
+                elem.clear()
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+        if usages:
+            self.usages[name] = usages
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -2,8 +2,9 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
+import difflib
+import re
+import xml.etree.ElementTree as ET
 import zipfile
 from pathlib import Path
 
@@ -11,6 +12,11 @@ from pathlib import Path
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
+    # Changed paragraphs shown before the diff output is cut off
+    MAX_DIFF_LINES = 20
+    # Word-level tokens: runs of word characters, whitespace or punctuation
+    WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+
     def __init__(self, unpacked_dir, original_docx, verbose=False):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
@@ -27,92 +33,73 @@ class RedliningValidator:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
-        # First, check if there are any tracked changes by Claude to validate
+        # Parse once; the tree is reused for the comparison below
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
+            modified_root = ET.parse(modified_file).getroot()
+            parse_error = None
+        except ET.ParseError as e:
+            modified_root = None
+            parse_error = e
+
+        # First, check if there are any tracked changes by Claude to validate
+        if modified_root is not None:
+            author_attr = f"{{{self.namespaces['w']}}}author"
+            has_claude_changes = any(
+                elem.get(author_attr) == "Claude"
+                for tag in ("w:del", "w:ins")
+                for elem in modified_root.iterfind(f".//{tag}", self.namespaces)
+            )
 
             # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
+            if not has_claude_changes:
                 if self.verbose:
                     print("PASSED - No tracked changes by Claude found.")
                 return True
 
-        except Exception:
-            # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
-
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
-
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
-
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
-
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
-
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
-
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+        # Read the original document.xml straight from the docx
+        try:
+            with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
+                if "word/document.xml" not in zip_ref.namelist():
+                    print(
+                        f"FAILED - Original document.xml not found in {self.original_docx}"
+                    )
+                    return False
+                original_xml = zip_ref.read("word/document.xml")
+        except Exception as e:
+            print(f"FAILED - Error unpacking original docx: {e}")
+            return False
+
+        # Parse the original using xml.etree.ElementTree for redlining validation
+        try:
+            if parse_error is not None:
+                raise parse_error
+            original_root = ET.fromstring(original_xml)
+        except ET.ParseError as e:
+            print(f"FAILED - Error parsing XML files: {e}")
+            return False
+
+        # Remove Claude's tracked changes from both documents
+        self._remove_claude_tracked_changes(original_root)
+        self._remove_claude_tracked_changes(modified_root)
+
+        # Extract and compare text content paragraph by paragraph
+        modified_paragraphs = self._extract_paragraphs(modified_root)
+        original_paragraphs = self._extract_paragraphs(original_root)
+
+        if modified_paragraphs != original_paragraphs:
+            # Show detailed character-level differences for each paragraph
+            error_message = self._generate_detailed_diff(
+                original_paragraphs, modified_paragraphs
+            )
+            print(error_message)
+            return False
+
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
+
+    def _generate_detailed_diff(self, original_paragraphs, modified_paragraphs):
+        """Generate detailed character-level differences between paragraph lists."""
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -127,92 +114,73 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
+        word_diff = self._get_word_diff(original_paragraphs, modified_paragraphs)
+        error_parts.extend(["Differences:", "============", word_diff])
 
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
-
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
+    def _get_word_diff(self, original_paragraphs, modified_paragraphs):
+        """Diff two paragraph lists in git --word-diff=plain style.
+
+        Paragraphs are aligned first; each changed pair is then diffed by
+        character, or by word when the pair is mostly rewritten. Output stops
+        after MAX_DIFF_LINES changed paragraphs.
+        """
+        # Trim the common prefix and suffix so alignment only sees the changed span
+        start = 0
+        limit = min(len(original_paragraphs), len(modified_paragraphs))
+        while start < limit and original_paragraphs[start] == modified_paragraphs[start]:
+            start += 1
+        end = 0
+        while (
+            end < limit - start
+            and original_paragraphs[-1 - end] == modified_paragraphs[-1 - end]
+        ):
+            end += 1
+        original = original_paragraphs[start : len(original_paragraphs) - end]
+        modified = modified_paragraphs[start : len(modified_paragraphs) - end]
+
+        matcher = difflib.SequenceMatcher(None, original, modified, autojunk=False)
+        lines = []
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal":
+                continue
+            old = original[i1:i2]
+            new = modified[j1:j2]
+            # Paired paragraphs, then the deleted or inserted rest of the block.
+            # The limit is checked before each one: a single block can span
+            # thousands of paragraphs, each costing a character-level diff.
+            for k in range(max(len(old), len(new))):
+                if len(lines) == self.MAX_DIFF_LINES:
+                    lines.append(f"... (stopped after {self.MAX_DIFF_LINES} differences)")
+                    return "\n".join(lines)
+                if k < len(old) and k < len(new):
+                    lines.append(self._diff_paragraph(old[k], new[k]))
+                elif k < len(old):
+                    lines.append(f"[-{old[k]}-]")
+                else:
+                    lines.append(f"{{+{new[k]}+}}")
+        return "\n".join(lines)
+
+    def _diff_paragraph(self, original, modified):
+        """Mark up the changes between two paragraphs with [-...-] and {+...+}."""
+        matcher = difflib.SequenceMatcher(None, original, modified, autojunk=False)
+        # Character diffs of largely rewritten text are unreadable; use words
+        if matcher.quick_ratio() < 0.5 or matcher.ratio() < 0.5:
+            original = self.WORD_PATTERN.findall(original)
+            modified = self.WORD_PATTERN.findall(modified)
+            matcher = difflib.SequenceMatcher(None, original, modified, autojunk=False)
+
+        parts = []
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            if op == "equal":
+                parts.append("".join(original[i1:i2]))
+                continue
+            if i2 > i1:
+                parts.append(f"[-{''.join(original[i1:i2])}-]")
+            if j2 > j1:
+                parts.append(f"{{+{''.join(modified[j1:j2])}+}}")
+        return "".join(parts)
 
     def _remove_claude_tracked_changes(self, root):
         """Remove tracked changes authored by Claude from the XML root."""
@@ -251,8 +219,8 @@ class RedliningValidator:
                     parent.insert(del_index, child)
                 parent.remove(del_elem)
 
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
+    def _extract_paragraphs(self, root):
+        """Extract the text of each paragraph from Word XML.
 
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
@@ -261,18 +229,16 @@ class RedliningValidator:
         t_tag = f"{{{self.namespaces['w']}}}t"
 
         paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
+        for p_elem in root.iter(p_tag):
             # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
+            paragraph_text = "".join(
+                t_elem.text for t_elem in p_elem.iter(t_tag) if t_elem.text
+            )
             # Skip empty paragraphs - they don't affect content validation
             if paragraph_text:
                 paragraphs.append(paragraph_text)
 
-        return "\n".join(paragraphs)
+        return paragraphs
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+from validation.redlining import RedliningValidator
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestGetWordDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = RedliningValidator("unpacked", "original.docx")
+        self.limit = RedliningValidator.MAX_DIFF_LINES
+
+    def word_diff(self, original, modified):
+        """Helper to diff two paragraph lists, counting the paragraph diffs"""
+        diff_paragraph = mock.patch.object(
+            self.validator, "_diff_paragraph", wraps=self.validator._diff_paragraph
+        )
+        with diff_paragraph as spy:
+            lines = self.validator._get_word_diff(original, modified).split("\n")
+        return lines, spy.call_count
+
+    def test_large_replace_block_stops_at_limit(self):
+        """Test one replace block of thousands of paragraphs diffs only the first N"""
+        original = [f"Clause {i} applies to the seller." for i in range(3000)]
+        modified = [f"Section {i} binds the buyer instead." for i in range(3000)]
+        lines, diffed = self.word_diff(original, modified)
+        self.assertEqual(diffed, self.limit)
+        self.assertEqual(len(lines), self.limit + 1)
+        self.assertEqual(lines[-1], f"... (stopped after {self.limit} differences)")
+
+    def test_large_deletion_stops_at_limit(self):
+        """Test a block of deleted paragraphs is cut off at the limit"""
+        kept = ["Intro", "Outro"]
+        deleted = [f"Removed {i}" for i in range(500)]
+        lines, diffed = self.word_diff(kept[:1] + deleted + kept[1:], kept)
+        self.assertEqual(diffed, 0)
+        self.assertEqual(lines[: self.limit], [f"[-Removed {i}-]" for i in range(self.limit)])
+        self.assertEqual(lines[-1], f"... (stopped after {self.limit} differences)")
+
+    def test_exactly_limit_differences_not_cut_off(self):
+        """Test the cut-off note only appears when differences remain"""
+        original = [f"Old {i}" for i in range(self.limit)]
+        modified = [f"New {i}" for i in range(self.limit)]
+        lines, diffed = self.word_diff(original, modified)
+        self.assertEqual(diffed, self.limit)
+        self.assertEqual(len(lines), self.limit)
+        self.assertNotIn("stopped", lines[-1])
+
+    def test_changed_word_marked(self):
+        """Test a changed word inside a paragraph is marked in place"""
+        lines, _ = self.word_diff(
+            ["Same", "The fee is 10 dollars.", "End"],
+            ["Same", "The fee is 12 dollars.", "End"],
+        )
+        self.assertEqual(lines, ["The fee is 1[-0-]{+2+} dollars."])
+
+
+if __name__ == '__main__':
+    unittest.main()
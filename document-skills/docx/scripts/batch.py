@@ -0,0 +1,278 @@
+"""
+Batch driver: apply the same Document recipe to many .docx files.
+
+Every document is opened straight from its .docx (no unpack/pack round trip,
+see Document), edited by a recipe and saved with validation to the output
+directory, in a pool of worker processes. Workers are reused across
+documents, so per-process state such as the compiled XSD schemas of the
+validators is built once per worker rather than once per document. Outputs are
+written as soon as each document finishes, and a failing document is recorded
+in the report without stopping the batch. A worker that dies (a crash, or a
+recipe calling os._exit()) fails only the document it was processing: the
+pool is restarted and the other documents are processed as usual.
+
+Usage:
+    from skills.docx.scripts.batch import process_documents
+
+    # The recipe must be a module-level function so workers can import it
+    def add_review_comment(doc, source):
+        para = doc["word/document.xml"].get_node(tag="w:p", contains="Term")
+        doc.add_comment(start=para, end=para, text=f"Reviewed {source.name}")
+
+    results = process_documents("contracts/", "reviewed/", add_review_comment)
+    results = process_documents("manifest.txt", "reviewed/", add_review_comment,
+                                workers=8, engine="lxml")
+
+    for result in results:
+        if result["status"] == "failed":
+            print(result["input"], result["stage"], result["error"])
+
+The report is also streamed to <output_dir>/batch-report.jsonl, one JSON object
+per document in completion order:
+    {"input": ..., "output": ..., "status": "ok" | "failed",
+     "stage": None | "open" | "recipe" | "save" | "worker",
+     "error": None | "ValueError: ...",
+     "log": captured stdout and stderr of a failure,
+     "timings": {"open": s, "recipe": s, "save": s, "total": s}}
+timings holds every stage that ran, including the one that failed.
+
+Parts are edited as stored in the .docx, not pretty-printed as by unpack.py, so
+recipes should find nodes by attrs, contains or find_text() rather than by
+line_number.
+"""
+
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from .document import Document
+
+REPORT_NAME = "batch-report.jsonl"
+
+
+def process_documents(
+    inputs, output_dir, recipe, workers=None, validate=True, **document_options
+):
+    """
+    Run recipe on every input document and save the results into output_dir.
+
+    Args:
+        inputs: A directory (searched recursively for *.docx), a manifest file
+            listing one .docx path per line (blank lines and lines starting
+            with # are ignored; relative paths are relative to the manifest),
+            or a list of paths
+        output_dir: Directory for the edited documents and the report. Outputs
+            keep their path relative to the input directory or manifest.
+        recipe: Function called as recipe(doc, source) with the Document and the
+            input path. With more than one worker it must be importable by
+            name (a module-level function).
+        workers: Number of worker processes (default: CPU count). With 1, all
+            documents are processed in this process.
+        validate: Passed to Document.save() (default: True)
+        **document_options: Passed to Document, e.g. author, engine="lxml"
+
+    Returns:
+        list: One report entry (a dict, see the module docstring) per input, in
+        input order
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = [(source, output_dir / name) for source, name in _list_inputs(inputs)]
+    workers = workers or os.cpu_count() or 1
+
+    results = [None] * len(jobs)
+    with open(output_dir / REPORT_NAME, "w") as report:
+
+        def record(i, result):
+            results[i] = result
+            report.write(json.dumps(result) + "\n")
+            report.flush()
+
+        if workers == 1 or len(jobs) <= 1:
+            for i, (source, output) in enumerate(jobs):
+                record(
+                    i,
+                    process_document(source, output, recipe, validate, document_options),
+                )
+            return results
+
+        def submit(executor, i):
+            source, output = jobs[i]
+            return executor.submit(
+                process_document, source, output, recipe, validate, document_options
+            )
+
+        def worker_failure(i, e):
+            # The worker died (or the recipe could not be sent to it)
+            result = _new_result(*jobs[i])
+            result.update(stage="worker", error=f"{type(e).__name__}: {e}")
+            return result
+
+        pending = list(range(len(jobs)))
+        while pending:
+            pool_size = min(workers, len(pending))
+            unfinished = _run_pool(pending, pool_size, submit, record, worker_failure)
+            if not unfinished:
+                break
+            # A worker died and took the pool down with it. The pool hands out
+            # documents in order and at most pool_size + 1 at a time, so the one
+            # that crashed is among the first unfinished: run each of those in a
+            # process of its own, so that a repeated crash fails only its own
+            # document, then go on with the others in a new pool.
+            suspects = unfinished[: pool_size + 1]
+            pending = unfinished[pool_size + 1 :]
+            _run_alone(suspects, submit, record, worker_failure)
+    return results
+
+
+def process_document(source, output, recipe, validate=True, document_options=None):
+    """
+    Open source, run recipe(doc, source) on it and save it to output.
+
+    Exceptions are caught and recorded, so one bad document cannot abort a batch.
+
+    Returns:
+        dict: The report entry for this document
+    """
+    source, output = Path(source), Path(output)
+    result = _new_result(source, output)
+    timings = result["timings"]
+    started = time.perf_counter()
+    log = io.StringIO()
+    stage = None
+
+    @contextlib.contextmanager
+    def timed(name):
+        nonlocal stage
+        stage = name
+        stage_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = round(time.perf_counter() - stage_started, 4)
+
+    doc = None
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            with timed("open"):
+                doc = Document(source, **(document_options or {}))
+            with timed("recipe"):
+                recipe(doc, source)
+            with timed("save"):
+                doc.save(output, validate=validate)
+        result["status"] = "ok"
+    except Exception as e:
+        result.update(stage=stage, error=f"{type(e).__name__}: {e}", log=log.getvalue())
+        output.unlink(missing_ok=True)
+    finally:
+        # Workers exit without running the cyclic garbage collector: remove the
+        # temporary directory now rather than relying on Document.__del__
+        if doc is not None:
+            doc.close()
+    timings["total"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _run_pool(indices, pool_size, submit, record, worker_failure):
+    """
+    Run the jobs of indices in one process pool, recording their results.
+
+    Returns:
+        list: The sorted indices of the jobs left unfinished because a worker
+        died and broke the pool (empty if none did)
+    """
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=pool_size) as executor:
+        futures = {}
+        for n, i in enumerate(indices):
+            try:
+                futures[submit(executor, i)] = i
+            except BrokenProcessPool:
+                unfinished.extend(indices[n:])
+                break
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                record(i, future.result())
+            except BrokenProcessPool:
+                unfinished.append(i)
+            except Exception as e:
+                record(i, worker_failure(i, e))
+    return sorted(unfinished)
+
+
+def _run_alone(indices, submit, record, worker_failure):
+    """Run each job of indices in a single-process pool of its own, concurrently."""
+    executors = {}
+    try:
+        for i in indices:
+            executor = ProcessPoolExecutor(max_workers=1)
+            executors[submit(executor, i)] = (i, executor)
+        for future in as_completed(executors):
+            i, executor = executors[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = worker_failure(i, e)
+            record(i, result)
+    finally:
+        for _, executor in executors.values():
+            executor.shutdown()
+
+
+def _new_result(source, output):
+    return {
+        "input": str(source),
+        "output": str(output),
+        "status": "failed",
+        "stage": None,
+        "error": None,
+        "log": None,
+        "timings": {},
+    }
+
+
+def _list_inputs(inputs):
+    """Return (source path, output name) pairs for a directory, manifest or list."""
+    if isinstance(inputs, (str, os.PathLike)):
+        path = Path(inputs)
+        if path.is_dir():
+            return [
+                (source, source.relative_to(path))
+                for source in sorted(path.rglob("*.docx"))
+                # Skip the lock files Word leaves next to open documents
+                if not source.name.startswith("~$")
+            ]
+        if not path.is_file():
+            raise ValueError(f"Input not found: {inputs}")
+        base = path.parent
+        sources = [
+            base / line.strip()
+            for line in path.read_text().splitlines()
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+    else:
+        base = None
+        sources = [Path(source) for source in inputs]
+
+    pairs = []
+    seen = set()
+    for source in sources:
+        if base is not None and source.resolve().is_relative_to(base.resolve()):
+            name = source.resolve().relative_to(base.resolve())
+        else:
+            name = Path(source.name)
+        if name in seen:
+            raise ValueError(f"Two inputs would be written to the same output: {name}")
+        seen.add(name)
+        pairs.append((source, name))
+    return pairs
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
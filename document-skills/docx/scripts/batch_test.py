@@ -0,0 +1,90 @@
+import unittest
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from scripts.batch import process_documents
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '<Override PartName="/word/settings.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+        "</Relationships>"
+    ),
+    "word/_rels/document.xml.rels": (
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/settings" Target="settings.xml"/>'
+        "</Relationships>"
+    ),
+    "word/document.xml": f"<w:document {W}><w:body><w:p><w:r><w:t>Hello</w:t></w:r></w:p></w:body></w:document>",
+    "word/settings.xml": f"<w:settings {W}/>",
+}
+
+
+# Recipes are module-level so that workers can import them
+def crash_on_bad(doc, source):
+    if source.stem == "bad":
+        os._exit(1)
+
+
+def warn_and_fail(doc, source):
+    print("checking", source.name, file=sys.stderr)
+    raise ValueError("no such paragraph")
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestProcessDocuments(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.input_dir = Path(temp_dir.name) / "in"
+        self.output_dir = Path(temp_dir.name) / "out"
+        self.input_dir.mkdir()
+
+    def create_docx(self, name):
+        """Helper to create a minimal document in the input directory"""
+        with zipfile.ZipFile(self.input_dir / name, "w") as zf:
+            for part, data in PARTS.items():
+                zf.writestr(part, data)
+
+    def test_crashing_worker_fails_only_its_document(self):
+        """Test a worker dying on one document does not fail the others"""
+        names = [f"doc{i:02}.docx" for i in range(12)]
+        names.insert(5, "bad.docx")
+        for name in names:
+            self.create_docx(name)
+
+        results = process_documents(
+            self.input_dir, self.output_dir, crash_on_bad, workers=3, validate=False
+        )
+        by_name = {Path(result["input"]).name: result for result in results}
+        self.assertEqual(len(results), len(names))
+        self.assertEqual(by_name.pop("bad.docx")["stage"], "worker")
+        self.assertFalse((self.output_dir / "bad.docx").exists())
+        for name, result in by_name.items():
+            self.assertEqual(result["status"], "ok", result)
+            self.assertTrue((self.output_dir / name).is_file())
+
+    def test_log_captures_stderr(self):
+        """Test the log of a failed document holds what the recipe wrote to stderr"""
+        self.create_docx("a.docx")
+        [result] = process_documents(
+            self.input_dir, self.output_dir, warn_and_fail, workers=1, validate=False
+        )
+        self.assertEqual(result["stage"], "recipe")
+        self.assertIn("checking a.docx", result["log"])
+
+
+if __name__ == '__main__':
+    unittest.main()
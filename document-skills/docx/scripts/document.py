@@ -8,6 +8,8 @@ Usage:
     # Initialize
     doc = Document('workspace/unpacked')
     doc = Document('workspace/unpacked', author="John Doe", initials="JD")
+    doc = Document('workspace/unpacked', engine="lxml")  # Large documents
+    doc = Document('workspace/report.docx')  # Straight from the .docx, no unpacking
 
     # Find nodes
     node = doc["word/document.xml"].get_node(tag="w:del", attrs={"w:id": "1"})
@@ -24,17 +26,25 @@ Usage:
 
     # Save
     doc.save()
+    doc.save('workspace/report-edited.docx')  # Documents opened from a .docx
 """
 
+import hashlib
+import functools
 import html
+import itertools
+import os
 import random
+import re
 import shutil
 import tempfile
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
 from ooxml.scripts.pack import pack_document
+from ooxml.scripts.package import Package
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
@@ -43,6 +53,13 @@ from .utilities import XMLEditor
 # Path to template files
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
+# Packed validation baselines, shared by Documents opened on the same unchanged directory
+BASELINE_CACHE_DIR = Path(tempfile.gettempdir()) / "docx_baselines"
+# Baselines unused for longer than this, or beyond this total size (least
+# recently used first), are removed whenever a new one is packed
+BASELINE_CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds
+BASELINE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
 
 class DocxXMLEditor(XMLEditor):
     """XMLEditor that automatically applies RSID, author, and date to new elements.
@@ -53,63 +70,65 @@ class DocxXMLEditor(XMLEditor):
     - w:id (for w:ins and w:del elements)
 
     Attributes:
-        dom (defusedxml.minidom.Document): The DOM document for direct manipulation
+        dom: The DOM document for direct manipulation (defusedxml.minidom.Document,
+            or lxml.etree ElementTree with engine="lxml")
     """
 
     def __init__(
-        self, xml_path, rsid: str, author: str = "Claude", initials: str = "C"
+        self,
+        xml_path,
+        rsid: str,
+        author: str = "Claude",
+        initials: str = "C",
+        engine: str = "minidom",
+        package=None,
+        ids=None,
     ):
         """Initialize with required RSID and optional author.
 
         Args:
-            xml_path: Path to XML file to edit
+            xml_path: Path to XML file to edit (the part name with a package)
             rsid: RSID to automatically apply to new elements
             author: Author name for tracked changes and comments (default: "Claude")
             initials: Author initials (default: "C")
+            engine: XMLEditor engine, "minidom" (default) or "lxml"
+            package: Optional Package to edit the part in, see XMLEditor
+            ids: Optional IdAllocator shared with the other parts of the document.
+                By default, IDs are unique within this part.
         """
-        super().__init__(xml_path)
+        super().__init__(xml_path, engine=engine, package=package)
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        # Change IDs and paraIds; Document shares one allocator between its editors
+        self.ids = ids if ids is not None else IdAllocator(lambda: [self])
 
-    def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+    def invalidate_index(self):
+        """Drop cached lookups (get_node indexes, allocated IDs) after direct DOM edits."""
+        super().invalidate_index()
+        self.ids.reset()
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16du"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16du",
+        if not self._backend.has_namespace("w16du"):
+            self._backend.declare_namespace(
+                "w16du",
                 "http://schemas.microsoft.com/office/word/2023/wordml/word16du",
             )
 
     def _ensure_w16cex_namespace(self):
         """Ensure w16cex namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w16cex"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w16cex",
+        if not self._backend.has_namespace("w16cex"):
+            self._backend.declare_namespace(
+                "w16cex",
                 "http://schemas.microsoft.com/office/word/2018/wordml/cex",
             )
 
     def _ensure_w14_namespace(self):
         """Ensure w14 namespace is declared on the root element."""
-        root = self.dom.documentElement
-        if not root.hasAttribute("xmlns:w14"):  # type: ignore
-            root.setAttribute(  # type: ignore
-                "xmlns:w14",
+        if not self._backend.has_namespace("w14"):
+            self._backend.declare_namespace(
+                "w14",
                 "http://schemas.microsoft.com/office/word/2010/wordml",
             )
 
@@ -130,136 +149,104 @@ class DocxXMLEditor(XMLEditor):
         from datetime import datetime, timezone
 
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        dom = self._backend
 
         def is_inside_deletion(elem):
             """Check if element is inside a w:del element."""
-            parent = elem.parentNode
-            while parent:
-                if parent.nodeType == parent.ELEMENT_NODE and parent.tagName == "w:del":
+            parent = dom.parent(elem)
+            while parent is not None:
+                if dom.tag(parent) == "w:del":
                     return True
-                parent = parent.parentNode
+                parent = dom.parent(parent)
             return False
 
         def add_rsid_to_p(elem):
-            if not elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidR", self.rsid)
-            if not elem.hasAttribute("w:rsidRDefault"):
-                elem.setAttribute("w:rsidRDefault", self.rsid)
-            if not elem.hasAttribute("w:rsidP"):
-                elem.setAttribute("w:rsidP", self.rsid)
+            if not dom.has(elem, "w:rsidR"):
+                dom.set(elem, "w:rsidR", self.rsid)
+            if not dom.has(elem, "w:rsidRDefault"):
+                dom.set(elem, "w:rsidRDefault", self.rsid)
+            if not dom.has(elem, "w:rsidP"):
+                dom.set(elem, "w:rsidP", self.rsid)
             # Add w14:paraId and w14:textId if not present
-            if not elem.hasAttribute("w14:paraId"):
-                self._ensure_w14_namespace()
-                elem.setAttribute("w14:paraId", _generate_hex_id())
-            if not elem.hasAttribute("w14:textId"):
-                self._ensure_w14_namespace()
-                elem.setAttribute("w14:textId", _generate_hex_id())
+            for attr in ("w14:paraId", "w14:textId"):
+                if dom.has(elem, attr):
+                    self.ids.reserve_hex_id(dom.get(elem, attr))
+                else:
+                    self._ensure_w14_namespace()
+                    dom.set(elem, attr, self.ids.new_hex_id())
 
         def add_rsid_to_r(elem):
             # Use w:rsidDel for <w:r> inside <w:del>, otherwise w:rsidR
             if is_inside_deletion(elem):
-                if not elem.hasAttribute("w:rsidDel"):
-                    elem.setAttribute("w:rsidDel", self.rsid)
+                if not dom.has(elem, "w:rsidDel"):
+                    dom.set(elem, "w:rsidDel", self.rsid)
             else:
-                if not elem.hasAttribute("w:rsidR"):
-                    elem.setAttribute("w:rsidR", self.rsid)
+                if not dom.has(elem, "w:rsidR"):
+                    dom.set(elem, "w:rsidR", self.rsid)
 
         def add_tracked_change_attrs(elem):
             # Auto-assign w:id if not present
-            if not elem.hasAttribute("w:id"):
-                elem.setAttribute("w:id", str(self._get_next_change_id()))
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
+            if not dom.has(elem, "w:id"):
+                dom.set(elem, "w:id", str(self.ids.next_change_id()))
+            else:
+                self.ids.reserve_change_id(dom.get(elem, "w:id"))
+            if not dom.has(elem, "w:author"):
+                dom.set(elem, "w:author", self.author)
+            if not dom.has(elem, "w:date"):
+                dom.set(elem, "w:date", timestamp)
             # Add w16du:dateUtc for tracked changes (same as w:date since we generate UTC timestamps)
-            if elem.tagName in ("w:ins", "w:del") and not elem.hasAttribute(
-                "w16du:dateUtc"
+            if dom.tag(elem) in ("w:ins", "w:del") and not dom.has(
+                elem, "w16du:dateUtc"
             ):
                 self._ensure_w16du_namespace()
-                elem.setAttribute("w16du:dateUtc", timestamp)
+                dom.set(elem, "w16du:dateUtc", timestamp)
 
         def add_comment_attrs(elem):
-            if not elem.hasAttribute("w:author"):
-                elem.setAttribute("w:author", self.author)
-            if not elem.hasAttribute("w:date"):
-                elem.setAttribute("w:date", timestamp)
-            if not elem.hasAttribute("w:initials"):
-                elem.setAttribute("w:initials", self.initials)
+            if dom.has(elem, "w:id"):
+                self.ids.reserve_comment_id(dom.get(elem, "w:id"))
+            if not dom.has(elem, "w:author"):
+                dom.set(elem, "w:author", self.author)
+            if not dom.has(elem, "w:date"):
+                dom.set(elem, "w:date", timestamp)
+            if not dom.has(elem, "w:initials"):
+                dom.set(elem, "w:initials", self.initials)
 
         def add_comment_extensible_date(elem):
             # Add w16cex:dateUtc for comment extensible elements
-            if not elem.hasAttribute("w16cex:dateUtc"):
+            if not dom.has(elem, "w16cex:dateUtc"):
                 self._ensure_w16cex_namespace()
-                elem.setAttribute("w16cex:dateUtc", timestamp)
+                dom.set(elem, "w16cex:dateUtc", timestamp)
 
         def add_xml_space_to_t(elem):
             # Add xml:space="preserve" to w:t if text has leading/trailing whitespace
-            if (
-                elem.firstChild
-                and elem.firstChild.nodeType == elem.firstChild.TEXT_NODE
-            ):
-                text = elem.firstChild.data
-                if text and (text[0].isspace() or text[-1].isspace()):
-                    if not elem.hasAttribute("xml:space"):
-                        elem.setAttribute("xml:space", "preserve")
+            text = dom.leading_text(elem)
+            if text and (text[0].isspace() or text[-1].isspace()):
+                if not dom.has(elem, "xml:space"):
+                    dom.set(elem, "xml:space", "preserve")
+
+        handlers = {
+            "w:p": add_rsid_to_p,
+            "w:r": add_rsid_to_r,
+            "w:t": add_xml_space_to_t,
+            "w:ins": add_tracked_change_attrs,
+            "w:del": add_tracked_change_attrs,
+            "w:comment": add_comment_attrs,
+            "w16cex:commentExtensible": add_comment_extensible_date,
+        }
 
         for node in nodes:
-            if node.nodeType != node.ELEMENT_NODE:
+            if not dom.is_element(node):
                 continue
 
-            # Handle the node itself
-            if node.tagName == "w:p":
-                add_rsid_to_p(node)
-            elif node.tagName == "w:r":
-                add_rsid_to_r(node)
-            elif node.tagName == "w:t":
-                add_xml_space_to_t(node)
-            elif node.tagName in ("w:ins", "w:del"):
-                add_tracked_change_attrs(node)
-            elif node.tagName == "w:comment":
-                add_comment_attrs(node)
-            elif node.tagName == "w16cex:commentExtensible":
-                add_comment_extensible_date(node)
-
-            # Process descendants (getElementsByTagName doesn't return the element itself)
-            for elem in node.getElementsByTagName("w:p"):
-                add_rsid_to_p(elem)
-            for elem in node.getElementsByTagName("w:r"):
-                add_rsid_to_r(elem)
-            for elem in node.getElementsByTagName("w:t"):
-                add_xml_space_to_t(elem)
-            for tag in ("w:ins", "w:del"):
-                for elem in node.getElementsByTagName(tag):
-                    add_tracked_change_attrs(elem)
-            for elem in node.getElementsByTagName("w:comment"):
-                add_comment_attrs(elem)
-            for elem in node.getElementsByTagName("w16cex:commentExtensible"):
-                add_comment_extensible_date(elem)
-
-    def replace_node(self, elem, new_content):
-        """Replace node with automatic attribute injection."""
-        nodes = super().replace_node(elem, new_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
+            # Handle the node itself and its descendants in one traversal
+            for elem in itertools.chain((node,), dom.iter(node)):
+                handler = handlers.get(dom.tag(elem))
+                if handler is not None:
+                    handler(elem)
 
-    def insert_after(self, elem, xml_content):
-        """Insert after with automatic attribute injection."""
-        nodes = super().insert_after(elem, xml_content)
+    def _on_insert(self, nodes):
+        """Apply automatic attribute injection to inserted nodes."""
         self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def insert_before(self, elem, xml_content):
-        """Insert before with automatic attribute injection."""
-        nodes = super().insert_before(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
-
-    def append_to(self, elem, xml_content):
-        """Append to with automatic attribute injection."""
-        nodes = super().append_to(elem, xml_content)
-        self._inject_attributes_to_nodes(nodes)
-        return nodes
 
     def revert_insertion(self, elem):
         """Reject an insertion by wrapping its content in a deletion.
@@ -285,57 +272,52 @@ class DocxXMLEditor(XMLEditor):
             para = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
             doc["word/document.xml"].revert_insertion(para)
         """
+        dom = self._backend
+
         # Collect insertions
         ins_elements = []
-        if elem.tagName == "w:ins":
+        if dom.tag(elem) == "w:ins":
             ins_elements.append(elem)
         else:
-            ins_elements.extend(elem.getElementsByTagName("w:ins"))
+            ins_elements.extend(dom.iter(elem, "w:ins"))
 
         # Validate that there are insertions to reject
         if not ins_elements:
             raise ValueError(
                 f"revert_insertion requires w:ins elements. "
-                f"The provided element <{elem.tagName}> contains no insertions. "
+                f"The provided element <{dom.tag(elem)}> contains no insertions. "
             )
 
         # Process all insertions - wrap all children in w:del
         for ins_elem in ins_elements:
-            runs = list(ins_elem.getElementsByTagName("w:r"))
+            runs = list(dom.iter(ins_elem, "w:r"))
             if not runs:
                 continue
 
             # Create deletion wrapper
-            del_wrapper = self.dom.createElement("w:del")
+            del_wrapper = dom.create("w:del")
 
             # Process each run
             for run in runs:
                 # Convert w:t → w:delText and w:rsidR → w:rsidDel
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
-
-                for t_elem in list(run.getElementsByTagName("w:t")):
-                    del_text = self.dom.createElement("w:delText")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while t_elem.firstChild:
-                        del_text.appendChild(t_elem.firstChild)
-                    for i in range(t_elem.attributes.length):
-                        attr = t_elem.attributes.item(i)
-                        del_text.setAttribute(attr.name, attr.value)
-                    t_elem.parentNode.replaceChild(del_text, t_elem)
+                if dom.has(run, "w:rsidR"):
+                    dom.set(run, "w:rsidDel", dom.get(run, "w:rsidR"))
+                    dom.remove_attribute(run, "w:rsidR")
+                elif not dom.has(run, "w:rsidDel"):
+                    dom.set(run, "w:rsidDel", self.rsid)
+
+                for t_elem in list(dom.iter(run, "w:t")):
+                    dom.rename(t_elem, "w:delText")
 
             # Move all children from ins to del wrapper
-            while ins_elem.firstChild:
-                del_wrapper.appendChild(ins_elem.firstChild)
+            dom.move_children(ins_elem, del_wrapper)
 
             # Add del wrapper back to ins
-            ins_elem.appendChild(del_wrapper)
+            dom.append(ins_elem, del_wrapper)
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_changed(ins_elem, [ins_elem])
 
         return [elem]
 
@@ -364,20 +346,22 @@ class DocxXMLEditor(XMLEditor):
             para = doc["word/document.xml"].get_node(tag="w:p", line_number=42)
             nodes = doc["word/document.xml"].revert_deletion(para)
         """
+        dom = self._backend
+
         # Collect deletions FIRST - before we modify the DOM
         del_elements = []
-        is_single_del = elem.tagName == "w:del"
+        is_single_del = dom.tag(elem) == "w:del"
 
         if is_single_del:
             del_elements.append(elem)
         else:
-            del_elements.extend(elem.getElementsByTagName("w:del"))
+            del_elements.extend(dom.iter(elem, "w:del"))
 
         # Validate that there are deletions to reject
         if not del_elements:
             raise ValueError(
                 f"revert_deletion requires w:del elements. "
-                f"The provided element <{elem.tagName}> contains no deletions. "
+                f"The provided element <{dom.tag(elem)}> contains no deletions. "
             )
 
         # Track created insertion (only relevant if elem is a single w:del)
@@ -386,46 +370,42 @@ class DocxXMLEditor(XMLEditor):
         # Process all deletions - create insertions that copy the deleted content
         for del_elem in del_elements:
             # Clone the deleted runs and convert them to insertions
-            runs = list(del_elem.getElementsByTagName("w:r"))
+            runs = list(dom.iter(del_elem, "w:r"))
             if not runs:
                 continue
 
             # Create insertion wrapper
-            ins_elem = self.dom.createElement("w:ins")
+            ins_elem = dom.create("w:ins")
 
             for run in runs:
                 # Clone the run
-                new_run = run.cloneNode(True)
+                new_run = dom.clone(run)
+                # Append first so the delText elements below have a parent
+                dom.append(ins_elem, new_run)
 
                 # Convert w:delText → w:t
-                for del_text in list(new_run.getElementsByTagName("w:delText")):
-                    t_elem = self.dom.createElement("w:t")
-                    # Copy ALL child nodes (not just firstChild) to handle entities
-                    while del_text.firstChild:
-                        t_elem.appendChild(del_text.firstChild)
-                    for i in range(del_text.attributes.length):
-                        attr = del_text.attributes.item(i)
-                        t_elem.setAttribute(attr.name, attr.value)
-                    del_text.parentNode.replaceChild(t_elem, del_text)
+                for del_text in list(dom.iter(new_run, "w:delText")):
+                    dom.rename(del_text, "w:t")
 
                 # Update run attributes: w:rsidDel → w:rsidR
-                if new_run.hasAttribute("w:rsidDel"):
-                    new_run.setAttribute("w:rsidR", new_run.getAttribute("w:rsidDel"))
-                    new_run.removeAttribute("w:rsidDel")
-                elif not new_run.hasAttribute("w:rsidR"):
-                    new_run.setAttribute("w:rsidR", self.rsid)
-
-                ins_elem.appendChild(new_run)
-
-            # Insert the new insertion after the deletion
-            nodes = self.insert_after(del_elem, ins_elem.toxml())
+                if dom.has(new_run, "w:rsidDel"):
+                    dom.set(new_run, "w:rsidR", dom.get(new_run, "w:rsidDel"))
+                    dom.remove_attribute(new_run, "w:rsidDel")
+                elif not dom.has(new_run, "w:rsidR"):
+                    dom.set(new_run, "w:rsidR", self.rsid)
+
+            # Insert the new insertion after the deletion; it is already a
+            # node of this document, so no serialize/parse round trip is needed
+            dom.insert_after(del_elem, ins_elem)
+            self._index_changed(dom.parent(del_elem), [ins_elem])
+            self._inject_attributes_to_nodes([ins_elem])
 
             # If processing a single w:del, track the created insertion
-            if is_single_del and nodes:
-                created_insertion = nodes[0]
+            if is_single_del:
+                created_insertion = ins_elem
 
         # Return based on input type
-        if is_single_del and created_insertion:
+        if is_single_del and created_insertion is not None:
             return [elem, created_insertion]
         else:
             return [elem]
@@ -495,113 +475,228 @@ class DocxXMLEditor(XMLEditor):
         Raises:
             ValueError: If element has existing tracked changes or invalid structure
         """
-        if elem.nodeName == "w:r":
+        dom = self._backend
+        tag = dom.tag(elem) if dom.is_element(elem) else None
+
+        if tag == "w:r":
             # Check for existing w:delText
-            if elem.getElementsByTagName("w:delText"):
+            if next(dom.iter(elem, "w:delText"), None) is not None:
                 raise ValueError("w:r element already contains w:delText")
 
-            # Convert w:t → w:delText
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+            # Convert w:t → w:delText (attributes like xml:space are preserved)
+            for t_elem in list(dom.iter(elem, "w:t")):
+                dom.rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            if elem.hasAttribute("w:rsidR"):
-                elem.setAttribute("w:rsidDel", elem.getAttribute("w:rsidR"))
-                elem.removeAttribute("w:rsidR")
-            elif not elem.hasAttribute("w:rsidDel"):
-                elem.setAttribute("w:rsidDel", self.rsid)
+            if dom.has(elem, "w:rsidR"):
+                dom.set(elem, "w:rsidDel", dom.get(elem, "w:rsidR"))
+                dom.remove_attribute(elem, "w:rsidR")
+            elif not dom.has(elem, "w:rsidDel"):
+                dom.set(elem, "w:rsidDel", self.rsid)
 
             # Wrap in w:del
-            del_wrapper = self.dom.createElement("w:del")
-            parent = elem.parentNode
-            parent.insertBefore(del_wrapper, elem)
-            parent.removeChild(elem)
-            del_wrapper.appendChild(elem)
+            del_wrapper = dom.create("w:del")
+            parent = dom.parent(elem)
+            dom.insert_before(elem, del_wrapper)
+            dom.append(del_wrapper, elem)
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_changed(parent, [del_wrapper])
 
             return del_wrapper
 
-        elif elem.nodeName == "w:p":
+        elif tag == "w:p":
             # Check for existing tracked changes
-            if elem.getElementsByTagName("w:ins") or elem.getElementsByTagName("w:del"):
+            if (
+                next(dom.iter(elem, "w:ins"), None) is not None
+                or next(dom.iter(elem, "w:del"), None) is not None
+            ):
                 raise ValueError("w:p element already contains tracked changes")
 
             # Check if it's a numbered list item
-            pPr_list = elem.getElementsByTagName("w:pPr")
-            is_numbered = pPr_list and pPr_list[0].getElementsByTagName("w:numPr")
+            pPr = next(dom.iter(elem, "w:pPr"), None)
+            is_numbered = (
+                pPr is not None and next(dom.iter(pPr, "w:numPr"), None) is not None
+            )
 
             if is_numbered:
                 # Add <w:del/> to w:rPr in w:pPr
-                pPr = pPr_list[0]
-                rPr_list = pPr.getElementsByTagName("w:rPr")
+                rPr = next(dom.iter(pPr, "w:rPr"), None)
 
-                if not rPr_list:
-                    rPr = self.dom.createElement("w:rPr")
-                    pPr.appendChild(rPr)
-                else:
-                    rPr = rPr_list[0]
+                if rPr is None:
+                    rPr = dom.create("w:rPr")
+                    dom.append(pPr, rPr)
 
                 # Add <w:del/> marker
-                del_marker = self.dom.createElement("w:del")
-                rPr.insertBefore(
-                    del_marker, rPr.firstChild
-                ) if rPr.firstChild else rPr.appendChild(del_marker)
-
-            # Convert w:t → w:delText in all runs
-            for t_elem in list(elem.getElementsByTagName("w:t")):
-                del_text = self.dom.createElement("w:delText")
-                # Copy ALL child nodes (not just firstChild) to handle entities
-                while t_elem.firstChild:
-                    del_text.appendChild(t_elem.firstChild)
-                # Preserve attributes like xml:space
-                for i in range(t_elem.attributes.length):
-                    attr = t_elem.attributes.item(i)
-                    del_text.setAttribute(attr.name, attr.value)
-                t_elem.parentNode.replaceChild(del_text, t_elem)
+                del_marker = dom.create("w:del")
+                first_child = dom.first_child(rPr)
+                if first_child is not None:
+                    dom.insert_before(first_child, del_marker)
+                else:
+                    dom.append(rPr, del_marker)
+
+            # Convert w:t → w:delText in all runs (attributes like xml:space are preserved)
+            for t_elem in list(dom.iter(elem, "w:t")):
+                dom.rename(t_elem, "w:delText")
 
             # Update run attributes: w:rsidR → w:rsidDel
-            for run in elem.getElementsByTagName("w:r"):
-                if run.hasAttribute("w:rsidR"):
-                    run.setAttribute("w:rsidDel", run.getAttribute("w:rsidR"))
-                    run.removeAttribute("w:rsidR")
-                elif not run.hasAttribute("w:rsidDel"):
-                    run.setAttribute("w:rsidDel", self.rsid)
+            for run in dom.iter(elem, "w:r"):
+                if dom.has(run, "w:rsidR"):
+                    dom.set(run, "w:rsidDel", dom.get(run, "w:rsidR"))
+                    dom.remove_attribute(run, "w:rsidR")
+                elif not dom.has(run, "w:rsidDel"):
+                    dom.set(run, "w:rsidDel", self.rsid)
 
             # Wrap all non-pPr children in <w:del>
-            del_wrapper = self.dom.createElement("w:del")
-            for child in [c for c in elem.childNodes if c.nodeName != "w:pPr"]:
-                elem.removeChild(child)
-                del_wrapper.appendChild(child)
-            elem.appendChild(del_wrapper)
+            del_wrapper = dom.create("w:del")
+            dom.move_children(elem, del_wrapper, keep=("w:pPr",))
+            dom.append(elem, del_wrapper)
 
             # Inject attributes to the deletion wrapper
             self._inject_attributes_to_nodes([del_wrapper])
+            self._index_changed(elem, [elem])
 
             return elem
 
         else:
-            raise ValueError(f"Element must be w:r or w:p, got {elem.nodeName}")
+            raise ValueError(f"Element must be w:r or w:p, got {tag or 'a non-element node'}")
+
+
+class IdAllocator:
+    """Hands out the IDs of new elements so they never collide with IDs in use.
+
+    The parts are scanned once, on first use; after that every ID comes from
+    memory:
+    - next_change_id(): w:id of w:ins/w:del, counting up from the highest in use
+    - next_comment_id(): w:id of w:comment, likewise
+    - new_hex_id(): a random paraId/textId/durableId that is not in use
+
+    IDs set explicitly in inserted XML are reported with the reserve_*()
+    methods (DocxXMLEditor does this), so they are not handed out again.
+    """
+
+    # Elements holding a change or comment w:id, in the DOM and in raw part XML
+    CHANGE_TAGS = ("w:ins", "w:del")
+    CHANGE_ID_PATTERN = re.compile(rb'<w:(?:ins|del)\s[^>]*?\bw:id="(\d+)"')
+    COMMENT_ID_PATTERN = re.compile(rb'<w:comment\s[^>]*?\bw:id="(\d+)"')
+    # Elements and attributes holding 32-bit hex IDs
+    HEX_ID_ATTRIBUTES = {
+        "w:p": ("w14:paraId", "w14:textId"),
+        "w15:commentEx": ("w15:paraId",),
+        "w16cid:commentId": ("w16cid:paraId", "w16cid:durableId"),
+        "w16cex:commentExtensible": ("w16cex:durableId",),
+    }
+    HEX_ID_PATTERN = re.compile(
+        rb'\b(?:w14|w15|w16cid|w16cex):(?:paraId|textId|durableId)="([0-9A-Fa-f]{1,8})"'
+    )
+
+    def __init__(self, editors, other_parts=None):
+        """
+        Args:
+            editors: Function returning the open DocxXMLEditors, whose DOM is scanned
+            other_parts: Optional function returning the content (bytes) of the
+                parts that are not open in an editor, which are scanned as text
+        """
+        self._editors = editors
+        self._other_parts = other_parts
+        self.reset()
+
+    def reset(self):
+        """Forget the scanned IDs; the parts are scanned again on next use."""
+        self._next_change_id = None
+        self._next_comment_id = None
+        self._hex_ids = None
+
+    def next_change_id(self):
+        """Allocate the next tracked change ID."""
+        self._scan()
+        change_id = self._next_change_id
+        self._next_change_id += 1
+        return change_id
+
+    def next_comment_id(self, count=1):
+        """Allocate count consecutive comment IDs and return the first one.
+
+        With count=0, returns the ID the next comment will get without allocating it.
+        """
+        self._scan()
+        comment_id = self._next_comment_id
+        self._next_comment_id += count
+        return comment_id
+
+    def new_hex_id(self):
+        """Allocate a paraId/textId/durableId that is not used anywhere in the document."""
+        self._scan()
+        return _generate_hex_id(self._hex_ids)
+
+    def reserve_change_id(self, change_id):
+        """Keep the counter above a change ID that was set explicitly."""
+        if self._next_change_id is not None:
+            self._next_change_id = max(self._next_change_id, _to_int(change_id) + 1)
+
+    def reserve_comment_id(self, comment_id):
+        """Keep the counter above a comment ID that was set explicitly."""
+        if self._next_comment_id is not None:
+            self._next_comment_id = max(self._next_comment_id, _to_int(comment_id) + 1)
 
+    def reserve_hex_id(self, hex_id):
+        """Never hand out a hex ID that was set explicitly."""
+        if self._hex_ids is not None:
+            self._hex_ids.add(_to_int(hex_id, 16))
 
-def _generate_hex_id() -> str:
+    def _scan(self):
+        if self._hex_ids is not None:
+            return
+        change_ids, comment_ids, hex_ids = [-1], [-1], set()
+        for editor in self._editors():
+            dom = editor._backend
+            for tag in self.CHANGE_TAGS:
+                change_ids.extend(
+                    _to_int(dom.get(elem, "w:id")) for elem in dom.iter(editor.dom, tag)
+                )
+            comment_ids.extend(
+                _to_int(dom.get(elem, "w:id"))
+                for elem in dom.iter(editor.dom, "w:comment")
+            )
+            for tag, attrs in self.HEX_ID_ATTRIBUTES.items():
+                for elem in dom.iter(editor.dom, tag):
+                    hex_ids.update(_to_int(dom.get(elem, attr), 16) for attr in attrs)
+        for data in self._other_parts() if self._other_parts else ():
+            change_ids.extend(map(int, self.CHANGE_ID_PATTERN.findall(data)))
+            comment_ids.extend(map(int, self.COMMENT_ID_PATTERN.findall(data)))
+            hex_ids.update(int(value, 16) for value in self.HEX_ID_PATTERN.findall(data))
+        self._next_change_id = max(change_ids) + 1
+        self._next_comment_id = max(comment_ids) + 1
+        self._hex_ids = hex_ids
+
+
+def _to_int(value, base=10):
+    """Parse an ID attribute; missing or malformed values count as -1."""
+    try:
+        return int(value, base)
+    except (TypeError, ValueError):
+        return -1
+
+
+def _generate_hex_id(used=None) -> str:
     """Generate random 8-character hex ID for para/durable IDs.
 
     Values are constrained to be less than 0x7FFFFFFF per OOXML spec:
     - paraId must be < 0x80000000
     - durableId must be < 0x7FFFFFFF
     We use the stricter constraint (0x7FFFFFFF) for both.
+
+    If used (a set of the IDs in use, as ints) is given, the ID is drawn until
+    it is not in the set, and then added to it.
     """
-    return f"{random.randint(1, 0x7FFFFFFE):08X}"
+    while True:
+        value = random.randint(1, 0x7FFFFFFE)
+        if used is None:
+            return f"{value:08X}"
+        if value not in used:
+            used.add(value)
+            return f"{value:08X}"
 
 
 def _generate_rsid() -> str:
@@ -609,6 +704,94 @@ def _generate_rsid() -> str:
     return "".join(random.choices("0123456789ABCDEF", k=8))
 
 
+def _unopened_parts(package, original_path, unpacked_path, editors):
+    """Yield the content of every word/ XML part that is not open in an editor.
+
+    Args:
+        package: The Package of a Document opened from a .docx, or None
+        original_path: The directory the Document was opened from
+        unpacked_path: The working copies of the Document
+        editors: The Document's editors, by part name
+    """
+    if package is not None:
+        names = set(package.parts())
+    else:
+        names = set(_list_parts(original_path))
+    names.update(_list_parts(unpacked_path))
+    for name in sorted(names):
+        if not (name.startswith("word/") and name.endswith(".xml")):
+            continue
+        if name in editors:
+            continue
+        working = unpacked_path / name
+        if working.is_file():
+            yield working.read_bytes()
+        elif package is not None:
+            yield package.read(name)
+        else:
+            yield (original_path / name).read_bytes()
+
+
+def _prune_baselines(keep=None):
+    """Remove the baselines of BASELINE_CACHE_DIR that exceed the age or size limit.
+
+    Entries not used for BASELINE_CACHE_MAX_AGE seconds are removed; then the
+    least recently used ones until the rest fit in BASELINE_CACHE_MAX_BYTES.
+    keep (the baseline just packed) is never removed.
+    """
+    entries = []
+    for path in BASELINE_CACHE_DIR.glob("*.docx"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Removed by another process
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    cutoff = time.time() - BASELINE_CACHE_MAX_AGE
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if mtime >= cutoff and total <= BASELINE_CACHE_MAX_BYTES:
+            break
+        if path != keep:
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def _list_parts(directory):
+    """Map the relative posix path of every file under directory to its path."""
+    directory = Path(directory)
+    if not directory.is_dir():
+        return {}
+    return {
+        path.relative_to(directory).as_posix(): path
+        for path in directory.rglob("*")
+        if path.is_file()
+    }
+
+
+def _link_parts(directory, parts):
+    """Recreate directory with the given parts, hard-linked where possible.
+
+    Args:
+        directory: Directory to (re)create
+        parts: Mapping of relative part name to the file holding its content
+
+    Returns:
+        Path: directory
+    """
+    directory = Path(directory)
+    if directory.exists():
+        shutil.rmtree(directory)
+    for name, source in parts.items():
+        target = directory / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+    return directory
+
+
 class Document:
     """Manages comments in unpacked Word documents."""
 
@@ -619,31 +802,52 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        engine="minidom",
+        original_file=None,
     ):
         """
-        Initialize with path to unpacked Word document directory.
+        Initialize with path to unpacked Word document directory, or a .docx file.
         Automatically sets up comment infrastructure (people.xml, RSIDs).
 
+        A .docx is edited zip-natively: only the parts that are opened are
+        extracted, and save() writes a new .docx in which every other member is
+        copied without being decompressed.
+
         Args:
-            unpacked_dir: Path to unpacked DOCX directory (must contain word/ subdirectory)
+            unpacked_dir: Path to unpacked DOCX directory (must contain word/
+                subdirectory), or to a .docx file
             rsid: Optional RSID to use for all comment elements. If not provided, one will be generated.
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            engine: XML engine for every editor: "minidom" (default) or "lxml".
+                With "lxml", nodes are lxml.etree elements; use it for large documents.
+            original_file: Optional .docx that unpacked_dir was unpacked from. It is
+                used as the validation baseline instead of packing one.
         """
         self.original_path = Path(unpacked_dir)
 
-        if not self.original_path.exists() or not self.original_path.is_dir():
+        if self.original_path.is_file():
+            # Parts are read from the .docx itself, which is also the baseline
+            self.package = Package(self.original_path)
+            original_file = original_file or self.original_path
+        elif self.original_path.is_dir():
+            self.package = None
+        else:
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
-        # Create temporary directory with subdirectories for unpacked content and baseline
+        # Parts are copied into the temporary directory only when first opened or
+        # created (copy-on-write); everything else is read from the original
         self.temp_dir = tempfile.mkdtemp(prefix="docx_")
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
-        shutil.copytree(self.original_path, self.unpacked_path)
+        self.unpacked_path.mkdir()
 
-        # Pack original directory into temporary .docx for validation baseline (outside unpacked dir)
-        self.original_docx = Path(self.temp_dir) / "original.docx"
-        pack_document(self.original_path, self.original_docx, validate=False)
+        # Validation baseline, packed on first use unless given (see original_docx)
+        self._original_docx = Path(original_file) if original_file else None
+        # Pristine copies of original parts overwritten by save(), and parts
+        # that save() added to the original directory
+        self._baseline_parts = Path(self.temp_dir) / "baseline"
+        self._added_parts = set()
 
         self.word_path = self.unpacked_path / "word"
 
@@ -656,7 +860,21 @@ class Document:
         self.initials = initials
 
         # Cache for lazy-loaded editors
+        self.engine = engine
         self._editors = {}
+        # Comment/change IDs and paraIds for every part, scanned on first use.
+        # The allocator must not refer to self: that cycle would keep __del__
+        # (and the removal of temp_dir) waiting for the cyclic garbage collector
+        self.ids = IdAllocator(
+            self._editors.values,
+            functools.partial(
+                _unopened_parts,
+                self.package,
+                self.original_path,
+                self.unpacked_path,
+                self._editors,
+            ),
+        )
 
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
@@ -664,9 +882,8 @@ class Document:
         self.comments_ids_path = self.word_path / "commentsIds.xml"
         self.comments_extensible_path = self.word_path / "commentsExtensible.xml"
 
-        # Load existing comments and determine next ID (before setup modifies files)
+        # Load existing comments (before setup modifies files)
         self.existing_comments = self._load_existing_comments()
-        self.next_comment_id = self._get_next_comment_id()
 
         # Convenient access to document.xml editor (semi-private)
         self._document = self["word/document.xml"]
@@ -701,15 +918,25 @@ class Document:
             comment = doc["word/comments.xml"].get_node(tag="w:comment", attrs={"w:id": "0"})
         """
         if xml_path not in self._editors:
-            file_path = self.unpacked_path / xml_path
+            file_path = self._part_path(xml_path)
             if not file_path.exists():
                 raise ValueError(f"XML file not found: {xml_path}")
             # Use DocxXMLEditor with RSID, author, and initials for all editors
             self._editors[xml_path] = DocxXMLEditor(
-                file_path, rsid=self.rsid, author=self.author, initials=self.initials
+                file_path,
+                rsid=self.rsid,
+                author=self.author,
+                initials=self.initials,
+                engine=self.engine,
+                ids=self.ids,
             )
         return self._editors[xml_path]
 
+    @property
+    def next_comment_id(self):
+        """ID that the next new comment will get."""
+        return self.ids.next_comment_id(count=0)
+
     def add_comment(self, start, end, text: str) -> int:
         """
         Add a comment spanning from one element to another.
@@ -727,40 +954,7 @@ class Document:
             end_node = cm.get_document_node(tag="w:ins", id="2")
             cm.add_comment(start=start_node, end=end_node, text="Explanation")
         """
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-
-        # Add comment ranges to document.xml immediately
-        self._document.insert_before(start, self._comment_range_start_xml(comment_id))
-
-        # If end node is a paragraph, append comment markup inside it
-        # Otherwise insert after it (for run-level anchors)
-        if end.tagName == "w:p":
-            self._document.append_to(end, self._comment_range_end_xml(comment_id))
-        else:
-            self._document.insert_after(end, self._comment_range_end_xml(comment_id))
-
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
-        )
-
-        # Add to commentsExtended.xml immediately
-        self._add_to_comments_extended_xml(para_id, parent_para_id=None)
-
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
-
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
-
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
-
-        self.next_comment_id += 1
-        return comment_id
+        return self.add_comments([(start, end, text)])[0]
 
     def reply_to_comment(
         self,
@@ -780,61 +974,202 @@ class Document:
         Example:
             cm.reply_to_comment(parent_comment_id=0, text="I agree with this change")
         """
-        if parent_comment_id not in self.existing_comments:
-            raise ValueError(f"Parent comment with id={parent_comment_id} not found")
+        return self.add_comments([(None, None, text, parent_comment_id)])[0]
 
-        parent_info = self.existing_comments[parent_comment_id]
-        comment_id = self.next_comment_id
-        para_id = _generate_hex_id()
-        durable_id = _generate_hex_id()
-        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    def add_comments(self, comments) -> list:
+        """
+        Add many comments and replies at once.
 
-        # Add comment ranges to document.xml immediately
-        parent_start_elem = self._document.get_node(
-            tag="w:commentRangeStart", attrs={"w:id": str(parent_comment_id)}
-        )
-        parent_ref_elem = self._document.get_node(
-            tag="w:commentReference", attrs={"w:id": str(parent_comment_id)}
-        )
+        Every entry is checked before any ID is allocated. IDs are then
+        allocated up front, all comment ranges are anchored in one batch over
+        document.xml, and each of the four comment parts receives a single
+        fragment, so the cost per comment stays small.
 
-        self._document.insert_after(
-            parent_start_elem, self._comment_range_start_xml(comment_id)
+        Args:
+            comments: Iterable of (start, end, text) or (start, end, text, parent)
+                tuples. parent is the ID of the comment being replied to: an
+                existing comment or one earlier in the same call. A reply with
+                start and end set to None is anchored next to its parent, as
+                reply_to_comment() does.
+
+        Returns:
+            List of the comment IDs that were created, in input order
+
+        Example:
+            ids = doc.add_comments([
+                (para1, para1, "Needs a citation"),
+                (para2, para3, "Consider merging these"),
+            ])
+            doc.add_comments([(None, None, "Done", ids[0])])
+        """
+        entries = [tuple(comment) + (None,) * (4 - len(comment)) for comment in comments]
+
+        # Check every entry before allocating IDs, so that a bad one does not
+        # use up comment IDs and paraIds that are never written
+        first_id = self.ids.next_comment_id(0)
+        for offset, (start, end, text, parent) in enumerate(entries):
+            if (
+                parent is not None
+                and parent not in self.existing_comments
+                and parent not in range(first_id, first_id + offset)
+            ):
+                raise ValueError(f"Parent comment with id={parent} not found")
+            if parent is None and (start is None or end is None):
+                raise ValueError("start and end are required for a comment that is not a reply")
+
+        first_id = self.ids.next_comment_id(len(entries))
+        timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        dom = self._document._backend
+
+        # Allocate IDs and resolve parents before touching any part
+        created = {}  # comment id -> para/durable IDs and range anchors
+        planned = []
+        for offset, (start, end, text, parent) in enumerate(entries):
+            comment_id = first_id + offset
+            parent_info = created.get(parent) or self.existing_comments.get(parent)
+            info = {
+                "para_id": self.ids.new_hex_id(),
+                "durable_id": self.ids.new_hex_id(),
+                "parent_para_id": parent_info["para_id"] if parent_info else None,
+                "start": start,
+                "end": end,
+            }
+            if start is None and parent in created:
+                # Anchor next to a parent added by this call
+                info["start"] = created[parent]["start"]
+                info["end"] = created[parent]["end"]
+            created[comment_id] = info
+            planned.append((comment_id, text, parent, info))
+
+        # Comment range markup per anchor, in input order. Replies anchored next
+        # to an existing parent follow that parent's range start and reference run.
+        range_starts = {}  # (op, anchor id) -> [anchor, [xml, ...]]
+        range_ends = {}
+        for comment_id, text, parent, info in planned:
+            start, end = info["start"], info["end"]
+            if start is None:
+                parent_start = self._document.get_node(
+                    tag="w:commentRangeStart", attrs={"w:id": str(parent)}
+                )
+                parent_ref = self._document.get_node(
+                    tag="w:commentReference", attrs={"w:id": str(parent)}
+                )
+                start_op, start = "insert_after", parent_start
+                end_op, end = "insert_after", dom.parent(parent_ref)
+                end_xml = self._comment_ref_run_xml(comment_id) + (
+                    f'<w:commentRangeEnd w:id="{comment_id}"/>'
+                )
+            else:
+                start_op = "insert_before"
+                end_op = "append_to" if dom.tag(end) == "w:p" else "insert_after"
+                end_xml = self._comment_range_end_xml(comment_id)
+            range_starts.setdefault((start_op, id(start)), [start, []])[1].append(
+                self._comment_range_start_xml(comment_id)
+            )
+            range_ends.setdefault((end_op, id(end)), [end, []])[1].append(end_xml)
+
+        with self._document.batch():
+            for group in (range_starts, range_ends):
+                for (op, _), (anchor, fragments) in group.items():
+                    if op == "insert_after":
+                        # Each insert_after lands directly after the anchor, so
+                        # later comments go first, as with repeated single calls
+                        fragments = fragments[::-1]
+                    getattr(self._document, op)(anchor, "".join(fragments))
+
+        # One fragment per comment part
+        self._append_to_comment_part(
+            self.comments_path,
+            "w:comments",
+            "".join(
+                self._comment_xml(comment_id, info["para_id"], text)
+                for comment_id, text, _, info in planned
+            ),
         )
-        parent_ref_run = parent_ref_elem.parentNode
-        self._document.insert_after(
-            parent_ref_run, f'<w:commentRangeEnd w:id="{comment_id}"/>'
+        self._append_to_comment_part(
+            self.comments_extended_path,
+            "w15:commentsEx",
+            "".join(
+                self._comment_extended_xml(info["para_id"], info["parent_para_id"])
+                for _, _, _, info in planned
+            ),
         )
-        self._document.insert_after(
-            parent_ref_run, self._comment_ref_run_xml(comment_id)
+        self._append_to_comment_part(
+            self.comments_ids_path,
+            "w16cid:commentsIds",
+            "".join(
+                f'<w16cid:commentId w16cid:paraId="{info["para_id"]}" w16cid:durableId="{info["durable_id"]}"/>'
+                for _, _, _, info in planned
+            ),
         )
-
-        # Add to comments.xml immediately
-        self._add_to_comments_xml(
-            comment_id, para_id, text, self.author, self.initials, timestamp
+        self._append_to_comment_part(
+            self.comments_extensible_path,
+            "w16cex:commentsExtensible",
+            "".join(
+                f'<w16cex:commentExtensible w16cex:durableId="{info["durable_id"]}"/>'
+                for _, _, _, info in planned
+            ),
         )
 
-        # Add to commentsExtended.xml immediately (with parent)
-        self._add_to_comments_extended_xml(
-            para_id, parent_para_id=parent_info["para_id"]
-        )
+        # Update existing_comments so replies work
+        for comment_id, _, _, info in planned:
+            self.existing_comments[comment_id] = {"para_id": info["para_id"]}
 
-        # Add to commentsIds.xml immediately
-        self._add_to_comments_ids_xml(para_id, durable_id)
+        return [comment_id for comment_id, _, _, _ in planned]
 
-        # Add to commentsExtensible.xml immediately
-        self._add_to_comments_extensible_xml(durable_id)
+    def __enter__(self):
+        return self
 
-        # Update existing_comments so replies work
-        self.existing_comments[comment_id] = {"para_id": para_id}
+    def __exit__(self, *exc_info):
+        self.close()
 
-        self.next_comment_id += 1
-        return comment_id
+    def close(self):
+        """Close the .docx and remove the temporary directory.
 
-    def __del__(self):
-        """Clean up temporary directory on deletion."""
+        Unsaved changes are discarded. Called on deletion, but call it (or use
+        the Document as a context manager) to clean up at a known point.
+        """
+        if getattr(self, "package", None) is not None:
+            self.package.close()
         if hasattr(self, "temp_dir") and Path(self.temp_dir).exists():
             shutil.rmtree(self.temp_dir)
 
+    def __del__(self):
+        """Clean up temporary directory on deletion."""
+        self.close()
+
+    @property
+    def original_docx(self):
+        """Path to the original document packed as a .docx, the validation baseline.
+
+        The original_file given to the constructor, if any. Otherwise packed on
+        first use and cached in BASELINE_CACHE_DIR, keyed by the path, size and
+        mtime of every source part; the cache is pruned as in _prune_baselines().
+        """
+        if self._original_docx is None:
+            parts = _list_parts(self.original_path)
+            for name in self._added_parts:
+                parts.pop(name, None)
+            parts.update(_list_parts(self._baseline_parts))
+
+            key = hashlib.sha1()
+            for name, source in sorted(parts.items()):
+                stat = source.stat()
+                key.update(
+                    f"{name}\0{source.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode()
+                )
+            baseline = BASELINE_CACHE_DIR / f"{key.hexdigest()}.docx"
+            try:
+                # Mark as recently used, so pruning removes other baselines first
+                os.utime(baseline)
+            except FileNotFoundError:
+                source_dir = _link_parts(Path(self.temp_dir) / "original", parts)
+                pack_document(source_dir, baseline, validate=False)
+                shutil.rmtree(source_dir)
+                _prune_baselines(keep=baseline)
+            self._original_docx = baseline
+        return self._original_docx
+
     def validate(self) -> None:
         """
         Validate the document against XSD schema and redlining rules.
@@ -842,13 +1177,29 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
-        # Create validators with current state
+        # Validate a full view of the document: the working copies of opened
+        # parts over the untouched parts of the original
+        parts = _list_parts(self.original_path)
+        other_parts = []
+        if self.package is not None:
+            # Parts that were never opened are still only in the .docx. The
+            # validators read the XML ones, extracted once and kept for later
+            # saves; the others (media) only need to be known by name
+            package_parts = Path(self.temp_dir) / "package"
+            for name in self.package.parts():
+                if not name.endswith((".xml", ".rels")):
+                    other_parts.append(name)
+                elif not (self.unpacked_path / name).is_file():
+                    if not (package_parts / name).is_file():
+                        self.package.extract(name, package_parts / name)
+                    parts[name] = package_parts / name
+        parts.update(_list_parts(self.unpacked_path))
+        view = _link_parts(Path(self.temp_dir) / "validate", parts)
+
         schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
-        redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            view, self.original_docx, verbose=False, other_parts=other_parts
         )
+        redlining_validator = RedliningValidator(view, self.original_docx, verbose=False)
 
         # Run validations
         if not schema_validator.validate():
@@ -861,13 +1212,18 @@ class Document:
         Save all modified XML files to disk and copy to destination directory.
 
         This persists all changes made via add_comment() and reply_to_comment().
+        Only parts that were opened or created are written back to the original
+        directory; a different destination also receives the untouched parts.
+
+        For a Document opened from a .docx, a new .docx is written instead (to
+        destination, or over the original file), raw-copying untouched members.
 
         Args:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
         """
         # Only ensure comment relationships and content types if comment files exist
-        if self.comments_path.exists():
+        if self._has_part(self.comments_path):
             self._ensure_comment_relationships()
             self._ensure_comment_content_types()
 
@@ -879,45 +1235,109 @@ class Document:
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
         target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+        if self.package is not None:
+            self._save_package(target_path)
+            return
+        if target_path.resolve() != self.original_path.resolve():
+            working = set(_list_parts(self.unpacked_path))
+            shutil.copytree(
+                self.original_path,
+                target_path,
+                dirs_exist_ok=True,
+                ignore=lambda directory, names: [
+                    name
+                    for name in names
+                    if Path(directory, name).relative_to(self.original_path).as_posix()
+                    in working
+                ],
+            )
+            shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+            return
 
-    # ==================== Private: Initialization ====================
+        # Writing in place: keep the original bytes of every overwritten part so
+        # a later validate() still compares against the document as opened
+        for name, source in _list_parts(self.unpacked_path).items():
+            target = target_path / name
+            if target.is_file():
+                data = source.read_bytes()
+                if target.read_bytes() == data:
+                    continue
+                pristine = self._baseline_parts / name
+                if name not in self._added_parts and not pristine.exists():
+                    pristine.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(target, pristine)
+                target.write_bytes(data)
+            else:
+                self._added_parts.add(name)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(source, target)
 
-    def _get_next_comment_id(self):
-        """Get the next available comment ID."""
-        if not self.comments_path.exists():
-            return 0
+    # ==================== Private: Working Copy ====================
 
-        editor = self["word/comments.xml"]
-        max_id = -1
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
-            if comment_id:
-                try:
-                    max_id = max(max_id, int(comment_id))
-                except ValueError:
-                    pass
-        return max_id + 1
+    def _part_path(self, xml_path):
+        """Return the working copy of a part, copying it from the original on first use."""
+        path = self.unpacked_path / xml_path
+        if not path.exists():
+            if self.package is not None:
+                if xml_path in self.package:
+                    self.package.extract(xml_path, path)
+            else:
+                source = self.original_path / xml_path
+                if source.is_file():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(source, path)
+        return path
+
+    def _has_part(self, path):
+        """Check if a part (given by its path under unpacked_path) exists in the document."""
+        relative = Path(path).relative_to(self.unpacked_path)
+        if Path(path).exists():
+            return True
+        if self.package is not None:
+            return relative.as_posix() in self.package
+        return (self.original_path / relative).is_file()
+
+    def _save_package(self, target_path):
+        """Write the working copies into the package and save it as target_path."""
+        for name, source in _list_parts(self.unpacked_path).items():
+            self.package.write(name, source.read_bytes())
+
+        if self._original_docx.resolve() == target_path.resolve():
+            # Keep the file as opened as the validation baseline
+            pristine = Path(self.temp_dir) / "original.docx"
+            try:
+                os.link(target_path, pristine)
+            except OSError:
+                shutil.copyfile(target_path, pristine)
+            self._original_docx = pristine
+        self.package.save(target_path)
+
+    def _create_part(self, path, template):
+        """Create a new part in the working copy from a template file."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(TEMPLATE_DIR / template, path)
+
+    # ==================== Private: Initialization ====================
 
     def _load_existing_comments(self):
         """Load existing comments from files to enable replies."""
-        if not self.comments_path.exists():
+        if not self._has_part(self.comments_path):
             return {}
 
         editor = self["word/comments.xml"]
+        dom = editor._backend
         existing = {}
 
-        for comment_elem in editor.dom.getElementsByTagName("w:comment"):
-            comment_id = comment_elem.getAttribute("w:id")
+        for comment_elem in dom.iter(editor.dom, "w:comment"):
+            comment_id = dom.get(comment_elem, "w:id")
             if not comment_id:
                 continue
 
             # Find para_id from the w:p element within the comment
             para_id = None
-            for p_elem in comment_elem.getElementsByTagName("w:p"):
-                para_id = p_elem.getAttribute("w14:paraId")
+            for p_elem in dom.iter(comment_elem, "w:p"):
+                para_id = dom.get(p_elem, "w14:paraId")
                 if para_id:
                     break
 
@@ -953,9 +1373,9 @@ class Document:
 
     def _update_people_xml(self, path):
         """Create people.xml if it doesn't exist."""
-        if not path.exists():
+        if not self._has_part(path):
             # Copy from template
-            shutil.copy(TEMPLATE_DIR / "people.xml", path)
+            self._create_part(path, "people.xml")
 
     def _add_content_type_for_people(self, path):
         """Add people.xml content type to [Content_Types].xml if not already present."""
@@ -965,7 +1385,7 @@ class Document:
             return
 
         # Add Override element
-        root = editor.dom.documentElement
+        root = editor._backend.root
         override_xml = '<Override PartName="/word/people.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.people+xml"/>'
         editor.append_to(root, override_xml)
 
@@ -976,8 +1396,8 @@ class Document:
         if self._has_relationship(editor, "people.xml"):
             return
 
-        root = editor.dom.documentElement
-        root_tag = root.tagName  # type: ignore
+        root = editor._backend.root
+        root_tag = editor._backend.tag(root)
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid = editor.get_next_rid()
 
@@ -997,14 +1417,16 @@ class Document:
         - rsids: late (after compat)
         """
         editor = self["word/settings.xml"]
+        dom = editor._backend
         root = editor.get_node(tag="w:settings")
-        prefix = root.tagName.split(":")[0] if ":" in root.tagName else "w"
+        root_tag = dom.tag(root)
+        prefix = root_tag.split(":")[0] if ":" in root_tag else "w"
 
         # Conditionally add trackRevisions if requested
         if track_revisions:
             track_revisions_exists = any(
-                elem.tagName == f"{prefix}:trackRevisions"
-                for elem in editor.dom.getElementsByTagName(f"{prefix}:trackRevisions")
+                dom.tag(elem) == f"{prefix}:trackRevisions"
+                for elem in dom.iter(editor.dom, f"{prefix}:trackRevisions")
             )
 
             if not track_revisions_exists:
@@ -1012,20 +1434,21 @@ class Document:
                 # Try to insert before documentProtection, defaultTabStop, or at start
                 inserted = False
                 for tag in [f"{prefix}:documentProtection", f"{prefix}:defaultTabStop"]:
-                    elements = editor.dom.getElementsByTagName(tag)
+                    elements = list(dom.iter(editor.dom, tag))
                     if elements:
                         editor.insert_before(elements[0], track_rev_xml)
                         inserted = True
                         break
                 if not inserted:
                     # Insert as first child of settings
-                    if root.firstChild:
-                        editor.insert_before(root.firstChild, track_rev_xml)
+                    first_child = dom.first_child(root)
+                    if first_child is not None:
+                        editor.insert_before(first_child, track_rev_xml)
                     else:
                         editor.append_to(root, track_rev_xml)
 
         # Always check if rsids section exists
-        rsids_elements = editor.dom.getElementsByTagName(f"{prefix}:rsids")
+        rsids_elements = list(dom.iter(editor.dom, f"{prefix}:rsids"))
 
         if not rsids_elements:
             # Add new rsids section
@@ -1036,14 +1459,14 @@ class Document:
 
             # Try to insert after compat, before clrSchemeMapping, or before closing tag
             inserted = False
-            compat_elements = editor.dom.getElementsByTagName(f"{prefix}:compat")
+            compat_elements = list(dom.iter(editor.dom, f"{prefix}:compat"))
             if compat_elements:
                 editor.insert_after(compat_elements[0], rsids_xml)
                 inserted = True
 
             if not inserted:
-                clr_elements = editor.dom.getElementsByTagName(
-                    f"{prefix}:clrSchemeMapping"
+                clr_elements = list(
+                    dom.iter(editor.dom, f"{prefix}:clrSchemeMapping")
                 )
                 if clr_elements:
                     editor.insert_before(clr_elements[0], rsids_xml)
@@ -1055,8 +1478,8 @@ class Document:
             # Check if this rsid already exists
             rsids_elem = rsids_elements[0]
             rsid_exists = any(
-                elem.getAttribute(f"{prefix}:val") == self.rsid
-                for elem in rsids_elem.getElementsByTagName(f"{prefix}:rsid")
+                dom.get(elem, f"{prefix}:val") == self.rsid
+                for elem in dom.iter(rsids_elem, f"{prefix}:rsid")
             )
 
             if not rsid_exists:
@@ -1065,70 +1488,40 @@ class Document:
 
     # ==================== Private: XML File Creation ====================
 
-    def _add_to_comments_xml(
-        self, comment_id, para_id, text, author, initials, timestamp
-    ):
-        """Add a single comment to comments.xml."""
-        if not self.comments_path.exists():
-            shutil.copy(TEMPLATE_DIR / "comments.xml", self.comments_path)
+    def _append_to_comment_part(self, path, root_tag, xml):
+        """Append a fragment to a comment part, creating it from its template if needed."""
+        if not xml:
+            return
+        if not self._has_part(path):
+            self._create_part(path, path.name)
 
-        editor = self["word/comments.xml"]
-        root = editor.get_node(tag="w:comments")
+        editor = self[path.relative_to(self.unpacked_path).as_posix()]
+        root = editor.get_node(tag=root_tag)
+        editor.append_to(root, xml)
+
+    # ==================== Private: XML Fragments ====================
 
+    def _comment_xml(self, comment_id, para_id, text):
+        """Generate XML for a w:comment in comments.xml.
+
+        Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
+        and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor.
+        """
         escaped_text = (
             text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
         )
-        # Note: w:rsidR, w:rsidRDefault, w:rsidP on w:p, w:rsidR on w:r,
-        # and w:author, w:date, w:initials on w:comment are automatically added by DocxXMLEditor
-        comment_xml = f'''<w:comment w:id="{comment_id}">
+        return f'''<w:comment w:id="{comment_id}">
   <w:p w14:paraId="{para_id}" w14:textId="77777777">
     <w:r><w:rPr><w:rStyle w:val="CommentReference"/></w:rPr><w:annotationRef/></w:r>
     <w:r><w:rPr><w:color w:val="000000"/><w:sz w:val="20"/><w:szCs w:val="20"/></w:rPr><w:t>{escaped_text}</w:t></w:r>
   </w:p>
 </w:comment>'''
-        editor.append_to(root, comment_xml)
-
-    def _add_to_comments_extended_xml(self, para_id, parent_para_id):
-        """Add a single comment to commentsExtended.xml."""
-        if not self.comments_extended_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtended.xml", self.comments_extended_path
-            )
-
-        editor = self["word/commentsExtended.xml"]
-        root = editor.get_node(tag="w15:commentsEx")
 
+    def _comment_extended_xml(self, para_id, parent_para_id):
+        """Generate XML for a w15:commentEx in commentsExtended.xml."""
         if parent_para_id:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
-        else:
-            xml = f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
-        editor.append_to(root, xml)
-
-    def _add_to_comments_ids_xml(self, para_id, durable_id):
-        """Add a single comment to commentsIds.xml."""
-        if not self.comments_ids_path.exists():
-            shutil.copy(TEMPLATE_DIR / "commentsIds.xml", self.comments_ids_path)
-
-        editor = self["word/commentsIds.xml"]
-        root = editor.get_node(tag="w16cid:commentsIds")
-
-        xml = f'<w16cid:commentId w16cid:paraId="{para_id}" w16cid:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
-
-    def _add_to_comments_extensible_xml(self, durable_id):
-        """Add a single comment to commentsExtensible.xml."""
-        if not self.comments_extensible_path.exists():
-            shutil.copy(
-                TEMPLATE_DIR / "commentsExtensible.xml", self.comments_extensible_path
-            )
-
-        editor = self["word/commentsExtensible.xml"]
-        root = editor.get_node(tag="w16cex:commentsExtensible")
-
-        xml = f'<w16cex:commentExtensible w16cex:durableId="{durable_id}"/>'
-        editor.append_to(root, xml)
-
-    # ==================== Private: XML Fragments ====================
+            return f'<w15:commentEx w15:paraId="{para_id}" w15:paraIdParent="{parent_para_id}" w15:done="0"/>'
+        return f'<w15:commentEx w15:paraId="{para_id}" w15:done="0"/>'
 
     def _comment_range_start_xml(self, comment_id):
         """Generate XML for comment range start."""
@@ -1159,22 +1552,22 @@ class Document:
 
     def _has_relationship(self, editor, target):
         """Check if a relationship with given target exists."""
-        for rel_elem in editor.dom.getElementsByTagName("Relationship"):
-            if rel_elem.getAttribute("Target") == target:
+        for rel_elem in editor._backend.iter(editor.dom, "Relationship"):
+            if editor._backend.get(rel_elem, "Target") == target:
                 return True
         return False
 
     def _has_override(self, editor, part_name):
         """Check if an override with given part name exists."""
-        for override_elem in editor.dom.getElementsByTagName("Override"):
-            if override_elem.getAttribute("PartName") == part_name:
+        for override_elem in editor._backend.iter(editor.dom, "Override"):
+            if editor._backend.get(override_elem, "PartName") == part_name:
                 return True
         return False
 
     def _has_author(self, editor, author):
         """Check if an author already exists in people.xml."""
-        for person_elem in editor.dom.getElementsByTagName("w15:person"):
-            if person_elem.getAttribute("w15:author") == author:
+        for person_elem in editor._backend.iter(editor.dom, "w15:person"):
+            if editor._backend.get(person_elem, "w15:author") == author:
                 return True
         return False
 
@@ -1183,7 +1576,7 @@ class Document:
         people_path = self.word_path / "people.xml"
 
         # people.xml should already exist from _setup_tracking
-        if not people_path.exists():
+        if not self._has_part(people_path):
             raise ValueError("people.xml should exist after _setup_tracking")
 
         editor = self["word/people.xml"]
@@ -1207,8 +1600,8 @@ class Document:
         if self._has_relationship(editor, "comments.xml"):
             return
 
-        root = editor.dom.documentElement
-        root_tag = root.tagName  # type: ignore
+        root = editor._backend.root
+        root_tag = editor._backend.tag(root)
         prefix = root_tag.split(":")[0] + ":" if ":" in root_tag else ""
         next_rid_num = int(editor.get_next_rid()[3:])
 
@@ -1247,7 +1640,7 @@ class Document:
         if self._has_override(editor, "/word/comments.xml"):
             return
 
-        root = editor.dom.documentElement
+        root = editor._backend.root
 
         # Add Override elements
         overrides = [
@@ -0,0 +1,764 @@
+"""
+Streaming redline engine: record the differences between two versions of a
+document.xml as tracked changes.
+
+Both files are streamed twice with lxml.etree.iterparse: once to key every
+child of <w:body> by its text, and once to write the output. Blocks are aligned
+with a paragraph-level diff; each changed paragraph is then diffed word by word
+and written as the original runs interleaved with <w:del> and <w:ins>. Only the
+blocks of the changed region being written are held in memory, so time and
+memory stay linear in the size of the document.
+
+Usage:
+    from skills.docx.scripts.redline import redline_document
+
+    # Both directories unpacked with ooxml/scripts/unpack.py
+    redline_document(
+        "original/word/document.xml",
+        "revised/word/document.xml",
+        "original/word/document.xml",  # The output may replace the original
+        rsid="00AB12CD",
+    )
+
+    # Register the RSID and author in settings.xml and people.xml
+    Document("original", rsid="00AB12CD").save()
+
+Limitations:
+    - Text is redlined; formatting-only changes (styles, run properties) are
+      not tracked, and changed paragraphs keep their original properties.
+    - Revised content that references other parts (images, hyperlinks,
+      footnotes) must resolve against the original package's relationships.
+"""
+
+import difflib
+import os
+import re
+from copy import deepcopy
+from datetime import datetime, timezone
+from pathlib import Path
+
+import lxml.etree
+
+from .document import _generate_hex_id, _generate_rsid
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W14_NAMESPACE = "http://schemas.microsoft.com/office/word/2010/wordml"
+W16DU_NAMESPACE = "http://schemas.microsoft.com/office/word/2023/wordml/word16du"
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+def _w(local_name):
+    return f"{{{W_NAMESPACE}}}{local_name}"
+
+
+BODY = _w("body")
+P = _w("p")
+R = _w("r")
+T = _w("t")
+PPR = _w("pPr")
+RPR = _w("rPr")
+TBL = _w("tbl")
+TR = _w("tr")
+TC = _w("tc")
+TRPR = _w("trPr")
+TBLPREX = _w("tblPrEx")
+SECTPR = _w("sectPr")
+INS = _w("ins")
+DEL = _w("del")
+MOVE_FROM = _w("moveFrom")
+MOVE_TO = _w("moveTo")
+DEL_TEXT = _w("delText")
+INSTR_TEXT = _w("instrText")
+DEL_INSTR_TEXT = _w("delInstrText")
+COMMENT_REFERENCE = _w("commentReference")
+LAST_RENDERED_PAGE_BREAK = _w("lastRenderedPageBreak")
+
+W_ID = _w("id")
+W_AUTHOR = _w("author")
+W_DATE = _w("date")
+W_RSID_R = _w("rsidR")
+W_RSID_DEL = _w("rsidDel")
+W_RSID_R_DEFAULT = _w("rsidRDefault")
+W_RSID_P = _w("rsidP")
+W14_PARA_ID = f"{{{W14_NAMESPACE}}}paraId"
+W14_TEXT_ID = f"{{{W14_NAMESPACE}}}textId"
+W16DU_DATE_UTC = f"{{{W16DU_NAMESPACE}}}dateUtc"
+XML_SPACE = f"{{{XML_NAMESPACE}}}space"
+
+# Zero-width paragraph children kept in place around redlined runs
+MARKER_TAGS = {
+    _w(name)
+    for name in (
+        "bookmarkStart",
+        "bookmarkEnd",
+        "commentRangeStart",
+        "commentRangeEnd",
+        "permStart",
+        "permEnd",
+        "proofErr",
+    )
+}
+# Elements whose runs are part of the paragraph text
+RUN_CONTAINER_TAGS = {
+    _w(name)
+    for name in ("hyperlink", "smartTag", "fldSimple", "customXml", "sdt", "sdtContent")
+}
+# Property changes dropped when a revised block is taken as accepted content
+PROPERTY_CHANGE_TAGS = {
+    _w(name)
+    for name in (
+        "pPrChange",
+        "rPrChange",
+        "sectPrChange",
+        "tblPrChange",
+        "tblPrExChange",
+        "tblGridChange",
+        "trPrChange",
+        "tcPrChange",
+        "numberingChange",
+    )
+}
+
+# Word-level tokens: runs of word characters, whitespace or punctuation
+WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+# Tags of the w:body children that end a block while streaming
+BLOCK_TAGS = (P, TBL, _w("sdt"), _w("customXml"), SECTPR)
+# Revised blocks looked at when pairing a changed original block
+PAIR_WINDOW = 20
+
+
+def redline_document(original_xml, revised_xml, output_xml, rsid=None, author="Claude"):
+    """Write original_xml with the changes that lead to revised_xml as tracked changes.
+
+    Unchanged blocks are copied from the original byte for byte. Changed
+    paragraphs are paired with their revision and redlined word by word;
+    blocks without a counterpart become deleted or inserted paragraphs,
+    tables and rows.
+
+    Args:
+        original_xml: Path to the original word/document.xml
+        revised_xml: Path to the revised word/document.xml
+        output_xml: Path to write; may be original_xml itself
+        rsid: RSID for the new runs and paragraphs. If not provided, one is generated.
+        author: Author of the tracked changes (default: "Claude")
+
+    Returns:
+        int: Number of w:ins and w:del elements written
+    """
+    redliner = _Redliner(rsid or _generate_rsid(), author)
+    return redliner.run(Path(original_xml), Path(revised_xml), Path(output_xml))
+
+
+class _Redliner:
+    """State of one redline_document() run: change IDs, namespaces and output."""
+
+    def __init__(self, rsid, author):
+        self.rsid = rsid
+        self.author = author
+        self.date = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.next_id = 0
+        # paraIds/textIds of the original, which new paragraph IDs must avoid
+        self.hex_ids = set()
+        self.nsmap = {}
+        self.root_declarations = None
+
+    def run(self, original_xml, revised_xml, output_xml):
+        # Pass 1: key both block streams and find the change and paragraph IDs in use
+        original_keys = []
+        max_id = -1
+        for block in _iter_blocks(original_xml):
+            original_keys.append(_block_key(block))
+            for change in block.iter(INS, DEL, MOVE_FROM, MOVE_TO):
+                try:
+                    max_id = max(max_id, int(change.get(W_ID, "")))
+                except ValueError:
+                    pass
+            for paragraph in block.iter(P):
+                for attr in (W14_PARA_ID, W14_TEXT_ID):
+                    try:
+                        self.hex_ids.add(int(paragraph.get(attr, ""), 16))
+                    except ValueError:
+                        pass
+        revised_keys = [_block_key(block) for block in _iter_blocks(revised_xml)]
+        self.next_id = first_id = max_id + 1
+
+        # Pass 2: stream both files again, writing the output as blocks are aligned
+        temp_name = output_xml.with_name(f".{output_xml.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_name, "wb") as out:
+                root_end = self._write_header(out, original_xml)
+
+                def emit(block):
+                    out.write(self._serialize(block))
+                    out.write(b"\n")
+
+                self._redline_blocks(
+                    original_keys,
+                    revised_keys,
+                    _iter_blocks(original_xml),
+                    _iter_blocks(revised_xml),
+                    emit,
+                )
+                out.write(root_end)
+            os.replace(temp_name, output_xml)
+        except BaseException:
+            temp_name.unlink(missing_ok=True)
+            raise
+        return self.next_id - first_id
+
+    # ==================== Block alignment ====================
+
+    def _redline_blocks(self, original_keys, revised_keys, originals, revised, emit):
+        """Align two block sequences and emit the redlined result in order.
+
+        originals and revised are iterators over the blocks keyed by
+        original_keys and revised_keys; they are consumed exactly once.
+        """
+        for op, i1, i2, j1, j2 in _block_opcodes(original_keys, revised_keys):
+            if op == "equal":
+                for _ in range(i2 - i1):
+                    emit(next(originals))
+                    next(revised)
+                continue
+            old = [(original_keys[i], next(originals)) for i in range(i1, i2)]
+            new = [(revised_keys[j], next(revised)) for j in range(j1, j2)]
+            for old_block, new_block in _pair_blocks(old, new):
+                for block in self._redline_pair(old_block, new_block):
+                    # Declare namespaces once, on the block, for the serializer to drop
+                    lxml.etree.cleanup_namespaces(block, top_nsmap=self.nsmap)
+                    emit(block)
+
+    def _redline_pair(self, old, new):
+        """Return the blocks that replace a paired or unpaired block."""
+        if old is not None and new is not None:
+            if old.tag == TBL:
+                return [self._redline_table(old, new)]
+            if _is_simple_paragraph(old) and _is_simple_paragraph(new):
+                return [self._redline_paragraph(old, new)]
+        # Unpaired blocks, and paragraphs with fields, hyperlinks or tracked
+        # changes, are deleted and inserted whole
+        blocks = []
+        if old is not None:
+            blocks.append(self._mark_block(old, DEL))
+        if new is not None:
+            blocks.append(self._mark_block(_accept_changes(new), INS))
+        return blocks
+
+    def _redline_table(self, old, new):
+        """Redline two tables of the same shape cell by cell."""
+        for old_row, new_row in zip(old.iterchildren(TR), new.iterchildren(TR)):
+            for old_cell, new_cell in zip(
+                old_row.iterchildren(TC), new_row.iterchildren(TC)
+            ):
+                old_blocks = [child for child in old_cell if _is_cell_block(child)]
+                new_blocks = [child for child in new_cell if _is_cell_block(child)]
+                for child in old_blocks:
+                    old_cell.remove(child)
+                self._redline_blocks(
+                    [_block_key(block) for block in old_blocks],
+                    [_block_key(block) for block in new_blocks],
+                    iter(old_blocks),
+                    iter(new_blocks),
+                    old_cell.append,
+                )
+        return old
+
+    # ==================== Paragraph redlining ====================
+
+    def _redline_paragraph(self, old, new):
+        """Return old rewritten as its runs plus word-level w:del/w:ins towards new."""
+        paragraph = self._element(P, dict(old.attrib))
+        properties = old.find(PPR)
+        if properties is not None:
+            paragraph.append(_detached_copy(properties))
+
+        old_atoms = _atoms(old, markers=True)
+        new_atoms = _atoms(new, markers=False)
+        old_keys, old_bounds = _tokens(old_atoms)
+        new_keys, new_bounds = _tokens(new_atoms)
+
+        matcher = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+        for op, i1, i2, j1, j2 in matcher.get_opcodes():
+            old_span = old_atoms[old_bounds[i1] : old_bounds[i2]]
+            new_span = new_atoms[new_bounds[j1] : new_bounds[j2]]
+            if op == "equal":
+                self._emit_atoms(paragraph, old_span, None)
+                continue
+            self._emit_atoms(paragraph, old_span, DEL)
+            self._emit_atoms(paragraph, new_span, INS)
+        # Markers after the last word
+        self._emit_atoms(paragraph, old_atoms[old_bounds[-1] :], None)
+        return paragraph
+
+    def _emit_atoms(self, paragraph, atoms, change):
+        """Append runs rebuilt from atoms, wrapped in a new change element if given."""
+        wrapper = run = source = text = None
+        texts = []
+        for key, source_run, node in atoms:
+            if source_run is None:
+                # Markers stay outside w:ins/w:del
+                paragraph.append(_detached_copy(node))
+                wrapper = run = None
+                continue
+            if change is not None and wrapper is None:
+                wrapper = self._change(change)
+                paragraph.append(wrapper)
+                run = None
+            if run is None or source_run is not source:
+                run = self._copy_run(source_run, change)
+                (paragraph if wrapper is None else wrapper).append(run)
+                source = source_run
+                text = None
+            if node is None:
+                if text is None:
+                    text = lxml.etree.SubElement(run, DEL_TEXT if change == DEL else T)
+                    texts.append((text, []))
+                texts[-1][1].append(key)
+            else:
+                child = _detached_copy(node)
+                if change == DEL and child.tag == INSTR_TEXT:
+                    child.tag = DEL_INSTR_TEXT
+                run.append(child)
+                text = None
+
+        for elem, chars in texts:
+            value = "".join(chars)
+            elem.text = value
+            if value[0].isspace() or value[-1].isspace():
+                elem.set(XML_SPACE, "preserve")
+
+    def _copy_run(self, source, change):
+        """Return an empty copy of a run: its attributes and w:rPr."""
+        run = self._element(R, dict(source.attrib))
+        properties = source.find(RPR)
+        if properties is not None:
+            run.append(_detached_copy(properties))
+        if change == DEL:
+            self._set_deleted_rsid(run)
+        elif change == INS:
+            run.attrib.pop(W_RSID_DEL, None)
+            run.set(W_RSID_R, self.rsid)
+        return run
+
+    # ==================== Whole-block changes ====================
+
+    def _mark_block(self, block, change):
+        """Mark every paragraph, run and table row of block as inserted or deleted."""
+        for paragraph in list(block.iter(P)):
+            # Text boxes are covered by the run that holds their drawing
+            if any(ancestor.tag == R for ancestor in paragraph.iterancestors()):
+                continue
+            self._mark_paragraph(paragraph, change)
+            self._wrap_runs(paragraph, change)
+            if change == INS:
+                for attr in (W_RSID_R, W_RSID_R_DEFAULT, W_RSID_P):
+                    paragraph.set(attr, self.rsid)
+                for attr in (W14_PARA_ID, W14_TEXT_ID):
+                    if paragraph.get(attr) is not None:
+                        paragraph.set(attr, _generate_hex_id(self.hex_ids))
+        for row in block.iter(TR):
+            self._mark_row(row, change)
+        return block
+
+    def _mark_paragraph(self, paragraph, change):
+        """Mark the paragraph mark (w:pPr/w:rPr) as inserted or deleted."""
+        properties = paragraph.find(PPR)
+        if properties is None:
+            properties = lxml.etree.Element(PPR)
+            paragraph.insert(0, properties)
+        run_properties = properties.find(RPR)
+        if run_properties is None:
+            run_properties = lxml.etree.Element(RPR)
+            # w:rPr precedes w:sectPr and w:pPrChange
+            anchor = next(properties.iterchildren(SECTPR, _w("pPrChange")), None)
+            if anchor is not None:
+                anchor.addprevious(run_properties)
+            else:
+                properties.append(run_properties)
+        if run_properties.find(change) is not None:
+            return
+        # w:ins comes before w:del at the start of the paragraph mark properties
+        existing_ins = run_properties.find(INS) if change == DEL else None
+        if existing_ins is not None:
+            existing_ins.addnext(self._change(change))
+        else:
+            run_properties.insert(0, self._change(change))
+
+    def _mark_row(self, row, change):
+        """Mark a table row as inserted or deleted in its w:trPr."""
+        properties = row.find(TRPR)
+        if properties is None:
+            properties = lxml.etree.Element(TRPR)
+            row.insert(1 if len(row) and row[0].tag == TBLPREX else 0, properties)
+        if properties.find(change) is not None:
+            return
+        anchor = properties.find(_w("trPrChange"))
+        if anchor is not None:
+            anchor.addprevious(self._change(change))
+        else:
+            properties.append(self._change(change))
+
+    def _wrap_runs(self, container, change):
+        """Wrap each sequence of sibling runs in container in a new change element."""
+        group = []
+        for child in list(container):
+            if child.tag == R:
+                group.append(child)
+                continue
+            self._wrap_group(group, change)
+            group = []
+            if child.tag in RUN_CONTAINER_TAGS or (child.tag == INS and change == DEL):
+                # Deleting another author's insertion nests w:del inside their w:ins
+                self._wrap_runs(child, change)
+        self._wrap_group(group, change)
+
+    def _wrap_group(self, runs, change):
+        if not runs:
+            return
+        wrapper = self._change(change)
+        runs[0].addprevious(wrapper)
+        for run in runs:
+            if change == DEL:
+                for text in run.iter(T):
+                    text.tag = DEL_TEXT
+                for instruction in run.iter(INSTR_TEXT):
+                    instruction.tag = DEL_INSTR_TEXT
+                self._set_deleted_rsid(run)
+            else:
+                run.attrib.pop(W_RSID_DEL, None)
+                run.set(W_RSID_R, self.rsid)
+            wrapper.append(run)
+
+    # ==================== Output ====================
+
+    def _change(self, tag):
+        """Create a w:ins or w:del with the next change ID, author and date."""
+        change = self._element(tag)
+        change.set(W_ID, str(self.next_id))
+        change.set(W_AUTHOR, self.author)
+        change.set(W_DATE, self.date)
+        change.set(W16DU_DATE_UTC, self.date)
+        self.next_id += 1
+        return change
+
+    def _set_deleted_rsid(self, run):
+        # Same convention as DocxXMLEditor.suggest_deletion: w:rsidR → w:rsidDel
+        if run.get(W_RSID_R) is not None:
+            run.set(W_RSID_DEL, run.get(W_RSID_R))
+            del run.attrib[W_RSID_R]
+        elif run.get(W_RSID_DEL) is None:
+            run.set(W_RSID_DEL, self.rsid)
+
+    def _element(self, tag, attrib=None):
+        """Create an element that uses the prefixes declared on the output root."""
+        return lxml.etree.Element(tag, attrib, nsmap=self.nsmap)
+
+    def _write_header(self, out, xml_file):
+        """Write everything up to the first block of the body; return the closing tags."""
+        root, before_body = _read_header(xml_file)
+        self.nsmap = dict(root.nsmap)
+        for prefix, namespace in (("w14", W14_NAMESPACE), ("w16du", W16DU_NAMESPACE)):
+            if namespace not in self.nsmap.values():
+                self.nsmap.setdefault(prefix, namespace)
+        self.root_declarations = re.compile(
+            b"|".join(
+                re.escape(f' xmlns:{prefix}="{namespace}"' if prefix else f' xmlns="{namespace}"')
+                .encode()
+                for prefix, namespace in self.nsmap.items()
+            )
+        )
+
+        root_start, root_end = self._tags(root.tag, dict(root.attrib))
+        body_start, body_end = self._tags(BODY)
+        out.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+        out.write(root_start)
+        for elem in before_body:
+            out.write(self._serialize(elem))
+        out.write(self._strip_declarations(body_start) + b"\n")
+        return body_end + root_end
+
+    def _tags(self, tag, attrib=None):
+        """Return the start and end tags of an element as written in the output."""
+        shell = self._element(tag, attrib)
+        shell.text = "x"
+        data = lxml.etree.tostring(shell, encoding="UTF-8", xml_declaration=False)
+        start, end = data.split(b">x<")
+        return start + b">", b"<" + end
+
+    def _serialize(self, elem):
+        """Serialize a block without the namespace declarations of the output root."""
+        data = lxml.etree.tostring(
+            elem, encoding="UTF-8", xml_declaration=False, with_tail=False
+        )
+        end = data.index(b">")
+        return self._strip_declarations(data[:end]) + data[end:]
+
+    def _strip_declarations(self, start_tag):
+        return self.root_declarations.sub(b"", start_tag)
+
+
+# ==================== Block streams ====================
+
+
+def _read_header(xml_file):
+    """Return the root element of a document.xml and its children before w:body.
+
+    Parsing stops at the start of w:body, so only the head of the file is read.
+    """
+    root = None
+    for _, elem in lxml.etree.iterparse(str(xml_file), events=("start",), huge_tree=True):
+        if root is None:
+            root = elem
+        elif elem.tag == BODY:
+            return root, [child for child in root if child is not elem]
+    return root, []
+
+
+def _iter_blocks(xml_file):
+    """Yield the children of w:body one at a time, detached from the tree."""
+    # Filtering events by tag keeps the per-element work in C; body children
+    # with other tags are picked up when the next block ends
+    context = lxml.etree.iterparse(
+        str(xml_file), events=("end",), tag=BLOCK_TAGS, huge_tree=True
+    )
+    for _, elem in context:
+        body = elem.getparent()
+        if body is None or body.tag != BODY:
+            continue
+        while body[0] is not elem:
+            yield from _detach(body[0])
+        yield from _detach(elem)
+
+    body = context.root.find(BODY) if context.root is not None else None
+    while body is not None and len(body):
+        yield from _detach(body[0])
+
+
+def _detach(elem):
+    elem.getparent().remove(elem)
+    if isinstance(elem.tag, str):
+        elem.tail = None
+        yield elem
+
+
+def _block_opcodes(a, b):
+    """SequenceMatcher opcodes for two key lists, with the common ends trimmed first."""
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < limit - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+
+    opcodes = [("equal", 0, start, 0, start)] if start else []
+    matcher = difflib.SequenceMatcher(
+        None, a[start : len(a) - end], b[start : len(b) - end], autojunk=False
+    )
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        opcodes.append((op, i1 + start, i2 + start, j1 + start, j2 + start))
+    if end:
+        opcodes.append(("equal", len(a) - end, len(a), len(b) - end, len(b)))
+    return opcodes
+
+
+def _pair_blocks(old, new):
+    """Pair changed blocks in document order.
+
+    Args:
+        old: List of (key, block) from the original
+        new: List of (key, block) from the revision
+
+    Yields:
+        (old block, new block) tuples; either side is None for a block that
+        has no counterpart
+    """
+    j = 0
+    for old_key, old_block in old:
+        match = None
+        for k in range(j, min(len(new), j + PAIR_WINDOW)):
+            if _similar(old_key, old_block, *new[k]):
+                match = k
+                break
+        if match is None:
+            yield old_block, None
+            continue
+        for _, new_block in new[j:match]:
+            yield None, new_block
+        yield old_block, new[match][1]
+        j = match + 1
+    for _, new_block in new[j:]:
+        yield None, new_block
+
+
+def _similar(old_key, old_block, new_key, new_block):
+    """Return True if new_block is a revision of old_block rather than a new block."""
+    if old_block.tag != new_block.tag:
+        return False
+    if old_block.tag == TBL:
+        return _table_shape(old_block) == _table_shape(new_block)
+    if old_block.tag != P:
+        return False
+    matcher = difflib.SequenceMatcher(None, old_key, new_key, autojunk=False)
+    return (
+        matcher.real_quick_ratio() >= 0.5
+        and matcher.quick_ratio() >= 0.5
+        and matcher.ratio() >= 0.5
+    )
+
+
+def _table_shape(table):
+    return [len(row.findall(TC)) for row in table.iterchildren(TR)]
+
+
+def _is_cell_block(elem):
+    return isinstance(elem.tag, str) and elem.tag != _w("tcPr")
+
+
+# ==================== Keys and atoms ====================
+
+
+def _block_key(block):
+    """Return the text a block is compared by; equal keys mean an unchanged block."""
+    if block.tag == P:
+        return "\x02" + _paragraph_key(block)
+    if block.tag == TBL:
+        return "\x03" + "\x1e".join(
+            "\x1f".join(
+                "\x1d".join(_paragraph_key(p) for p in cell.iter(P))
+                for cell in row.iterchildren(TC)
+            )
+            for row in block.iterchildren(TR)
+        )
+    return lxml.etree.QName(block).localname + "\x1d".join(
+        _paragraph_key(p) for p in block.iter(P)
+    )
+
+
+def _paragraph_key(paragraph):
+    return "".join(
+        (node.text or "") if node.tag == T else _object_key(node)
+        for run, node in _iter_content(paragraph)
+        if run is not None
+    )
+
+
+def _object_key(node):
+    """Key of a non-text run child such as w:tab, w:br or w:drawing."""
+    if len(node) == 0 and not node.text:
+        return f"\x00{node.tag}{sorted(node.attrib.items())}\x00"
+    return "\x00" + lxml.etree.tostring(node, method="c14n", exclusive=True).decode() + "\x00"
+
+
+def _iter_content(container):
+    """Yield (run, node) for each run child in reading order, (None, marker) for markers.
+
+    Deleted content is skipped and inserted content included, so the
+    sequence is the text as it reads with all tracked changes accepted.
+    """
+    for child in container:
+        tag = child.tag
+        if tag == R:
+            for node in child:
+                if isinstance(node.tag, str) and node.tag not in (RPR, LAST_RENDERED_PAGE_BREAK):
+                    yield child, node
+        elif tag in RUN_CONTAINER_TAGS or tag in (INS, MOVE_TO):
+            yield from _iter_content(child)
+        elif tag in MARKER_TAGS:
+            yield None, child
+
+
+def _is_simple_paragraph(paragraph):
+    """True if a paragraph holds only runs and markers, so it can be rebuilt from atoms."""
+    return all(
+        child.tag in (PPR, R) or child.tag in MARKER_TAGS
+        for child in paragraph
+        if isinstance(child.tag, str)
+    )
+
+
+def _atoms(paragraph, markers):
+    """Split a paragraph into atoms: (char, run, None), (key, run, node) or (None, None, marker).
+
+    Comment references and markers are left out of revised paragraphs, as
+    they point to parts of the other package.
+    """
+    atoms = []
+    for run, node in _iter_content(paragraph):
+        if run is None:
+            if markers:
+                atoms.append((None, None, node))
+        elif node.tag == T:
+            atoms.extend((char, run, None) for char in node.text or "")
+        elif markers or node.tag != COMMENT_REFERENCE:
+            atoms.append((_object_key(node), run, node))
+    return atoms
+
+
+def _tokens(atoms):
+    """Group atoms into word tokens.
+
+    Returns:
+        tuple: (token keys, bounds) where token i spans atoms[bounds[i]:bounds[i + 1]].
+            Markers belong to the token that follows them; bounds[-1] is where
+            the trailing markers start.
+    """
+    keys = []
+    bounds = [0]
+    i = 0
+    while i < len(atoms):
+        key, run, node = atoms[i]
+        if run is None:
+            i += 1
+            continue
+        if node is not None:
+            keys.append(key)
+            i += 1
+            bounds.append(i)
+            continue
+        j = i
+        while j < len(atoms) and atoms[j][1] is not None and atoms[j][2] is None:
+            j += 1
+        position = i
+        for word in WORD_PATTERN.findall("".join(atom[0] for atom in atoms[i:j])):
+            position += len(word)
+            keys.append(word)
+            bounds.append(position)
+        i = j
+    return keys, bounds
+
+
+# ==================== Revised content ====================
+
+
+def _accept_changes(block):
+    """Take a revised block as plain content: accept its tracked changes and
+    drop markers and comment references, which belong to the other package."""
+    for elem in list(block.iter(DEL, MOVE_FROM, *MARKER_TAGS, *PROPERTY_CHANGE_TAGS)):
+        if elem.getparent() is not None:
+            elem.getparent().remove(elem)
+    for reference in list(block.iter(COMMENT_REFERENCE)):
+        run = reference.getparent()
+        if run.getparent() is not None:
+            run.getparent().remove(run)
+    for wrapper in list(block.iter(INS, MOVE_TO)):
+        parent = wrapper.getparent()
+        if parent is None:
+            continue
+        if parent.tag in (RPR, TRPR):
+            parent.remove(wrapper)
+            continue
+        for child in list(wrapper):
+            wrapper.addprevious(child)
+        parent.remove(wrapper)
+    return block
+
+
+def _detached_copy(elem):
+    copy = deepcopy(elem)
+    copy.tail = None
+    return copy
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -16,6 +16,10 @@ Example usage:
     # Find node by text content
     elem = editor.get_node(tag="w:p", contains="specific text")
 
+    # Find text even when it is split across runs; each match lists its runs
+    for match in editor.find_text("Effective Date"):
+        print(match.paragraph, match.runs)
+
     # Find node by attributes
     elem = editor.get_node(tag="w:r", attrs={"w:id": "target"})
 
@@ -26,16 +30,33 @@ Example usage:
     new_elem = editor.replace_node(elem, "<w:r><w:t>new text</w:t></w:r>")
     editor.insert_after(new_elem, "<w:r><w:t>more</w:t></w:r>")
 
+    # Apply many edits together (fragments are parsed in one go)
+    with editor.batch():
+        for para in paragraphs:
+            editor.insert_after(para, "<w:p><w:r><w:t>added</w:t></w:r></w:p>")
+
     # Save changes
     editor.save()
+
+    # Large parts: same API on an lxml tree (get_node returns lxml elements)
+    editor = XMLEditor("document.xml", engine="lxml")
+
+    # A part of a .docx opened with ooxml.scripts.package.Package, no unpacking
+    editor = XMLEditor("word/document.xml", package=package)
 """
 
+import bisect
+import contextlib
+import copy
 import html
+import io
+import re
 from pathlib import Path
 from typing import Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
 
 
 class XMLEditor:
@@ -46,32 +67,67 @@ class XMLEditor:
     of each element. This enables finding nodes by their line number in the original
     file, which is useful when working with Read tool output.
 
+    Two engines are available. "minidom" (the default) returns
+    defusedxml.minidom elements. "lxml" parses into an lxml.etree tree, which
+    takes a fraction of the memory and time on large parts such as a 20-50 MB
+    word/document.xml; get_node and the insert methods then return
+    lxml.etree elements. Tag and attribute names are prefixed ("w:p") in both.
+
     Attributes:
-        xml_path: Path to the XML file being edited
+        xml_path: Path to the XML file being edited (the part name with a package)
+        package: The Package the part is read from and saved to, or None
         encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
-        dom: Parsed DOM tree with parse_position attributes on elements
+        engine: Name of the parsing engine ('minidom' or 'lxml')
+        dom: Parsed tree: a minidom Document with parse_position attributes on
+            elements, or an lxml.etree ElementTree (elements have sourceline)
     """
 
-    def __init__(self, xml_path):
+    def __init__(self, xml_path, engine="minidom", package=None):
         """
         Initialize with path to XML file and parse with line number tracking.
 
         Args:
-            xml_path: Path to XML file to edit (str or Path)
+            xml_path: Path to XML file to edit (str or Path), or the part name
+                (e.g. "word/document.xml") when package is given
+            engine: "minidom" (default) or "lxml"
+            package: Optional ooxml.scripts.package.Package to read the part from;
+                save() then writes it back into the package instead of a file
 
         Raises:
-            ValueError: If the XML file does not exist
+            ValueError: If the XML file does not exist or the engine is unknown
         """
         self.xml_path = Path(xml_path)
-        if not self.xml_path.exists():
+        self.package = package
+        if package is not None:
+            if self.xml_path.as_posix() not in package:
+                raise ValueError(f"XML part not found: {xml_path}")
+        elif not self.xml_path.exists():
             raise ValueError(f"XML file not found: {xml_path}")
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine: {engine}. Use one of: {', '.join(ENGINES)}"
+            )
 
-        with open(self.xml_path, "rb") as f:
-            header = f.read(200).decode("utf-8", errors="ignore")
+        if package is not None:
+            content = package.read(self.xml_path.as_posix())
+            header = content[:200].decode("utf-8", errors="ignore")
+            source = io.BytesIO(content)
+        else:
+            with open(self.xml_path, "rb") as f:
+                header = f.read(200).decode("utf-8", errors="ignore")
+            source = str(self.xml_path)
         self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
 
-        parser = _create_line_tracking_parser()
-        self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
+        self.engine = engine
+        self._backend = ENGINES[engine](source)
+        self.dom = self._backend.dom
+
+        # Lookup indexes for get_node, built on first use
+        self._node_index = None
+        # Next free rId, found by a scan on first get_next_rid()
+        self._next_rid = None
+        # Edits queued by batch(), or None outside a batch
+        self._batch = None
 
     def get_node(
         self,
@@ -94,7 +150,8 @@ class XMLEditor:
                       Supports both entity notation (&#8220;) and Unicode characters (\u201c).
 
         Returns:
-            defusedxml.minidom.Element: The matching DOM element
+            The matching element (defusedxml.minidom.Element, or
+            lxml.etree._Element with engine="lxml")
 
         Raises:
             ValueError: If node not found or multiple matches found
@@ -109,40 +166,32 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
-
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
-
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
-
-            # Check contains filter
-            if contains is not None:
-                elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
+        # Normalize the search string: convert HTML entities to Unicode characters
+        # This allows searching for both "&#8220;Rowan" and ""Rowan"
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        if self._node_index is None:
+            self._node_index = _NodeIndex(self)
+        candidates = self._node_index.candidates(
+            tag, attrs, line_number, normalized_contains
+        )
+        matches = [
+            elem
+            for elem in candidates
+            if self._backend.is_attached(elem)
+            and self._matches(elem, attrs, line_number, normalized_contains)
+        ]
 
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        if not matches:
+            # The index cannot see DOM changes made outside the editor methods,
+            # so confirm a miss with a full scan before reporting it
+            matches = [
+                elem
+                for elem in self._backend.iter(self.dom, tag)
+                if self._matches(elem, attrs, line_number, normalized_contains)
+            ]
+            if matches:
+                self._node_index = None
 
         if not matches:
             # Build descriptive error message
@@ -164,7 +213,10 @@ class XMLEditor:
 
             # Add helpful hint based on filters used
             if contains:
-                hint = "Text may be split across elements or use different wording."
+                hint = (
+                    "Text may be split across elements (find_text() searches "
+                    "across runs) or use different wording."
+                )
             elif line_number:
                 hint = "Line numbers may have changed if document was modified."
             elif attrs:
@@ -180,167 +232,978 @@ class XMLEditor:
             )
         return matches[0]
 
+    def find_text(self, pattern, regex=False):
+        """
+        Find text in the paragraphs of a WordprocessingML part, across run boundaries.
+
+        Each w:p is searched as the concatenated text of its own runs: w:t
+        content, with w:tab as "\\t" and w:br/w:cr as "\\n". Deleted text
+        (w:delText) and the runs of nested paragraphs (text boxes) are not part
+        of it, so a match never spans two paragraphs. The text map is built on
+        the first call and updated for the paragraphs touched by later edits.
+
+        Args:
+            pattern: Text to find (entity notation is accepted, as in get_node),
+                or a regular expression when regex=True or a compiled pattern is given
+            regex: Treat a string pattern as a regular expression
+
+        Returns:
+            List of TextMatch in document order; empty matches are skipped
+
+        Example:
+            matches = editor.find_text("Effective Date")
+            matches = editor.find_text(r"\\$[\\d,]+(\\.\\d\\d)?", regex=True)
+            run, start, end = matches[0].runs[0]  # Offsets into that run's text
+        """
+        if isinstance(pattern, re.Pattern):
+            compiled, literal = pattern, None
+        elif regex:
+            compiled, literal = re.compile(pattern), None
+        else:
+            literal = html.unescape(pattern)
+            compiled = re.compile(re.escape(literal))
+
+        if self._node_index is None:
+            self._node_index = _NodeIndex(self)
+        return self._node_index.find_text(compiled, literal)
+
+    def invalidate_index(self):
+        """Drop the get_node and find_text indexes so they are rebuilt on next use.
+
+        Edits made through replace_node/insert_*/append_to keep the indexes up
+        to date. Call this after creating elements or changing attributes
+        directly on the DOM.
+        """
+        self._node_index = None
+        self._next_rid = None
+
+    def _matches(self, elem, attrs, line_number, contains):
+        """Return True if elem passes every get_node filter that is set."""
+        # Check line_number filter
+        if line_number is not None:
+            elem_line = self._backend.line(elem)
+
+            # Handle both single line number and range
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    return False
+            else:
+                if elem_line != line_number:
+                    return False
+
+        # Check attrs filter
+        if attrs is not None:
+            if not all(
+                self._backend.get(elem, attr_name) == attr_value
+                for attr_name, attr_value in attrs.items()
+            ):
+                return False
+
+        # Check contains filter
+        if contains is not None:
+            if contains not in self._get_element_text(elem):
+                return False
+
+        return True
+
     def _get_element_text(self, elem):
         """
-        Recursively extract all text content from an element.
+        Extract all text content from an element.
 
         Skips text nodes that contain only whitespace (spaces, tabs, newlines),
         which typically represent XML formatting rather than document content.
 
         Args:
-            elem: defusedxml.minidom.Element to extract text from
+            elem: Element to extract text from
 
         Returns:
             str: Concatenated text from all non-whitespace text nodes within the element
         """
-        text_parts = []
-        for node in elem.childNodes:
-            if node.nodeType == node.TEXT_NODE:
-                # Skip whitespace-only text nodes (XML formatting)
-                if node.data.strip():
-                    text_parts.append(node.data)
-            elif node.nodeType == node.ELEMENT_NODE:
-                text_parts.append(self._get_element_text(node))
-        return "".join(text_parts)
+        return self._backend.text(elem)
 
     def replace_node(self, elem, new_content):
         """
         Replace a DOM element with new XML content.
 
         Args:
-            elem: defusedxml.minidom.Element to replace
+            elem: Element to replace
             new_content: String containing XML to replace the node with
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes (filled when the batch() block exits)
 
         Example:
             new_nodes = editor.replace_node(old_elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(new_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        parent.removeChild(elem)
-        return nodes
+        return self._edit("replace", elem, new_content)
 
     def insert_after(self, elem, xml_content):
         """
         Insert XML content after a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert after
+            elem: Element to insert after
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes (filled when the batch() block exits)
 
         Example:
             new_nodes = editor.insert_after(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        next_sibling = elem.nextSibling
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            if next_sibling:
-                parent.insertBefore(node, next_sibling)
-            else:
-                parent.appendChild(node)
-        return nodes
+        return self._edit("insert_after", elem, xml_content)
 
     def insert_before(self, elem, xml_content):
         """
         Insert XML content before a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to insert before
+            elem: Element to insert before
             xml_content: String containing XML to insert
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes (filled when the batch() block exits)
 
         Example:
             new_nodes = editor.insert_before(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        parent = elem.parentNode
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            parent.insertBefore(node, elem)
-        return nodes
+        return self._edit("insert_before", elem, xml_content)
 
     def append_to(self, elem, xml_content):
         """
         Append XML content as a child of a DOM element.
 
         Args:
-            elem: defusedxml.minidom.Element to append to
+            elem: Element to append to
             xml_content: String containing XML to append
 
         Returns:
-            List[defusedxml.minidom.Node]: All inserted nodes
+            List of all inserted nodes (filled when the batch() block exits)
 
         Example:
             new_nodes = editor.append_to(elem, "<w:r><w:t>text</w:t></w:r>")
         """
-        nodes = self._parse_fragment(xml_content)
-        for node in nodes:
-            elem.appendChild(node)
+        return self._edit("append", elem, xml_content)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Queue replace_node/insert_*/append_to calls and apply them together.
+
+        Inside the block those methods return an empty list that is filled with
+        the inserted nodes when the block exits. All queued fragments are then
+        parsed in one go, the edits are applied in order, and post-processing
+        (such as DocxXMLEditor's attribute injection) runs once over all new
+        nodes. If the block raises, the queued edits are discarded. Nested
+        batch() blocks join the outermost one; other methods apply immediately.
+
+        Example:
+            with editor.batch():
+                for para in paragraphs:
+                    editor.insert_after(para, "<w:p><w:r><w:t>added</w:t></w:r></w:p>")
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = edits = []
+        try:
+            yield
+        finally:
+            self._batch = None
+
+        if edits:
+            fragments = self._parse_fragments([xml for _, _, xml, _ in edits])
+            inserted = []
+            for (operation, elem, _, result), nodes in zip(edits, fragments):
+                self._apply_edit(operation, elem, nodes)
+                result.extend(nodes)
+                inserted.extend(nodes)
+            self._on_insert(inserted)
+
+    def _edit(self, operation, elem, xml_content):
+        """Apply an edit now, or queue it inside batch()."""
+        if self._batch is not None:
+            result = []
+            self._batch.append((operation, elem, xml_content, result))
+            return result
+
+        nodes = self._parse_fragments([xml_content])[0]
+        self._apply_edit(operation, elem, nodes)
+        self._on_insert(nodes)
         return nodes
 
+    def _apply_edit(self, operation, elem, nodes):
+        """Insert parsed nodes relative to elem ("replace", "insert_after", ...)."""
+        if operation == "append":
+            parent = elem
+            for node in nodes:
+                self._backend.append(elem, node)
+        else:
+            parent = self._backend.parent(elem)
+            if operation == "insert_after":
+                previous = elem
+                for node in nodes:
+                    self._backend.insert_after(previous, node)
+                    previous = node
+            else:
+                for node in nodes:
+                    self._backend.insert_before(elem, node)
+                if operation == "replace":
+                    self._backend.remove(elem)
+        self._index_changed(parent, nodes)
+
+    def _on_insert(self, nodes):
+        """Hook called once nodes are in the document; subclasses add attributes."""
+
+    def _index_changed(self, parent, nodes):
+        """Tell the get_node indexes that nodes were inserted under parent.
+
+        Also used after in-place rewrites, with nodes being the rewritten subtree.
+        """
+        if self._node_index is not None:
+            self._node_index.changed(parent, nodes)
+        if self._next_rid is not None:
+            for node in nodes:
+                if (
+                    self._backend.is_element(node)
+                    and self._backend.tag(node) == "Relationship"
+                ):
+                    self._reserve_rid(self._backend.get(node, "Id"))
+
     def get_next_rid(self):
-        """Get the next available rId for relationships files."""
-        max_id = 0
-        for rel_elem in self.dom.getElementsByTagName("Relationship"):
-            rel_id = rel_elem.getAttribute("Id")
-            if rel_id.startswith("rId"):
-                try:
-                    max_id = max(max_id, int(rel_id[3:]))
-                except ValueError:
-                    pass
-        return f"rId{max_id + 1}"
+        """Allocate the next available rId for relationships files.
+
+        Relationships are scanned once; later rIds come from a counter, which
+        also skips the rIds of Relationship elements inserted through the editor.
+        """
+        if self._next_rid is None:
+            self._next_rid = 1
+            for rel_elem in self._backend.iter(self.dom, "Relationship"):
+                self._reserve_rid(self._backend.get(rel_elem, "Id"))
+        rid = f"rId{self._next_rid}"
+        self._next_rid += 1
+        return rid
+
+    def _reserve_rid(self, rel_id):
+        """Keep the rId counter above rel_id."""
+        if rel_id.startswith("rId"):
+            try:
+                self._next_rid = max(self._next_rid, int(rel_id[3:]) + 1)
+            except ValueError:
+                pass
 
     def save(self):
         """
         Save the edited XML back to the file.
 
-        Serializes the DOM tree and writes it back to the original file path,
-        preserving the original encoding (ascii or utf-8).
+        Serializes the DOM tree and writes it back to the original file path (or
+        part of the package), preserving the original encoding (ascii or utf-8).
         """
-        content = self.dom.toxml(encoding=self.encoding)
-        self.xml_path.write_bytes(content)
+        content = self._backend.serialize(self.encoding)
+        if self.package is not None:
+            self.package.write(self.xml_path.as_posix(), content)
+        else:
+            self.xml_path.write_bytes(content)
 
-    def _parse_fragment(self, xml_content):
+    def _parse_fragments(self, xml_contents):
         """
-        Parse XML fragment and return list of imported nodes.
+        Parse XML fragments in a single parser run.
 
         Args:
-            xml_content: String containing XML fragment
+            xml_contents: List of strings containing XML fragments
 
         Returns:
-            List of defusedxml.minidom.Node objects imported into this document
+            One list of nodes ready to be inserted into this document per fragment
 
         Raises:
-            AssertionError: If fragment contains no element nodes
+            AssertionError: If a fragment contains no element nodes
         """
-        # Extract namespace declarations from the root document element
-        root_elem = self.dom.documentElement
-        namespaces = []
-        if root_elem and root_elem.attributes:
-            for i in range(root_elem.attributes.length):
-                attr = root_elem.attributes.item(i)
-                if attr.name.startswith("xmlns"):  # type: ignore
-                    namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
-
-        ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
+        fragments = self._backend.parse_fragments(xml_contents)
+        for nodes in fragments:
+            elements = [n for n in nodes if self._backend.is_element(n)]
+            assert elements, "Fragment must contain at least one element"
+        return fragments
+
+
+class _NodeIndex:
+    """Lookup indexes behind XMLEditor.get_node.
+
+    - tag -> elements, built per tag on first use
+    - tag -> attribute -> value -> elements, built per attribute on first use
+    - tag -> elements sorted by original line, built per tag on first use
+    - the text of every w:p, built on first contains= lookup
+    - the run-level text map of every w:p, built on first find_text call
+
+    Edits made through the editor only queue work; it is applied at the next
+    lookup, after subclasses such as DocxXMLEditor have set attributes on the
+    new nodes. Lookups return candidates: get_node re-checks every filter
+    against the live DOM, so stale entries are harmless.
+    """
+
+    PARAGRAPH_TAG = "w:p"
+
+    def __init__(self, editor):
+        self.editor = editor
+        self.backend = editor._backend
+        self.by_tag = {}  # tag -> {elem: None}, an insertion-ordered set
+        self.by_attr = {}  # tag -> {attribute: {value: {elem: None}}}
+        self.by_line = {}  # tag -> (sorted lines, elements in the same order)
+        self.outside_paragraphs = {}  # tag -> {elem: None} not inside any w:p
+        self.paragraph_text = None
+        self.text_map = None
+        self.pending = []  # Subtrees inserted or rewritten since the last lookup
+        self.dirty = {}  # Paragraphs whose text changed since the last lookup
+
+    def changed(self, parent, nodes):
+        """Queue nodes inserted (or rewritten in place) under parent."""
+        backend = self.backend
+        self.pending.extend(node for node in nodes if backend.is_element(node))
+        node = parent
+        while node is not None:
+            if backend.tag(node) == self.PARAGRAPH_TAG:
+                self.dirty[node] = None
+            node = backend.parent(node)
+
+    def candidates(self, tag, attrs, line_number, contains):
+        """Return elements that may match; the most selective filter set is used."""
+        self._apply_pending()
+        if line_number is not None:
+            return self._by_line(tag, line_number)
+        if attrs:
+            name, value = next(iter(attrs.items()))
+            return self._attr_values(tag, name).get(value, ())
+        if contains is not None:
+            return self._by_text(tag, contains)
+        return self._elements(tag)
+
+    def _elements(self, tag):
+        if tag not in self.by_tag:
+            self.by_tag[tag] = dict.fromkeys(self.backend.iter(self.editor.dom, tag))
+        return self.by_tag[tag]
+
+    def _apply_pending(self):
+        backend = self.backend
+        for node in self.pending:
+            for elem in (node, *backend.iter(node)):
+                tag = backend.tag(elem)
+                if tag in self.by_tag:
+                    self.by_tag[tag][elem] = None
+                for name, values in self.by_attr.get(tag, {}).items():
+                    values.setdefault(backend.get(elem, name), {})[elem] = None
+                if tag in self.outside_paragraphs and not self._in_paragraph(elem):
+                    self.outside_paragraphs[tag][elem] = None
+                if tag == self.PARAGRAPH_TAG:
+                    self.dirty[elem] = None
+        self.pending = []
+
+        for index in (self.paragraph_text, self.text_map):
+            if index is not None:
+                for paragraph in self.dirty:
+                    index.update(paragraph)
+        self.dirty = {}
+
+    def find_text(self, pattern, literal):
+        """Return the TextMatches of a compiled pattern (literal: its text, or None)."""
+        self._apply_pending()
+        if self.text_map is None:
+            self.text_map = _TextMap(
+                self.editor, self.backend.iter(self.editor.dom, self.PARAGRAPH_TAG)
+            )
+        return self.text_map.find(pattern, literal)
+
+    def _by_line(self, tag, line_number):
+        if tag not in self.by_line:
+            # Only parsed elements have a line; inserted ones never match
+            located = sorted(
+                (
+                    (self.backend.line(elem), elem)
+                    for elem in self._elements(tag)
+                    if self.backend.line(elem) is not None
+                ),
+                key=lambda pair: pair[0],
+            )
+            self.by_line[tag] = (
+                [line for line, _ in located],
+                [elem for _, elem in located],
+            )
+        lines, elems = self.by_line[tag]
+
+        if isinstance(line_number, range):
+            if line_number.step != 1:
+                return elems
+            start = bisect.bisect_left(lines, line_number.start)
+            stop = bisect.bisect_left(lines, line_number.stop)
+        else:
+            start = bisect.bisect_left(lines, line_number)
+            stop = bisect.bisect_right(lines, line_number)
+        return elems[start:stop]
+
+    def _attr_values(self, tag, name):
+        attrs = self.by_attr.setdefault(tag, {})
+        if name not in attrs:
+            values = {}
+            for elem in self._elements(tag):
+                values.setdefault(self.backend.get(elem, name), {})[elem] = None
+            attrs[name] = values
+        return attrs[name]
+
+    def _by_text(self, tag, contains):
+        if self.paragraph_text is None:
+            self.paragraph_text = _ParagraphTextIndex(
+                self.editor, self._elements(self.PARAGRAPH_TAG)
+            )
+        paragraphs = self.paragraph_text.search(contains)
+        if tag == self.PARAGRAPH_TAG:
+            return paragraphs
+
+        # The text of an element inside a paragraph is a contiguous part of the
+        # paragraph text, so only elements in matching paragraphs, or outside
+        # every paragraph, can contain the string
+        if tag not in self.outside_paragraphs:
+            self.outside_paragraphs[tag] = {
+                elem: None
+                for elem in self._elements(tag)
+                if not self._in_paragraph(elem)
+            }
+        found = {}
+        for paragraph in paragraphs:
+            for elem in self.backend.iter(paragraph, tag):
+                found[elem] = None
+        found.update(self.outside_paragraphs[tag])
+        return found
+
+    def _in_paragraph(self, elem):
+        node = self.backend.parent(elem)
+        while node is not None:
+            if self.backend.tag(node) == self.PARAGRAPH_TAG:
+                return True
+            node = self.backend.parent(node)
+        return False
+
+
+class _ParagraphTextIndex:
+    """Paragraph texts joined into one string and searched with str.find.
+
+    Paragraphs whose text changed after the string was built are kept aside
+    and checked one by one until there are enough of them to rebuild.
+    """
+
+    SEPARATOR = "\x00"  # Cannot occur in XML text
+    REBUILD_AFTER = 1000
+
+    def __init__(self, editor, paragraphs):
+        self.editor = editor
+        self._build(paragraphs)
+
+    def _text(self, paragraph):
+        return self.editor._get_element_text(paragraph)
+
+    def _build(self, paragraphs):
+        self.paragraphs = list(paragraphs)
+        texts = [self._text(p) for p in self.paragraphs]
+        self.starts = []  # Offset of each paragraph in joined
+        offset = 0
+        for text in texts:
+            self.starts.append(offset)
+            offset += len(text) + len(self.SEPARATOR)
+        self.joined = self.SEPARATOR.join(texts)
+        self.changed = {}  # paragraph -> current text, overriding joined
+
+    def update(self, paragraph):
+        """Record the current text of a new or changed paragraph."""
+        self.changed[paragraph] = self._text(paragraph)
+        if len(self.changed) > self.REBUILD_AFTER:
+            self._build(
+                self.editor._backend.iter(self.editor.dom, _NodeIndex.PARAGRAPH_TAG)
+            )
+
+    def search(self, contains):
+        """Return the paragraphs whose indexed text contains the string."""
+        if not contains:
+            return [*self.paragraphs, *self.changed]
+
+        found = {}
+        if self.SEPARATOR not in contains:
+            pos = self.joined.find(contains)
+            while pos != -1:
+                i = bisect.bisect_right(self.starts, pos) - 1
+                paragraph = self.paragraphs[i]
+                if paragraph not in self.changed:
+                    found[paragraph] = None
+                if i + 1 == len(self.starts):
+                    break
+                pos = self.joined.find(contains, self.starts[i + 1])
+        for paragraph, text in self.changed.items():
+            if contains in text:
+                found[paragraph] = None
+        return found
+
+
+class TextMatch:
+    """A find_text match: a span of one paragraph's text and the runs holding it."""
+
+    def __init__(self, paragraph, start, end, text, runs, match):
+        self.paragraph = paragraph
+        self.start = start  # Offsets into the paragraph text
+        self.end = end
+        self.text = text
+        # (w:r element, start, end) for every run the match touches, in order;
+        # offsets are into the run's own text
+        self.runs = runs
+        self.match = match  # re.Match against the paragraph text, for groups()
+
+
+class _TextMap(_ParagraphTextIndex):
+    """Paragraph texts built from w:t/w:tab/w:br/w:cr, mapped back to their runs.
+
+    For every paragraph the start offset of each text piece is kept together
+    with its run and its offset inside that run, so a match found in the
+    paragraph text can be turned into run-level anchors by bisection.
+    """
+
+    # Run content that stands for characters other than w:t text
+    CHARACTERS = {"w:tab": "\t", "w:br": "\n", "w:cr": "\n"}
+
+    def _build(self, paragraphs):
+        self.pieces = {}  # paragraph -> (piece starts, [(run, offset in run)])
+        super()._build(paragraphs)
+        self.position = {p: i for i, p in enumerate(self.paragraphs)}
+
+    def _text(self, paragraph):
+        backend = self.editor._backend
+        starts, pieces, texts = [], [], []
+        run_offsets = {}  # run -> length of its text so far
+        offset = 0
+        nested = False
+        for elem in backend.iter(paragraph):
+            tag = backend.tag(elem)
+            if tag == "w:t":
+                text = backend.leading_text(elem)
+            elif tag in self.CHARACTERS:
+                text = self.CHARACTERS[tag]
+            else:
+                nested = nested or tag == _NodeIndex.PARAGRAPH_TAG
+                continue
+            run = backend.parent(elem)
+            if not text or backend.tag(run) != "w:r":
+                continue
+            # Runs of text boxes anchored in this paragraph belong to their own w:p
+            if nested and self._owner(run) is not paragraph:
+                continue
+            run_offset = run_offsets.get(run, 0)
+            starts.append(offset)
+            pieces.append((run, run_offset))
+            texts.append(text)
+            offset += len(text)
+            run_offsets[run] = run_offset + len(text)
+        self.pieces[paragraph] = (starts, pieces)
+        return "".join(texts)
+
+    def _owner(self, elem):
+        """Return the innermost w:p containing elem."""
+        backend = self.editor._backend
+        node = backend.parent(elem)
+        while backend.tag(node) != _NodeIndex.PARAGRAPH_TAG:
+            node = backend.parent(node)
+        return node
+
+    def _paragraph_text(self, paragraph):
+        if paragraph in self.changed:
+            return self.changed[paragraph]
+        i = self.position[paragraph]
+        end = self.starts[i + 1] - 1 if i + 1 < len(self.starts) else len(self.joined)
+        return self.joined[self.starts[i] : end]
+
+    def find(self, pattern, literal):
+        """Return the TextMatches of pattern in attached paragraphs, in order."""
+        if literal is not None:
+            paragraphs = self.search(literal)
+        else:
+            paragraphs = dict.fromkeys([*self.paragraphs, *self.changed])
+
+        backend = self.editor._backend
+        matches = []
+        for paragraph in paragraphs:
+            text = self._paragraph_text(paragraph)
+            found = [m for m in pattern.finditer(text) if m.end() > m.start()]
+            if found and backend.is_attached(paragraph):
+                matches.extend(self._match(paragraph, m) for m in found)
+
+        # Paragraphs inserted since the map was built have no position yet
+        position = self.position
+        if any(m.paragraph not in position for m in matches):
+            position = {
+                p: i
+                for i, p in enumerate(
+                    backend.iter(self.editor.dom, _NodeIndex.PARAGRAPH_TAG)
+                )
+            }
+        matches.sort(key=lambda m: (position[m.paragraph], m.start))
+        return matches
+
+    def _match(self, paragraph, match):
+        start, end = match.span()
+        starts, pieces = self.pieces[paragraph]
+        runs = []
+        i = bisect.bisect_right(starts, start) - 1
+        while i < len(starts) and starts[i] < end:
+            piece_end = starts[i + 1] if i + 1 < len(starts) else len(match.string)
+            lo, hi = max(start, starts[i]), min(end, piece_end)
+            run, offset = pieces[i]
+            lo, hi = offset + lo - starts[i], offset + hi - starts[i]
+            if runs and runs[-1][0] is run:
+                runs[-1] = (run, runs[-1][1], hi)
+            elif lo < hi:
+                runs.append((run, lo, hi))
+            i += 1
+        return TextMatch(paragraph, start, end, match.group(), runs, match)
+
+
+class _MinidomBackend:
+    """DOM operations for engine="minidom" (defusedxml.minidom with line tracking)."""
+
+    def __init__(self, source):
+        parser = _create_line_tracking_parser()
+        self.dom = defusedxml.minidom.parse(source, parser)
+        self._namespace_declarations = None
+
+    @property
+    def root(self):
+        return self.dom.documentElement
+
+    def iter(self, node, tag=None):
+        """Iterate over the descendant elements of node (optionally only tag)."""
+        return iter(node.getElementsByTagName(tag or "*"))
+
+    def is_element(self, node):
+        return node.nodeType == node.ELEMENT_NODE
+
+    def tag(self, elem):
+        return elem.tagName
+
+    def line(self, elem):
+        return getattr(elem, "parse_position", (None,))[0]
+
+    def parent(self, elem):
+        """Return the parent element, or None for the root and detached nodes."""
+        parent = elem.parentNode
+        if parent is not None and parent.nodeType == parent.ELEMENT_NODE:
+            return parent
+        return None
+
+    def first_child(self, elem):
+        return elem.firstChild
+
+    def is_attached(self, elem):
+        """Return True if elem is still part of the document."""
+        node = elem
+        while node.parentNode is not None:
+            node = node.parentNode
+        return node is self.dom
+
+    def text(self, elem):
+        text_parts = []
+        for node in elem.childNodes:
+            if node.nodeType == node.TEXT_NODE:
+                # Skip whitespace-only text nodes (XML formatting)
+                if node.data.strip():
+                    text_parts.append(node.data)
+            elif node.nodeType == node.ELEMENT_NODE:
+                text_parts.append(self.text(node))
+        return "".join(text_parts)
+
+    def leading_text(self, elem):
+        """Return the text before the first child element, e.g. the text of a w:t."""
+        # The parser splits text at entity references into several text nodes
+        parts = []
+        node = elem.firstChild
+        while node is not None and node.nodeType == node.TEXT_NODE:
+            parts.append(node.data)
+            node = node.nextSibling
+        return "".join(parts)
+
+    def get(self, elem, name):
+        return elem.getAttribute(name)
+
+    def has(self, elem, name):
+        return elem.hasAttribute(name)
+
+    def set(self, elem, name, value):
+        elem.setAttribute(name, value)
+
+    def remove_attribute(self, elem, name):
+        elem.removeAttribute(name)
+
+    def has_namespace(self, prefix):
+        return self.root.hasAttribute(f"xmlns:{prefix}")
+
+    def declare_namespace(self, prefix, uri):
+        self.root.setAttribute(f"xmlns:{prefix}", uri)
+        self._namespace_declarations = None
+
+    def create(self, tag):
+        return self.dom.createElement(tag)
+
+    def rename(self, elem, tag):
+        """Replace elem with a tag element holding its attributes and children."""
+        new_elem = self.dom.createElement(tag)
+        # Copy ALL child nodes (not just firstChild) to handle entities
+        while elem.firstChild:
+            new_elem.appendChild(elem.firstChild)
+        for i in range(elem.attributes.length):
+            attr = elem.attributes.item(i)
+            new_elem.setAttribute(attr.name, attr.value)
+        elem.parentNode.replaceChild(new_elem, elem)
+        return new_elem
+
+    def insert_before(self, ref, node):
+        ref.parentNode.insertBefore(node, ref)
+
+    def insert_after(self, ref, node):
+        ref.parentNode.insertBefore(node, ref.nextSibling)
+
+    def append(self, parent, node):
+        parent.appendChild(node)
+
+    def remove(self, node):
+        node.parentNode.removeChild(node)
+
+    def move_children(self, source, target, keep=()):
+        """Move the children of source, except elements tagged keep, into target."""
+        for child in [c for c in source.childNodes if c.nodeName not in keep]:
+            source.removeChild(child)
+            target.appendChild(child)
+
+    def clone(self, elem):
+        return elem.cloneNode(True)
+
+    def namespace_declarations(self):
+        """Return the xmlns attributes of the root element, cached."""
+        if self._namespace_declarations is None:
+            # Extract namespace declarations from the root document element
+            root_elem = self.root
+            namespaces = []
+            if root_elem and root_elem.attributes:
+                for i in range(root_elem.attributes.length):
+                    attr = root_elem.attributes.item(i)
+                    if attr.name.startswith("xmlns"):  # type: ignore
+                        namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
+            self._namespace_declarations = " ".join(namespaces)
+        return self._namespace_declarations
+
+    def parse_fragments(self, xml_contents):
+        """Parse fragments inside one namespace wrapper; return their nodes."""
+        body = "".join(f"<fragment>{xml}</fragment>" for xml in xml_contents)
+        wrapper = f"<root {self.namespace_declarations()}>{body}</root>"
         fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
+        return [
+            [self.dom.importNode(child, deep=True) for child in fragment.childNodes]
+            for fragment in fragment_doc.documentElement.childNodes  # type: ignore
         ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
-        return nodes
+
+    def serialize(self, encoding):
+        return self.dom.toxml(encoding=encoding)
+
+
+class _LxmlBackend:
+    """DOM operations for engine="lxml".
+
+    Names are given in prefixed form ("w:p", "w:id", "xml:space") and resolved
+    against the namespaces declared on the root element. Unprefixed element
+    names use the default namespace, as in [Content_Types].xml and .rels parts.
+    """
+
+    XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+    def __init__(self, source):
+        self.parser = lxml.etree.XMLParser(
+            resolve_entities=False, no_network=True, huge_tree=True
+        )
+        self.dom = lxml.etree.parse(source, self.parser)
+        self.nsmap = dict(self.root.nsmap)
+        # Namespaces declared after parsing; moved onto the root when saving
+        self.added_nsmap = {}
+        self._namespace_declarations = None
+        self._qualified = {}  # (name, is_attribute) -> "{uri}local" or None
+        self._prefixed = {}  # "{uri}local" -> "prefix:local"
+
+    @property
+    def root(self):
+        return self.dom.getroot()
+
+    def qualify(self, name, attribute=False):
+        """Return the "{uri}local" form of a prefixed name, or None if undeclared."""
+        key = (name, attribute)
+        if key not in self._qualified:
+            prefix, _, local = name.rpartition(":")
+            if prefix == "xml":
+                uri = self.XML_NAMESPACE
+            elif prefix:
+                uri = self.nsmap.get(prefix)
+                if uri is None:
+                    self._qualified[key] = None
+                    return None
+            else:
+                # Unprefixed attributes are never in the default namespace
+                uri = None if attribute else self.nsmap.get(None)
+            self._qualified[key] = f"{{{uri}}}{local}" if uri else local
+        return self._qualified[key]
+
+    def iter(self, node, tag=None):
+        """Iterate over the descendant elements of node (optionally only tag)."""
+        if tag is None:
+            tag = lxml.etree.Element
+        else:
+            tag = self.qualify(tag)
+            if tag is None:
+                return iter(())
+        if isinstance(node, lxml.etree._ElementTree):
+            return node.iter(tag)
+        return node.iterdescendants(tag)
+
+    def is_element(self, node):
+        return isinstance(node.tag, str)
+
+    def tag(self, elem):
+        qualified = elem.tag
+        name = self._prefixed.get(qualified)
+        if name is None:
+            local = lxml.etree.QName(elem).localname
+            name = f"{elem.prefix}:{local}" if elem.prefix else local
+            self._prefixed[qualified] = name
+        return name
+
+    def line(self, elem):
+        return elem.sourceline
+
+    def parent(self, elem):
+        return elem.getparent()
+
+    def first_child(self, elem):
+        return elem[0] if len(elem) else None
+
+    def is_attached(self, elem):
+        node = elem
+        while True:
+            parent = node.getparent()
+            if parent is None:
+                return node is self.root
+            node = parent
+
+    def text(self, elem):
+        return "".join(text for text in elem.itertext() if text.strip())
+
+    def leading_text(self, elem):
+        return elem.text or ""
+
+    def get(self, elem, name):
+        qualified = self.qualify(name, attribute=True)
+        return elem.get(qualified, "") if qualified else ""
+
+    def has(self, elem, name):
+        qualified = self.qualify(name, attribute=True)
+        return qualified is not None and qualified in elem.attrib
+
+    def set(self, elem, name, value):
+        qualified = self.qualify(name, attribute=True)
+        if qualified is None:
+            raise ValueError(f"Namespace prefix of {name} is not declared")
+        elem.set(qualified, value)
+
+    def remove_attribute(self, elem, name):
+        qualified = self.qualify(name, attribute=True)
+        if qualified is not None:
+            elem.attrib.pop(qualified, None)
+
+    def has_namespace(self, prefix):
+        return prefix in self.nsmap
+
+    def declare_namespace(self, prefix, uri):
+        # lxml cannot add declarations to an existing element; serialize()
+        # moves them onto the root, until then lxml declares them where used
+        self.nsmap[prefix] = uri
+        self.added_nsmap[prefix] = uri
+        self._namespace_declarations = None
+        self._qualified.clear()
+
+    def create(self, tag):
+        qualified = self.qualify(tag)
+        if qualified is None:
+            raise ValueError(f"Namespace prefix of {tag} is not declared")
+        return lxml.etree.Element(qualified)
+
+    def rename(self, elem, tag):
+        elem.tag = self.qualify(tag)
+        return elem
+
+    def insert_before(self, ref, node):
+        ref.addprevious(node)
+
+    def insert_after(self, ref, node):
+        ref.addnext(node)
+
+    def append(self, parent, node):
+        parent.append(node)
+
+    def remove(self, node):
+        # lxml drops the tail text with the element; keep it in place
+        parent = node.getparent()
+        if node.tail:
+            previous = node.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + node.tail
+            else:
+                parent.text = (parent.text or "") + node.tail
+        parent.remove(node)
+
+    def move_children(self, source, target, keep=()):
+        """Move the children of source, except elements tagged keep, into target."""
+        keep = {self.qualify(tag) for tag in keep}
+        if not keep and source.text:
+            target.text = (target.text or "") + source.text
+            source.text = None
+        for child in list(source):
+            if child.tag not in keep:
+                target.append(child)
+
+    def clone(self, elem):
+        clone = copy.deepcopy(elem)
+        clone.tail = None
+        return clone
+
+    def namespace_declarations(self):
+        """Return xmlns attributes for every known namespace, cached."""
+        if self._namespace_declarations is None:
+            self._namespace_declarations = " ".join(
+                f'xmlns:{prefix}="{uri}"' if prefix else f'xmlns="{uri}"'
+                for prefix, uri in self.nsmap.items()
+            )
+        return self._namespace_declarations
+
+    def parse_fragments(self, xml_contents):
+        """Parse fragments inside one namespace wrapper; return their nodes."""
+        body = "".join(f"<fragment>{xml}</fragment>" for xml in xml_contents)
+        wrapper = lxml.etree.fromstring(
+            f"<root {self.namespace_declarations()}>{body}</root>", self.parser
+        )
+        # Inserted nodes have no line in the original file
+        for elem in wrapper.iter():
+            elem.sourceline = 0
+        return [list(fragment) for fragment in wrapper]
+
+    def serialize(self, encoding):
+        if self.added_nsmap:
+            lxml.etree.cleanup_namespaces(
+                self.dom,
+                top_nsmap=self.added_nsmap,
+                keep_ns_prefixes=[prefix for prefix in self.nsmap if prefix],
+            )
+        body = lxml.etree.tostring(self.dom, encoding=encoding, xml_declaration=False)
+        return f'<?xml version="1.0" encoding="{encoding}"?>'.encode() + body
+
+
+ENGINES = {"minidom": _MinidomBackend, "lxml": _LxmlBackend}
 
 
 def _create_line_tracking_parser():
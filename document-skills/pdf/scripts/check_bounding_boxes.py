@@ -1,4 +1,7 @@
+from collections import defaultdict
 from dataclasses import dataclass
+import bisect
+import heapq
 import json
 import sys
 
@@ -14,36 +17,128 @@ class RectAndField:
     field: dict
 
 
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
+
+# The vertical extents [y0, y1) of the rects that the sweep currently holds.
+# overlapping() reports the active extents that overlap a range in
+# O(log n + k): those starting inside the range come from a sorted list of
+# starts, and those starting before it contain its start, which a segment tree
+# over all the extents' endpoints answers without scanning the others. add() and
+# remove() are O(log n) in the tree, plus an O(n) shift of the sorted starts.
+class ActiveIntervals:
+    def __init__(self, intervals):
+        self.intervals = intervals
+        self.coords = sorted({y for interval in intervals for y in interval})
+        self.size = 1
+        while self.size < len(self.coords):
+            self.size *= 2
+        # Node sets of the segment tree over the slots [coords[s], coords[s + 1])
+        self.nodes = [set() for _ in range(2 * self.size)]
+        self.starts = []  # Sorted (start, index) of the active intervals
+
+    def _nodes_covering(self, i):
+        start, end = self.intervals[i]
+        lo = bisect.bisect_left(self.coords, start) + self.size
+        hi = bisect.bisect_left(self.coords, end) + self.size
+        while lo < hi:
+            if lo & 1:
+                yield self.nodes[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                yield self.nodes[hi]
+            lo //= 2
+            hi //= 2
+
+    def add(self, i):
+        bisect.insort(self.starts, (self.intervals[i][0], i))
+        for node in self._nodes_covering(i):
+            node.add(i)
+
+    def remove(self, i):
+        del self.starts[bisect.bisect_left(self.starts, (self.intervals[i][0], i))]
+        for node in self._nodes_covering(i):
+            node.discard(i)
+
+    # Indices of the active intervals with start < hi and end > lo
+    def overlapping(self, lo, hi):
+        # Starting before lo and reaching past it: they cover the slot of lo
+        slot = bisect.bisect_right(self.coords, lo) - 1
+        if 0 <= slot < len(self.coords) - 1:
+            node = slot + self.size
+            while node:
+                for i in self.nodes[node]:
+                    if self.intervals[i][0] < lo:
+                        yield i
+                node //= 2
+        # Starting inside [lo, hi)
+        first = bisect.bisect_left(self.starts, (lo, -1))
+        for k in range(first, len(self.starts)):
+            start, i = self.starts[k]
+            if start >= hi:
+                break
+            if self.intervals[i][1] > lo:
+                yield i
+
+
+# Returns the sorted index pairs (i, j), i < j, of intersecting [x0, y0, x1, y1] rects.
+# Sweeps the rects from left to right; each is compared only with the rects whose
+# horizontal extent reaches it and whose vertical extent overlaps its own, so the
+# queries cost O(n log n + k) for k such pairs instead of comparing all pairs
+# (plus the O(n) list shifts of ActiveIntervals, a memmove per rect).
+def intersecting_pairs(rects) -> list[tuple[int, int]]:
+    lefts = [min(r[0], r[2]) for r in rects]
+    order = sorted(range(len(rects)), key=lambda i: lefts[i])
+    ending = []  # Heap of (right edge, index) of the active rects
+    active = ActiveIntervals([(min(r[1], r[3]), max(r[1], r[3])) for r in rects])
+    pairs = []
+    for i in order:
+        while ending and ending[0][0] <= lefts[i]:
+            active.remove(heapq.heappop(ending)[1])
+        for j in active.overlapping(*active.intervals[i]):
+            if rects_intersect(rects[i], rects[j]):
+                pairs.append((min(i, j), max(i, j)))
+        active.add(i)
+        heapq.heappush(ending, (max(rects[i][0], rects[i][2]), i))
+    return sorted(pairs)
+
+
 # Returns a list of messages that are printed to stdout for Claude to read.
 def get_bounding_box_messages(fields_json_stream) -> list[str]:
     messages = []
     fields = json.load(fields_json_stream)
     messages.append(f"Read {len(fields['form_fields'])} fields")
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
-
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
 
+    # Intersections between boxes on the same page, by the index of the first box
+    indices_by_page = defaultdict(list)
+    for i, r in enumerate(rects_and_fields):
+        indices_by_page[r.field["page_number"]].append(i)
+    intersecting = defaultdict(list)
+    for indices in indices_by_page.values():
+        for a, b in intersecting_pairs([rects_and_fields[i].rect for i in indices]):
+            intersecting[indices[a]].append(indices[b])
+
     has_error = False
     for i, ri in enumerate(rects_and_fields):
-        # This is O(N^2); we can optimize if it becomes a problem.
-        for j in range(i + 1, len(rects_and_fields)):
+        for j in sorted(intersecting[i]):
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+            has_error = True
+            if ri.field is rj.field:
+                messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
+            else:
+                messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
+            if len(messages) >= 20:
+                messages.append("Aborting further checks; fix bounding boxes and try again")
+                return messages
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
@@ -1,7 +1,9 @@
 import unittest
 import json
 import io
-from check_bounding_boxes import get_bounding_box_messages
+from unittest import mock
+import check_bounding_boxes
+from check_bounding_boxes import get_bounding_box_messages, intersecting_pairs
 
 
 # Currently this is not run automatically in CI; it's just for documentation and manual checking.
@@ -221,6 +223,57 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
     
+    def test_many_fields_single_intersection(self):
+        """Test that one intersection is found among many fields on a page"""
+        fields = []
+        for row in range(50):
+            for col in range(4):
+                x, y = col * 200, row * 40
+                fields.append({
+                    "description": f"Field{row}_{col}",
+                    "page_number": 1,
+                    "label_bounding_box": [x, y, x + 80, y + 30],
+                    "entry_bounding_box": [x + 90, y, x + 190, y + 30]
+                })
+        fields[101]["entry_bounding_box"] = [290, 1000, 410, 1030]  # Reaches Field25_2's label
+        
+        stream = self.create_json_stream({"form_fields": fields})
+        messages = get_bounding_box_messages(stream)
+        failures = [msg for msg in messages if "FAILURE" in msg]
+        self.assertEqual(len(failures), 1)
+        self.assertIn("`Field25_1`", failures[0])
+        self.assertIn("`Field25_2`", failures[0])
+    
+    def test_stacked_fields_single_intersection(self):
+        """Test one intersection among full-width fields stacked down a page"""
+        fields = []
+        for row in range(200):
+            y = row * 50
+            fields.append({
+                "description": f"Field{row}",
+                "page_number": 1,
+                "label_bounding_box": [10, y, 500, y + 20],
+                "entry_bounding_box": [10, y + 20, 500, y + 45]
+            })
+        fields[120]["entry_bounding_box"] = [10, 6020, 500, 6055]  # Reaches Field121's label
+        
+        stream = self.create_json_stream({"form_fields": fields})
+        messages = get_bounding_box_messages(stream)
+        failures = [msg for msg in messages if "FAILURE" in msg]
+        self.assertEqual(len(failures), 1)
+        self.assertIn("`Field120`", failures[0])
+        self.assertIn("`Field121`", failures[0])
+    
+    def test_stacked_rects_compare_only_vertical_neighbours(self):
+        """Test that rects sharing a horizontal extent are not all compared pairwise"""
+        rects = [[0, row * 10, 500, row * 10 + 12] for row in range(1000)]  # Each overlaps the next
+        with mock.patch.object(
+            check_bounding_boxes, "rects_intersect", wraps=check_bounding_boxes.rects_intersect
+        ) as rects_intersect:
+            pairs = intersecting_pairs(rects)
+        self.assertEqual(pairs, [(i, i + 1) for i in range(999)])
+        self.assertEqual(rects_intersect.call_count, 999)
+    
 
 if __name__ == '__main__':
     unittest.main()
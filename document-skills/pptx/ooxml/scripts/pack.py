@@ -7,25 +7,81 @@ Example usage:
 """
 
 import argparse
+import atexit
+import hashlib
+import io
+import json
+import os
+import queue
 import shutil
+import socket
+import struct
 import subprocess
 import sys
 import tempfile
-import defusedxml.minidom
+import threading
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import lxml.etree
+
+# Written by unpack.py next to the extracted parts; never packed
+UNPACK_MANIFEST = ".unpack-manifest.json"
+
+# Media that is already compressed gains nothing from another deflate pass
+STORED_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".wdp",
+    ".mp3",
+    ".mp4",
+    ".m4a",
+    ".zip",
+    ".docx",
+    ".pptx",
+    ".xlsx",
+}
+
+# Private ZipFile attributes used to append members that are already compressed
+RAW_WRITE_ATTRIBUTES = (
+    "fp",
+    "filelist",
+    "NameToInfo",
+    "start_dir",
+    "_lock",
+    "_writecheck",
+    "_didModify",
+)
+
+# zlib releases the GIL while deflating, so threads compress in parallel
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "--office-port",
+        type=int,
+        help="Validate with a persistent headless LibreOffice on this local port "
+        "(started if not running, and left running for later packs)",
+    )
     args = parser.parse_args()
 
     try:
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            office_port=args.office_port,
         )
 
         # Show warning if validation was skipped
@@ -42,13 +98,20 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(input_dir, output_file, validate=False, office_port=None):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    Parts are read straight from input_dir, condensed in memory and compressed
+    on a thread pool. Parts whose bytes still match the manifest written by
+    unpack.py are copied from the source file without being re-parsed or
+    re-compressed.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        office_port: Port of a persistent LibreOffice to validate with, see
+            validate_document()
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,34 +124,575 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    files = sorted(
+        (f for f in input_dir.rglob("*") if f.is_file() and f.name != UNPACK_MANIFEST),
+        # [Content_Types].xml goes first, as some consumers expect
+        key=lambda f: (f.name != "[Content_Types].xml", f.relative_to(input_dir).as_posix()),
+    )
+    source_path, unchanged_hashes = load_unpack_manifest(input_dir)
+
+    # Write next to the target and move into place, so packing over the
+    # source file that unchanged parts are copied from is safe
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_name = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    try:
+        source = zipfile.ZipFile(source_path) if source_path else None
+        try:
+            with zipfile.ZipFile(temp_name, "w") as zf:
+                _write_members(zf, input_dir, files, source, unchanged_hashes)
+        finally:
+            if source is not None:
+                source.close()
+        os.replace(temp_name, output_file)
+    except BaseException:
+        temp_name.unlink(missing_ok=True)
+        raise
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file, office_port=office_port):
+            output_file.unlink()  # Delete the corrupt file
+            return False
+
+    return True
+
+
+def _write_members(zf, input_dir, files, source, unchanged_hashes):
+    """Prepare members on a thread pool and append them to zf in order."""
+    source_members = set(source.namelist()) if source is not None else set()
+
+    def prepare(path):
+        arcname = path.relative_to(input_dir).as_posix()
+        expected = unchanged_hashes.get(arcname) if arcname in source_members else None
+        return _prepare_member(path, arcname, expected)
+
+    def write(result):
+        info, payload = result
+        if payload is None:
+            _copy_raw_member(zf, source, source.getinfo(info.filename))
+        else:
+            _write_raw_member(zf, info, payload)
+
+    # Bound the number of compressed members held in memory at once
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pending = deque()
+        for path in files:
+            pending.append(executor.submit(prepare, path))
+            if len(pending) >= MAX_WORKERS * 2:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+
+
+def _prepare_member(path, arcname, expected_hash):
+    """Read, condense and compress one part.
+
+    Returns:
+        tuple: (ZipInfo, compressed bytes), or (ZipInfo, None) if the part is
+            unchanged since unpack and should be copied from the source file
+    """
+    data = path.read_bytes()
+    info = zipfile.ZipInfo.from_file(path, arcname, strict_timestamps=False)
+
+    if expected_hash is not None and hashlib.sha1(data).hexdigest() == expected_hash:
+        return info, None
+
+    if path.name.lower().endswith((".xml", ".rels")):
+        data = condense_xml_bytes(data)
+    return info, _compress_member(info, data)
+
+
+def _compress_member(info, data):
+    """Compress data for the member described by info, filling in its sizes and CRC.
+
+    Returns:
+        bytes: The payload to write with _write_raw_member()
+    """
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+    if Path(info.filename).suffix.lower() in STORED_EXTENSIONS:
+        info.compress_type = zipfile.ZIP_STORED
+        payload = data
+    else:
+        info.compress_type = zipfile.ZIP_DEFLATED
+        # Raw deflate stream (no zlib header), as stored in zip members
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        payload = compressor.compress(data) + compressor.flush()
+    info.compress_size = len(payload)
+    return payload
+
+
+def load_unpack_manifest(input_dir):
+    """Read the manifest unpack.py left in input_dir.
+
+    Returns:
+        tuple: (source file path, {part name: sha1 of unpacked bytes}), or
+            (None, {}) if there is no manifest or the source file has changed
+    """
+    manifest_file = Path(input_dir) / UNPACK_MANIFEST
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+        source_path = Path(manifest["source"])
+        stat = source_path.stat()
+        if stat.st_size != manifest["size"] or stat.st_mtime_ns != manifest["mtime_ns"]:
+            return None, {}
+        return source_path, manifest["parts"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, {}
+
+
+def write_unpack_manifest(output_dir, source_file, part_hashes):
+    """Record the source file and the hash of every part written by unpack.py."""
+    source_file = Path(source_file).resolve()
+    stat = source_file.stat()
+    manifest = {
+        "source": str(source_file),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "parts": part_hashes,
+    }
+    (Path(output_dir) / UNPACK_MANIFEST).write_text(
+        json.dumps(manifest, indent=2), encoding="utf-8"
+    )
+
+
+def _read_raw_member(zf, info):
+    """Return the still-compressed bytes of a member of an archive open for reading."""
+    zf.fp.seek(info.header_offset)
+    header = zf.fp.read(30)
+    if header[:4] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    zf.fp.seek(info.header_offset + 30 + name_length + extra_length)
+    return zf.fp.read(info.compress_size)
+
+
+def _can_write_raw(zf):
+    """Whether zf has the zipfile internals _write_raw_member() relies on."""
+    return all(hasattr(zf, name) for name in RAW_WRITE_ATTRIBUTES)
+
+
+def _write_raw_member(zf, info, payload):
+    """Append a member whose payload is already compressed per info.compress_type.
+
+    zipfile has no public API for this, so the local header is written with
+    ZipInfo.FileHeader() and the central directory bookkeeping is done here.
+    If zipfile lacks the internals this needs, the payload is decompressed and
+    written with ZipFile.writestr() instead.
+    """
+    if not _can_write_raw(zf):
+        if info.compress_type == zipfile.ZIP_STORED:
+            data = payload
+        elif info.compress_type == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(payload, -15)
+        else:
+            raise NotImplementedError(
+                f"Cannot rewrite {info.filename}: compression {info.compress_type}"
+            )
+        zf.writestr(info, data)
+        return
+
+    with zf._lock:
+        zf._writecheck(info)
+        zf._didModify = True
+        info.header_offset = zf.fp.tell()
+        zf.fp.write(info.FileHeader())
+        zf.fp.write(payload)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(info)
+        zf.NameToInfo[info.filename] = info
+
+
+def _copy_raw_member(zf, source, source_info):
+    """Copy a member from source into zf without decompressing it."""
+    info = zipfile.ZipInfo(source_info.filename, source_info.date_time)
+    info.compress_type = source_info.compress_type
+    info.external_attr = source_info.external_attr
+    if not _can_write_raw(zf):
+        zf.writestr(info, source.read(source_info))
+        return
+
+    info.CRC = source_info.CRC
+    info.file_size = source_info.file_size
+    info.compress_size = source_info.compress_size
+    # The data descriptor is not copied, so sizes live in the local header
+    info.flag_bits = source_info.flag_bits & ~0x08
+    _write_raw_member(zf, info, _read_raw_member(source, source_info))
+
+
+def validate_document(doc_path, office_port=None):
+    """Validate document by opening it in LibreOffice.
+
+    A pure-Python structural check runs first, so packages that obviously
+    cannot open never reach the office process. When the LibreOffice Python
+    bindings (uno) are importable, documents are opened by a long-lived
+    OfficeValidationWorker shared by every call in this process; otherwise
+    each call falls back to a one-off soffice --convert-to html run.
+
+    Args:
+        doc_path: Path to the packed Office file
+        office_port: If set, reuse (or start and leave running) a headless
+            LibreOffice listening on this local port, so later pack runs skip
+            the office start-up entirely
+
+    Returns:
+        bool: True if the document opened (or soffice is unavailable)
+    """
+    doc_path = Path(doc_path)
+
+    error = check_package_structure(doc_path)
+    if error:
+        print(f"Validation error: {error}", file=sys.stderr)
+        return False
+
+    worker = get_validation_worker(office_port)
+    if worker is None:
+        return _convert_with_soffice(doc_path)
 
+    try:
+        error = worker.validate(doc_path)
+    except TimeoutError:
+        # Still blocked on an earlier document (e.g. in an office that another
+        # process started, which the watchdog cannot kill)
+        return _convert_with_soffice(doc_path)
+    except FileNotFoundError:
+        print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
+        return True
+    except Exception as e:
+        print(f"Validation error: {e}", file=sys.stderr)
+        return False
+
+    if error:
+        print(f"Validation error: {error}", file=sys.stderr)
+        return False
     return True
 
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+def check_package_structure(doc_path):
+    """Cheap structural checks that do not need an office process.
+
+    Returns:
+        str: Description of the first problem found, or None if the package
+            looks openable
+    """
+    try:
+        with zipfile.ZipFile(doc_path) as zf:
+            names = set(zf.namelist())
+            for required in ("[Content_Types].xml", "_rels/.rels"):
+                if required not in names:
+                    return f"Missing {required}"
+
+            # Only the package relationships and content types are inspected
+            # below; every other part is just checked to be well-formed,
+            # streaming it rather than building its tree
+            parser = lxml.etree.XMLParser(resolve_entities=False, huge_tree=True)
+            parsed = {}
+            for name in sorted(names):
+                if not name.endswith((".xml", ".rels")):
+                    continue
+                try:
+                    if name in ("[Content_Types].xml", "_rels/.rels"):
+                        parsed[name] = lxml.etree.fromstring(zf.read(name), parser)
+                    else:
+                        _check_well_formed(zf, name)
+                except lxml.etree.XMLSyntaxError as e:
+                    return f"{name} is not well-formed: {e}"
+    except zipfile.BadZipFile as e:
+        return f"Not a valid zip archive: {e}"
+
+    main_part = None
+    for rel in parsed["_rels/.rels"]:
+        if rel.get("Type", "").endswith("/officeDocument"):
+            main_part = rel.get("Target", "").lstrip("/")
+    if main_part is None:
+        return "_rels/.rels has no officeDocument relationship"
+    if main_part not in names:
+        return f"Main document part {main_part} referenced in _rels/.rels is missing"
+
+    content_types = parsed["[Content_Types].xml"]
+    overrides = {
+        el.get("PartName", "").lstrip("/")
+        for el in content_types
+        if lxml.etree.QName(el).localname == "Override"
+    }
+    if main_part not in overrides:
+        return f"Main document part {main_part} not declared in [Content_Types].xml"
+
+    return None
+
+
+def _check_well_formed(zf, name):
+    """Parse a member of zf without keeping its tree; raises XMLSyntaxError."""
+    with zf.open(name) as stream:
+        for _, elem in lxml.etree.iterparse(
+            stream, events=("end",), resolve_entities=False, huge_tree=True
+        ):
+            elem.clear()
+            # Drop the cleared elements too, so memory stays flat
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+
+class OfficeValidationWorker:
+    """Long-lived headless LibreOffice that opens documents over its UNO socket.
+
+    Requests from any thread are queued and served one at a time by a
+    dedicated thread, since a single office instance is not safe to drive
+    concurrently. If the office crashes, or a document hangs it past the
+    timeout, the process is killed and started again for the next request.
+
+    An office that this worker did not start (a persistent one reused on its
+    port) cannot be killed. A request still waits at most timeout +
+    STOP_GRACE seconds and then fails; until the hung document returns,
+    validate() raises TimeoutError instead of queueing behind it.
+    """
+
+    HOST = "127.0.0.1"
+    STOP_GRACE = 5  # Extra seconds validate() waits for the watchdog to act
+
+    def __init__(self, port=None, timeout=10, startup_timeout=30):
+        """
+        Args:
+            port: Local port of a persistent office to reuse or start. If None,
+                a private instance is started on a free port and shut down
+                with the worker.
+            timeout: Seconds a single document may take to open
+            startup_timeout: Seconds to wait for the office to accept connections
+        """
+        import uno
+
+        self._uno = uno
+        self.port = port
+        self.persistent = port is not None
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        # _process, _desktop and the loading state are shared with the watchdog
+        self._lock = threading.RLock()
+        self._process = None
+        self._desktop = None
+        self._loading = False
+        self._timed_out = False
+        self._busy = None  # Event of a request that validate() gave up on
+        if self.persistent:
+            self._profile_dir = Path(tempfile.gettempdir()) / f"ooxml-validate-{port}"
+        else:
+            self._profile_dir = Path(tempfile.mkdtemp(prefix="ooxml-validate-"))
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def validate(self, doc_path):
+        """Open doc_path in the office and close it again.
+
+        Returns:
+            str: Error message, or None if the document opened
+
+        Raises:
+            TimeoutError: If the worker is still blocked on a document that
+                timed out earlier
+        """
+        with self._lock:
+            if self._busy is not None and not self._busy.is_set():
+                raise TimeoutError("LibreOffice is not responding")
+        done = threading.Event()
+        result = {}
+        self._requests.put((Path(doc_path).resolve(), result, done))
+        if not done.wait(self.timeout + self.STOP_GRACE):
+            with self._lock:
+                if not done.is_set():
+                    self._busy = done
+                    return "Timeout during conversion"
+        if "exception" in result:
+            raise result["exception"]
+        return result["error"]
+
+    def close(self):
+        """Stop the worker thread and shut down a private office instance."""
+        self._requests.put(None)
+        # The thread may be blocked on a hung document in a foreign office
+        self._thread.join(self.timeout + self.STOP_GRACE)
+        if not self.persistent:
+            self._stop_office()
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+
+    def _serve(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            doc_path, result, done = request
+            try:
+                result["error"] = self._open_document(doc_path)
+            except Exception as e:
+                result["exception"] = e
+            finally:
+                done.set()
+
+    def _open_document(self, doc_path):
+        # One retry covers an office that died since the previous request
+        for attempt in range(2):
+            desktop = self._connect()
+            with self._lock:
+                self._loading = True
+                self._timed_out = False
+            watchdog = threading.Timer(self.timeout, self._on_timeout)
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                document = desktop.loadComponentFromURL(
+                    self._uno.systemPathToFileUrl(str(doc_path)),
+                    "_blank",
+                    0,
+                    self._load_properties(),
+                )
+            except Exception as e:
+                if self._end_loading():
+                    return "Timeout during conversion"
+                if self._office_alive():
+                    return str(e) or "Document validation failed"
+                self._stop_office()
+                if attempt:
+                    raise
+                continue
+            finally:
+                watchdog.cancel()
+
+            # The watchdog may have stopped the office just as the load returned
+            if self._end_loading():
+                return "Timeout during conversion"
+            if document is None:
+                return "Document validation failed"
+            document.close(True)
+            return None
+
+    def _load_properties(self):
+        properties = []
+        for name, value in (("Hidden", True), ("ReadOnly", True)):
+            prop = self._uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+            prop.Name = name
+            prop.Value = value
+            properties.append(prop)
+        return tuple(properties)
+
+    def _connect(self):
+        """Return the office Desktop, starting the office if needed."""
+        if self._desktop is not None and self._office_alive():
+            return self._desktop
+
+        self._desktop = None
+        if self._process is not None and self._process.poll() is not None:
+            self._process = None  # Crashed; start a fresh one below
+        if self.port is None:
+            self.port = _find_free_port()
+        local_context = self._uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        url = f"uno:socket,host={self.HOST},port={self.port};urp;StarOffice.ComponentContext"
+
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                context = resolver.resolve(url)
+                break
+            except Exception:
+                if self._process is None:
+                    # Nothing is listening yet (or a persistent office died)
+                    self._start_office()
+                elif self._process.poll() is not None:
+                    self._process = None
+                    raise RuntimeError("LibreOffice exited during start-up")
+                elif time.monotonic() > deadline:
+                    self._stop_office()
+                    raise RuntimeError("Timeout starting LibreOffice")
+                time.sleep(0.1)
+
+        self._desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+        return self._desktop
+
+    def _start_office(self):
+        # A dedicated profile keeps this instance apart from a user's own office
+        self._process = subprocess.Popen(
+            [
+                "soffice",
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                f"-env:UserInstallation={self._profile_dir.as_uri()}",
+                f"--accept=socket,host={self.HOST},port={self.port};urp;",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # A persistent office must outlive this Python process
+            start_new_session=self.persistent,
+        )
+
+    def _office_alive(self):
+        if self._process is not None:
+            return self._process.poll() is None
+        # Reused persistent office that this process did not start
+        try:
+            self._desktop.getComponents()
+            return True
+        except Exception:
+            return False
+
+    def _end_loading(self):
+        """Mark the current load as finished; return True if it timed out."""
+        with self._lock:
+            self._loading = False
+            return self._timed_out
+
+    def _on_timeout(self):
+        with self._lock:
+            if not self._loading:
+                return  # The load returned before the lock was free
+            self._timed_out = True
+            self._stop_office()
+
+    def _stop_office(self):
+        with self._lock:
+            self._desktop = None
+            if self._process is not None:
+                self._process.kill()
+                self._process.wait()
+                self._process = None
+            if not self.persistent:
+                self.port = None  # Pick a free port again on restart
+
+
+def _find_free_port():
+    with socket.socket() as sock:
+        sock.bind((OfficeValidationWorker.HOST, 0))
+        return sock.getsockname()[1]
+
+
+_validation_workers = {}  # office_port -> OfficeValidationWorker, or None without uno
+
+
+def get_validation_worker(office_port=None):
+    """Return the process-wide OfficeValidationWorker for office_port.
+
+    Returns:
+        OfficeValidationWorker: Shared worker, or None if uno is not importable
+    """
+    if office_port not in _validation_workers:
+        try:
+            worker = OfficeValidationWorker(port=office_port)
+        except ImportError:
+            worker = None
+        else:
+            atexit.register(worker.close)
+        _validation_workers[office_port] = worker
+    return _validation_workers[office_port]
+
+
+def _convert_with_soffice(doc_path):
+    """Validate document by converting to HTML with a one-off soffice run."""
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -132,27 +736,48 @@ def validate_document(doc_path):
 
 def condense_xml(xml_file):
     """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(condense_xml_bytes(xml_file.read_bytes()))
+
 
-    # Process each element to remove whitespace and comments
-    for element in dom.getElementsByTagName("*"):
+def condense_xml_bytes(content):
+    """Return content with whitespace-only text nodes and comments removed.
+
+    Text inside *:t elements (w:t, a:t, ...) is left untouched.
+    """
+    parser = lxml.etree.XMLParser(resolve_entities=False, huge_tree=True)
+    tree = lxml.etree.parse(io.BytesIO(content), parser)
+
+    for element in tree.getroot().iter(tag=lxml.etree.Element):
         # Skip w:t elements and their processing
-        if element.tagName.endswith(":t"):
+        if lxml.etree.QName(element).localname == "t":
             continue
 
-        # Remove whitespace-only text nodes and comment nodes
-        for child in list(element.childNodes):
-            if (
-                child.nodeType == child.TEXT_NODE
-                and child.nodeValue
-                and child.nodeValue.strip() == ""
-            ) or child.nodeType == child.COMMENT_NODE:
-                element.removeChild(child)
-
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+        for child in list(element.iterchildren(tag=lxml.etree.Comment)):
+            _remove_keeping_tail(child)
+
+        # Remove whitespace-only text nodes
+        if element.text and not element.text.strip():
+            element.text = None
+        for child in element:
+            if child.tail and not child.tail.strip():
+                child.tail = None
+
+    standalone = ' standalone="yes"' if tree.docinfo.standalone else ""
+    declaration = f'<?xml version="1.0" encoding="UTF-8"{standalone}?>'
+    return declaration.encode() + lxml.etree.tostring(tree, encoding="UTF-8")
+
+
+def _remove_keeping_tail(node):
+    """Remove node from its parent, keeping the text that follows it."""
+    parent = node.getparent()
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + node.tail
+        else:
+            parent.text = (parent.text or "") + node.tail
+    parent.remove(node)
 
 
 if __name__ == "__main__":
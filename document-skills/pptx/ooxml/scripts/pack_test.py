@@ -0,0 +1,87 @@
+import unittest
+import io
+import zipfile
+from unittest import mock
+import pack
+from pack import _compress_member, _copy_raw_member, _read_raw_member, _write_raw_member
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestRawMembers(unittest.TestCase):
+
+    PARTS = {
+        "[Content_Types].xml": b'<?xml version="1.0"?><Types/>',
+        "word/document.xml": b"<w:document>" + b"<w:p/>" * 1000 + b"</w:document>",
+        "word/media/image1.png": bytes(range(256)) * 64,
+    }
+
+    def create_source(self):
+        """Helper to create an archive holding PARTS, deflated or stored"""
+        stream = io.BytesIO()
+        with zipfile.ZipFile(stream, "w") as zf:
+            for name, data in self.PARTS.items():
+                compression = zipfile.ZIP_STORED if name.endswith(".png") else zipfile.ZIP_DEFLATED
+                zf.writestr(name, data, compress_type=compression)
+        stream.seek(0)
+        return zipfile.ZipFile(stream)
+
+    def copy_all(self, source):
+        """Helper to copy every member of source into a new archive"""
+        stream = io.BytesIO()
+        with zipfile.ZipFile(stream, "w") as zf:
+            for info in source.infolist():
+                _copy_raw_member(zf, source, info)
+        stream.seek(0)
+        return zipfile.ZipFile(stream)
+
+    def write_all(self):
+        """Helper to compress PARTS into a new archive with _write_raw_member"""
+        stream = io.BytesIO()
+        with zipfile.ZipFile(stream, "w") as zf:
+            for name, data in self.PARTS.items():
+                info = zipfile.ZipInfo(name)
+                _write_raw_member(zf, info, _compress_member(info, data))
+        stream.seek(0)
+        return zipfile.ZipFile(stream)
+
+    def assert_parts(self, archive):
+        """Helper to check an archive is sound and holds exactly PARTS"""
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.namelist(), list(self.PARTS))
+        for name, data in self.PARTS.items():
+            self.assertEqual(archive.read(name), data)
+
+    def test_copy_keeps_compressed_bytes(self):
+        """Test raw copies are readable and byte-for-byte equal to the source members"""
+        source = self.create_source()
+        copy = self.copy_all(source)
+        self.assert_parts(copy)
+        for info in source.infolist():
+            copied = copy.getinfo(info.filename)
+            self.assertEqual(copied.compress_type, info.compress_type)
+            self.assertEqual(copied.CRC, info.CRC)
+            self.assertEqual(_read_raw_member(copy, copied), _read_raw_member(source, info))
+
+    def test_written_members_round_trip(self):
+        """Test members compressed by _compress_member read back unchanged"""
+        archive = self.write_all()
+        self.assert_parts(archive)
+        self.assertEqual(archive.getinfo("word/media/image1.png").compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(archive.getinfo("word/document.xml").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_fallback_without_zipfile_internals(self):
+        """Test members are still written when zipfile lacks the private attributes"""
+        with mock.patch.object(pack, "_can_write_raw", return_value=False):
+            copy = self.copy_all(self.create_source())
+            written = self.write_all()
+        self.assert_parts(copy)
+        self.assert_parts(written)
+
+    def test_internals_present(self):
+        """Test this zipfile has every attribute the raw writes rely on"""
+        with zipfile.ZipFile(io.BytesIO(), "w") as zf:
+            self.assertTrue(pack._can_write_raw(zf))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,12 +4,17 @@ Validation modules for Word document processing.
 
 from .base import BaseSchemaValidator
 from .docx import DOCXSchemaValidator
+from .package_index import PackageIndex
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
+from .streaming import StreamingRule, StreamingRuleEngine
 
 __all__ = [
     "BaseSchemaValidator",
     "DOCXSchemaValidator",
+    "PackageIndex",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "StreamingRule",
+    "StreamingRuleEngine",
 ]
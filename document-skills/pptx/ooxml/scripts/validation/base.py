@@ -7,6 +7,9 @@ from pathlib import Path
 
 import lxml.etree
 
+from .package_index import CONTENT_TYPES_PART, PackageIndex
+from .streaming import StreamingRuleEngine, UniqueIdRule
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -103,10 +106,23 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    # Compiled XSD schemas by path, shared by every validator in the process
+    _schema_cache = {}
+
+    def __init__(self, unpacked_dir, original_file, verbose=False, other_parts=()):
+        """
+        Args:
+            unpacked_dir: The unpacked document to validate
+            original_file: The original document, for the checks that compare
+            verbose: Print the result of every check
+            other_parts: Names of non-XML parts (e.g. media) that belong to the
+                document but are not in unpacked_dir, for the checks of the
+                package structure (see PackageIndex.from_dir)
+        """
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.other_parts = list(other_parts)
 
         # Set schemas directory
         self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
@@ -120,6 +136,10 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Results of the single streaming pass, computed on first use
+        self._streaming_results = None
+        self._package_index = None
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
@@ -183,86 +203,23 @@ class BaseSchemaValidator:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
-    def validate_unique_ids(self):
-        """Validate that specific IDs are unique according to OOXML requirements."""
-        errors = []
-        global_ids = {}  # Track globally unique IDs across all files
+    def streaming_rules(self):
+        """Return the rules that are evaluated together in one streaming pass.
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+        Subclasses extend this list with format-specific rules.
+        """
+        return [UniqueIdRule(self.UNIQUE_ID_REQUIREMENTS)]
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
-                    )
+    def get_streaming_rule(self, name):
+        """Get a streaming rule by name, running the shared pass on first use."""
+        if self._streaming_results is None:
+            engine = StreamingRuleEngine(self.unpacked_dir, self.xml_files)
+            self._streaming_results = engine.run(self.streaming_rules())
+        return self._streaming_results[name]
 
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+    def validate_unique_ids(self):
+        """Validate that specific IDs are unique according to OOXML requirements."""
+        errors = self.get_streaming_rule(UniqueIdRule.name).errors
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,99 +231,67 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    @property
+    def package_index(self):
+        """PackageIndex of the unpacked directory, built on first use."""
+        if self._package_index is None:
+            self._package_index = PackageIndex.from_dir(
+                self.unpacked_dir, self.other_parts
+            )
+        return self._package_index
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
         errors = []
+        index = self.package_index
 
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_parts = [part for part in index.parts if part.endswith(".rels")]
 
-        if not rels_files:
+        if not rels_parts:
             if self.verbose:
                 print("PASSED - No .rels files found")
             return True
 
-        # Get all files in the unpacked directory (excluding reference files)
-        all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
-            ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
+        # Get all files in the package (excluding reference files)
+        all_files = [
+            part
+            for part in index.parts
+            if part != CONTENT_TYPES_PART and not part.endswith(".rels")
+        ]
 
         # Track all files that are referenced by any .rels file
         all_referenced_files = set()
 
         if self.verbose:
             print(
-                f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
+                f"Found {len(rels_parts)} .rels files and {len(all_files)} target files"
             )
 
         # Check each .rels file
-        for rels_file in rels_files:
-            try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
-                broken_refs = []
-
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
-                    if target and not target.startswith(
-                        ("http", "mailto:")
-                    ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
-                        else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
-                            broken_refs.append((target, rel.sourceline))
-
-                # Report broken references
-                if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
-                    for broken_ref, line_num in broken_refs:
-                        errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
-                        )
+        for rels_part in rels_parts:
+            if rels_part in index.errors:
+                errors.append(f"  Error parsing {rels_part}: {index.errors[rels_part]}")
+                continue
 
-            except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+            for rel in index.relationships[rels_part]:
+                if rel.target_part is None:
+                    continue  # Skip external URLs
+                if rel.target_part in index.part_set:
+                    all_referenced_files.add(rel.target_part)
+                else:
+                    errors.append(
+                        f"  {rels_part}: Line {rel.sourceline}: Broken reference to {rel.target}"
+                    )
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
         unreferenced_files = set(all_files) - all_referenced_files
 
         if unreferenced_files:
             for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
+                errors.append(f"  Unreferenced file: {unref_file}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship validation errors:")
@@ -390,9 +315,8 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
+        index = self.package_index
 
         # Process each XML file that might contain r:id references
         for xml_file in self.xml_files:
@@ -400,77 +324,56 @@ class BaseSchemaValidator:
             if xml_file.suffix == ".rels":
                 continue
 
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+            part = xml_file.relative_to(self.unpacked_dir).as_posix()
+            rels_part = index.rels_part_for(part)
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if rels_part not in index.part_set:
                 continue
 
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
+            error = index.errors.get(rels_part) or index.errors.get(part)
+            if error is not None:
+                errors.append(f"  Error processing {part}: {error}")
+                continue
 
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
+            # Collect valid relationship IDs and their types
+            rid_to_type = {}
+            for rel in index.relationships[rels_part]:
+                if rel.rid:
+                    # Check for duplicate rIds
+                    if rel.rid in rid_to_type:
+                        errors.append(
+                            f"  {rels_part}: Line {rel.sourceline}: "
+                            f"Duplicate relationship ID '{rel.rid}' (IDs must be unique)"
                         )
+                    rid_to_type[rel.rid] = rel.type_name
 
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
+            # Check every r:id reference in the part
+            for usage in index.usages.get(part, []):
+                if usage.attribute != "id" or not usage.rid:
+                    continue
+                rid_attr = usage.rid
+                elem_name = usage.element
+
+                # Check if the ID exists
+                if rid_attr not in rid_to_type:
+                    errors.append(
+                        f"  {part}: Line {usage.sourceline}: "
+                        f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                        f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
+                    )
+                # Check if we have type expectations for this element
+                elif self.ELEMENT_RELATIONSHIP_TYPES:
+                    expected_type = self._get_expected_relationship_type(elem_name)
+                    if expected_type:
+                        actual_type = rid_to_type[rid_attr]
+                        # Check if the actual type matches or contains the expected type
+                        if expected_type not in actual_type.lower():
                             errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
+                                f"  {part}: Line {usage.sourceline}: "
+                                f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                                f"but should point to a '{expected_type}' relationship"
                             )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -522,34 +425,20 @@ class BaseSchemaValidator:
     def validate_content_types(self):
         """Validate that all content files are properly declared in [Content_Types].xml."""
         errors = []
+        index = self.package_index
 
         # Find [Content_Types].xml file
-        content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
+        if CONTENT_TYPES_PART not in index.part_set:
             print("FAILED - [Content_Types].xml file not found")
             return False
 
         try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
+            if CONTENT_TYPES_PART in index.errors:
+                raise index.errors[CONTENT_TYPES_PART]
 
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
-            ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+            # Declared parts (Override) and extensions (Default)
+            declared_parts = set(index.overrides)
+            declared_extensions = set(index.defaults)
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,10 +464,6 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
-
             # Check all XML files for Override declarations
             for xml_file in self.xml_files:
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
@@ -592,24 +477,20 @@ class BaseSchemaValidator:
                 ):
                     continue
 
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
-
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
-                        )
-
-                except Exception:
-                    continue  # Skip unparseable files
+                # Unparseable files have no root tag and are skipped
+                root_name = index.root_tags.get(path_str)
+                if root_name in declarable_roots and path_str not in declared_parts:
+                    errors.append(
+                        f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                    )
 
             # Check all non-XML files for Default extension declarations
-            for file_path in all_files:
+            for relative_path in index.parts:
+                file_path = Path(relative_path)
                 # Skip XML files and metadata files (already checked above)
                 if file_path.suffix.lower() in {".xml", ".rels"}:
                     continue
-                if file_path.name == "[Content_Types].xml":
+                if file_path.name == CONTENT_TYPES_PART:
                     continue
                 if "_rels" in file_path.parts or "docProps" in file_path.parts:
                     continue
@@ -618,7 +499,6 @@ class BaseSchemaValidator:
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
                             f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
                         )
@@ -830,13 +710,7 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            schema = self._load_schema(schema_path)
 
             # Load and preprocess XML
             with open(xml_file, "r") as f:
@@ -866,6 +740,19 @@ class BaseSchemaValidator:
         except Exception as e:
             return False, {str(e)}
 
+    def _load_schema(self, schema_path):
+        """Return the compiled XSD schema at schema_path, compiling it on first use."""
+        schema = self._schema_cache.get(schema_path)
+        if schema is None:
+            with open(schema_path, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(
+                    xsd_file, parser=parser, base_url=str(schema_path)
+                )
+                schema = lxml.etree.XMLSchema(xsd_doc)
+            self._schema_cache[schema_path] = schema
+        return schema
+
     def _get_original_file_errors(self, xml_file):
         """Get XSD validation errors from a single file in the original document.
 
@@ -886,16 +773,14 @@ class BaseSchemaValidator:
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_path = Path(temp_dir)
 
-            # Extract original file
+            # Extract only the corresponding file from the original
             with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+                if relative_path.as_posix() not in zip_ref.namelist():
+                    # File didn't exist in original, so no original errors
+                    return set()
+                original_xml_file = Path(
+                    zip_ref.extract(relative_path.as_posix(), temp_path)
+                )
 
             # Validate the specific file in original
             is_valid, errors = self._validate_single_file_xsd(
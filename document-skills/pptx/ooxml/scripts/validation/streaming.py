@@ -0,0 +1,316 @@
+"""
+Streaming rule engine for validating large XML parts in a single pass.
+
+Rules that only need an element, its attributes, its text and the tags of its
+ancestors are evaluated while lxml.etree.iterparse walks the file. Processed
+elements are cleared as soon as their end tag is seen, so peak memory stays
+bounded regardless of the size of document.xml or sheet*.xml.
+"""
+
+import re
+
+import lxml.etree
+
+MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+WORD_2006_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+
+class StreamContext:
+    """Parse state shared by all rules while a single file is streamed."""
+
+    ALTERNATE_CONTENT_TAG = f"{{{MC_NAMESPACE}}}AlternateContent"
+
+    def __init__(self, xml_file, relative_path):
+        self.xml_file = xml_file
+        self.relative_path = relative_path
+        # Number of currently open elements per qualified tag, e.g. "{ns}del" -> 1
+        self.open_counts = {}
+
+    def inside(self, tag):
+        """Return True if an element with this qualified tag is an ancestor.
+
+        The current element is never counted: rules see start events before
+        the element is pushed and end events after it is popped.
+        """
+        return self.open_counts.get(tag, 0) > 0
+
+    @property
+    def in_alternate_content(self):
+        """True while streaming the contents of an mc:AlternateContent element."""
+        return self.inside(self.ALTERNATE_CONTENT_TAG)
+
+
+class StreamingRule:
+    """Base class for a validation rule evaluated during a streaming pass.
+
+    Subclasses override applies_to() to select files and start()/end() to
+    inspect elements. Errors are collected as formatted strings in self.errors.
+    """
+
+    name = ""
+
+    def __init__(self):
+        self.errors = []
+
+    def applies_to(self, xml_file):
+        """Return True if this rule should see the elements of xml_file."""
+        return True
+
+    def handles(self, event, tag):
+        """Return True if this rule wants the given event ("start" or "end") for tag.
+
+        The engine caches the answer per (event, tag), so rules that only look
+        at a handful of elements cost nothing for the rest of the file.
+        """
+        return True
+
+    def begin_file(self, ctx):
+        """Called before the first element of a file is streamed."""
+
+    def start(self, ctx, elem):
+        """Called on each start tag. Attributes and sourceline are available."""
+
+    def end(self, ctx, elem):
+        """Called on each end tag. Text content is available."""
+
+    def end_file(self, ctx):
+        """Called after the last element of a file has been streamed."""
+
+    def parse_error(self, ctx, error):
+        """Record a file that could not be parsed."""
+        self.errors.append(f"  {ctx.relative_path}: Error: {error}")
+
+
+class StreamingRuleEngine:
+    """Evaluate many StreamingRules over a set of XML files with one pass per file."""
+
+    def __init__(self, unpacked_dir, xml_files):
+        self.unpacked_dir = unpacked_dir
+        self.xml_files = xml_files
+
+    def run(self, rules):
+        """Stream every file that at least one rule applies to.
+
+        Args:
+            rules: List of StreamingRule instances
+
+        Returns:
+            dict: Mapping of rule name to the (now populated) rule instance
+        """
+        for xml_file in self.xml_files:
+            active = [rule for rule in rules if rule.applies_to(xml_file)]
+            if active:
+                self._stream_file(xml_file, active)
+        return {rule.name: rule for rule in rules}
+
+    def _stream_file(self, xml_file, rules):
+        ctx = StreamContext(xml_file, xml_file.relative_to(self.unpacked_dir))
+        for rule in rules:
+            rule.begin_file(ctx)
+
+        dispatch = {}  # (event, tag) -> rules interested in it
+        open_counts = ctx.open_counts
+        try:
+            for event, elem in lxml.etree.iterparse(
+                str(xml_file), events=("start", "end")
+            ):
+                tag = elem.tag
+                key = (event, tag)
+                handlers = dispatch.get(key)
+                if handlers is None:
+                    handlers = [r for r in rules if r.handles(event, tag)]
+                    dispatch[key] = handlers
+
+                if event == "start":
+                    for rule in handlers:
+                        rule.start(ctx, elem)
+                    open_counts[tag] = open_counts.get(tag, 0) + 1
+                else:
+                    open_counts[tag] -= 1
+                    for rule in handlers:
+                        rule.end(ctx, elem)
+                    # Release the finished subtree and any earlier siblings
+                    elem.clear()
+                    parent = elem.getparent()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
+        except Exception as e:
+            for rule in rules:
+                rule.parse_error(ctx, e)
+            return
+
+        for rule in rules:
+            rule.end_file(ctx)
+
+
+class UniqueIdRule(StreamingRule):
+    """IDs listed in UNIQUE_ID_REQUIREMENTS must be unique per file or globally.
+
+    Elements inside mc:AlternateContent are skipped, since the Choice and
+    Fallback branches legitimately repeat the same IDs.
+    """
+
+    name = "unique_ids"
+
+    def __init__(self, requirements):
+        super().__init__()
+        self.requirements = requirements
+        self.global_ids = {}  # id -> (file, line, tag)
+        self.file_ids = {}
+
+    def handles(self, event, tag):
+        return event == "start" and _split_tag(tag)[1].lower() in self.requirements
+
+    def begin_file(self, ctx):
+        self.file_ids = {}
+
+    def start(self, ctx, elem):
+        if ctx.in_alternate_content:
+            return
+
+        tag = _split_tag(elem.tag)[1].lower()
+        attr_name, scope = self.requirements[tag]
+
+        id_value = None
+        for attr, value in elem.attrib.items():
+            if _split_tag(attr)[1].lower() == attr_name:
+                id_value = value
+                break
+        if id_value is None:
+            return
+
+        if scope == "global":
+            if id_value in self.global_ids:
+                prev_file, prev_line, prev_tag = self.global_ids[id_value]
+                self.errors.append(
+                    f"  {ctx.relative_path}: "
+                    f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
+                    f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                )
+            else:
+                self.global_ids[id_value] = (ctx.relative_path, elem.sourceline, tag)
+        elif scope == "file":
+            seen = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in seen:
+                self.errors.append(
+                    f"  {ctx.relative_path}: "
+                    f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                    f"(first occurrence at line {seen[id_value]})"
+                )
+            else:
+                seen[id_value] = elem.sourceline
+
+
+class DocumentXmlRule(StreamingRule):
+    """Base for rules that only inspect word/document.xml parts."""
+
+    def applies_to(self, xml_file):
+        return xml_file.name == "document.xml"
+
+
+class WhitespacePreservationRule(DocumentXmlRule):
+    """w:t elements with leading/trailing whitespace need xml:space='preserve'."""
+
+    name = "whitespace_preservation"
+    T_TAG = f"{{{WORD_2006_NAMESPACE}}}t"
+    SPACE_ATTR = f"{{{XML_NAMESPACE}}}space"
+
+    def handles(self, event, tag):
+        return event == "end" and tag == self.T_TAG
+
+    def end(self, ctx, elem):
+        if not elem.text:
+            return
+        text = elem.text
+        if not (re.match(r"^\s.*", text) or re.match(r".*\s$", text)):
+            return
+        if elem.get(self.SPACE_ATTR) == "preserve":
+            return
+        self.errors.append(
+            f"  {ctx.relative_path}: "
+            f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {_preview(text)}"
+        )
+
+
+class DeletionRule(DocumentXmlRule):
+    """w:t elements must not appear inside w:del (use w:delText instead)."""
+
+    name = "deletions"
+    T_TAG = f"{{{WORD_2006_NAMESPACE}}}t"
+    DEL_TAG = f"{{{WORD_2006_NAMESPACE}}}del"
+
+    def handles(self, event, tag):
+        return event == "end" and tag == self.T_TAG
+
+    def end(self, ctx, elem):
+        if elem.text and ctx.inside(self.DEL_TAG):
+            self.errors.append(
+                f"  {ctx.relative_path}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {_preview(elem.text)}"
+            )
+
+
+class InsertionRule(DocumentXmlRule):
+    """w:delText inside w:ins is only allowed when nested within a w:del."""
+
+    name = "insertions"
+    DELTEXT_TAG = f"{{{WORD_2006_NAMESPACE}}}delText"
+    INS_TAG = f"{{{WORD_2006_NAMESPACE}}}ins"
+    DEL_TAG = f"{{{WORD_2006_NAMESPACE}}}del"
+
+    def handles(self, event, tag):
+        return event == "end" and tag == self.DELTEXT_TAG
+
+    def end(self, ctx, elem):
+        if ctx.inside(self.INS_TAG) and not ctx.inside(self.DEL_TAG):
+            self.errors.append(
+                f"  {ctx.relative_path}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {_preview(elem.text or '')}"
+            )
+
+
+class ParagraphCountRule(DocumentXmlRule):
+    """Count w:p elements (not an error rule, used for the paragraph summary)."""
+
+    name = "paragraph_count"
+    P_TAG = f"{{{WORD_2006_NAMESPACE}}}p"
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+        self._file_count = 0
+
+    def begin_file(self, ctx):
+        self._file_count = 0
+
+    def handles(self, event, tag):
+        return event == "end" and tag == self.P_TAG
+
+    def end(self, ctx, elem):
+        self._file_count += 1
+
+    def end_file(self, ctx):
+        # Matches the previous behaviour: the last document.xml wins
+        self.count = self._file_count
+
+    def parse_error(self, ctx, error):
+        print(f"Error counting paragraphs in unpacked document: {error}")
+
+
+def _split_tag(tag):
+    """Split '{ns}local' into (ns, local). Un-namespaced tags get ns=None."""
+    if tag[0] == "{":
+        ns, local = tag[1:].split("}", 1)
+        return ns, local
+    return None, tag
+
+
+def _preview(text):
+    """Return a repr of text truncated to 50 characters for error messages."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
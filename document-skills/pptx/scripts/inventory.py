@@ -13,25 +13,42 @@ This module provides functionality to:
 Classes:
     ParagraphData: Represents a text paragraph with formatting
     ShapeData: Represents a shape with position and text content
+    FontIndex: Finds font files by name, indexed once per process
+    TextMetrics: Measures text from cached character advances
+    InventoryCache: Slide inventories on disk, keyed by slide content
+    ActiveIntervals: Vertical extents of shapes, for the overlap sweep
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    get_inventory_as_dict: Same as JSON-ready dicts, optionally cached
+    wrap_text: Wrap a line of text to a width, as the overflow estimate does
+    prune_cache_dir: Evict old entries from a cache directory
     save_inventory: Save extracted data to JSON
 
 Usage:
-    python inventory.py input.pptx output.json
+    python inventory.py input.pptx output.json [--issues-only] [--no-cache]
 """
 
 import argparse
+import bisect
+import hashlib
+import heapq
 import json
+import os
 import platform
+import re
 import sys
+import tempfile
+import time
+import weakref
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Collection, Dict, Iterator, List, Optional, Tuple, Union
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import ImageFont
 from pptx import Presentation
+from pptx.enum.dml import MSO_FILL
 from pptx.enum.text import PP_ALIGN
 from pptx.shapes.base import BaseShape
 
@@ -46,6 +63,60 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# Fields a caller can select with extract_text_inventory(fields=...) and
+# ShapeData.to_dict(fields=...); positions are always included
+INVENTORY_FIELDS = frozenset(
+    {"position", "placeholder", "overflow", "overlap", "warnings", "paragraphs"}
+)
+
+# Keys of a shape's dict that each field adds (positions are always there)
+FIELD_KEYS = {
+    "placeholder": ("placeholder_type", "default_font_size"),
+    "overflow": ("overflow",),
+    "overlap": ("overlap",),
+    "warnings": ("warnings",),
+    "paragraphs": ("paragraphs",),
+}
+
+INVENTORY_CACHE_DIR = Path(tempfile.gettempdir()) / "pptx_inventory"
+INVENTORY_CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds since an entry was last used
+INVENTORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# A cache directory is pruned on the first put() of a cache object, then once
+# every CACHE_PRUNE_INTERVAL puts, so that storing the slides of a deck does not
+# list the whole directory for every slide
+CACHE_PRUNE_INTERVAL = 256
+
+
+def prune_cache_dir(
+    cache_dir: Path, pattern: str, max_age: float, max_bytes: int
+) -> None:
+    """Remove the entries of a cache directory that exceed the age or size limit.
+
+    Entries not used for max_age seconds are removed; then the least recently
+    used ones until the rest fit in max_bytes. Caches touch an entry when they
+    return it, so its mtime is the time it was last used. Errors are ignored:
+    another process may be pruning or writing the same directory.
+    """
+    entries = []
+    for path in cache_dir.glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Removed by another process
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    cutoff = time.time() - max_age
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            continue
+        total -= size
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -60,6 +131,10 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+Slides are only analyzed if their content changed since any earlier run
+(of this script, replace.py or thumbnail.py); the others are read from a
+cache in the temporary directory. Use --no-cache to analyze every slide.
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,6 +151,11 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Analyze every slide instead of reusing cached slide inventories",
+    )
 
     args = parser.parse_args()
 
@@ -94,7 +174,11 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        inventory = get_inventory_as_dict(
+            input_path,
+            issues_only=args.issues_only,
+            cache=None if args.no_cache else InventoryCache(),
+        )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -206,18 +290,21 @@ class ParagraphData:
                 if font.underline is not None:
                     self.underline = font.underline
 
-                # Handle color - both RGB and theme colors
-                try:
-                    # Try RGB color first
-                    if font.color.rgb:
-                        self.color = str(font.color.rgb)
-                except (AttributeError, TypeError):
-                    # Fall back to theme color
+                # Handle color - both RGB and theme colors. Only solid fills have
+                # one, and font.color would add an empty <a:solidFill/> to the run
+                # otherwise, so that reading the inventory would change the slide
+                if font.fill.type == MSO_FILL.SOLID:
                     try:
-                        if font.color.theme_color:
-                            self.theme_color = font.color.theme_color.name
+                        # Try RGB color first
+                        if font.color.rgb:
+                            self.color = str(font.color.rgb)
                     except (AttributeError, TypeError):
-                        pass
+                        # Fall back to theme color
+                        try:
+                            if font.color.theme_color:
+                                self.theme_color = font.color.theme_color.name
+                        except (AttributeError, TypeError):
+                            pass
 
         # Add line spacing if set
         if hasattr(paragraph, "line_spacing") and paragraph.line_spacing is not None:
@@ -263,6 +350,268 @@ class ParagraphData:
         return result
 
 
+class FontIndex:
+    """Font files of the system, indexed by file name once per process.
+
+    Font directories are walked (recursively) a single time; finding a font is
+    then a few dictionary lookups instead of probing the file system for every
+    paragraph. Results are memoized per font name.
+    """
+
+    _system: Optional["FontIndex"] = None
+
+    def __init__(self, font_dirs: List[str], extensions: List[str]):
+        """Index the font files with the given extensions under font_dirs.
+
+        Args:
+            font_dirs: Directories in search order (~ is expanded)
+            extensions: Font file extensions in order of preference
+        """
+        self.extensions = extensions
+        # Per directory: file name -> path, and (lowercase name, path) in walk order
+        self._dirs: List[Tuple[Dict[str, str], List[Tuple[str, str]]]] = []
+        for font_dir in font_dirs:
+            font_dir_path = Path(font_dir).expanduser()
+            if not font_dir_path.is_dir():
+                continue
+            by_name: Dict[str, str] = {}
+            files: List[Tuple[str, str]] = []
+            for root, dirs, names in os.walk(font_dir_path, onerror=lambda e: None):
+                dirs.sort()
+                for name in sorted(names):
+                    if not name.lower().endswith(tuple(extensions)):
+                        continue
+                    path = os.path.join(root, name)
+                    by_name.setdefault(name, path)
+                    files.append((name.lower(), path))
+            self._dirs.append((by_name, files))
+        self._found: Dict[str, Optional[str]] = {}
+
+    @classmethod
+    def system(cls) -> "FontIndex":
+        """Return the index of the platform's font directories, built on first use."""
+        if cls._system is None:
+            if platform.system() == "Darwin":  # macOS
+                cls._system = cls(
+                    ["/System/Library/Fonts/", "/Library/Fonts/", "~/Library/Fonts/"],
+                    [".ttf", ".otf", ".ttc", ".dfont"],
+                )
+            else:  # Linux
+                cls._system = cls(
+                    ["/usr/share/fonts/truetype/", "/usr/local/share/fonts/", "~/.fonts/"],
+                    [".ttf", ".otf"],
+                )
+        return cls._system
+
+    def find(self, font_name: str) -> Optional[str]:
+        """Return the file of a font, or None if not found.
+
+        In each directory, file names matching a variant of the name (as is,
+        lowercase, without spaces or with hyphens) win over files whose name
+        merely contains it.
+        """
+        if font_name in self._found:
+            return self._found[font_name]
+
+        variants = [
+            font_name,
+            font_name.lower(),
+            font_name.replace(" ", ""),
+            font_name.replace(" ", "-"),
+        ]
+        compact = font_name.lower().replace(" ", "")
+        found = None
+        for by_name, files in self._dirs:
+            found = next(
+                (
+                    by_name[f"{variant}{ext}"]
+                    for variant in variants
+                    for ext in self.extensions
+                    if f"{variant}{ext}" in by_name
+                ),
+                None,
+            ) or next((path for name, path in files if compact in name), None)
+            if found:
+                break
+        self._found[font_name] = found
+        return found
+
+    def fingerprint(self) -> str:
+        """Return a hash of the indexed font files, which text measurements depend on."""
+        digest = hashlib.sha256()
+        for _, files in self._dirs:
+            for _, path in files:
+                digest.update(path.encode("utf-8", "surrogateescape") + b"\0")
+        return digest.hexdigest()
+
+
+class TextMetrics:
+    """Text widths for one font and size, from a table of character advances.
+
+    Each character is measured once; the width of a string is the sum of the
+    advances of its characters. Kerning is ignored, which is well within the
+    precision of an overflow estimate.
+    """
+
+    def __init__(self, font: Any):
+        self.font = font
+        self._advances: Dict[str, float] = {}
+
+    def width(self, text: str) -> float:
+        """Return the width of text in pixels."""
+        advances = self._advances
+        try:
+            return sum([advances[char] for char in text])
+        except KeyError:
+            for char in set(text).difference(advances):
+                advances[char] = self.font.getlength(char)
+            return sum([advances[char] for char in text])
+
+
+@lru_cache(maxsize=64)
+def get_text_metrics(font_name: str, font_size: int) -> TextMetrics:
+    """Return the (cached) TextMetrics of a font, or of PIL's default font if not found.
+
+    Loaded fonts and their advance tables are kept for the most recently used
+    font/size combinations, so every paragraph in the same font reuses them.
+    """
+    font = None
+    font_path = FontIndex.system().find(font_name)
+    if font_path:
+        try:
+            font = ImageFont.truetype(font_path, size=font_size)
+        except Exception:
+            pass
+    return TextMetrics(font or ImageFont.load_default())
+
+
+# Scripts without spaces between words (CJK ideographs, kana, hangul, fullwidth
+# forms): a line may break after any of their characters
+_CJK = (
+    "\u1100-\u11ff\u2e80-\u9fff\ua960-\ua97f\uac00-\ud7ff"
+    "\uf900-\ufaff\ufe30-\ufe4f\uff00-\uffef\U00020000-\U0003ffff"
+)
+# Punctuation that must not start a line, so it stays with the character before it
+_CJK_CLOSING = "\u3001\u3002\u300d\u300f\u3011\u3015\uff01\uff09\uff0c\uff0e\uff1a\uff1b\uff1f\u30fc"
+_BREAK_SEGMENT = re.compile(f"[{_CJK}][{_CJK_CLOSING}]*|[^{_CJK}]+")
+_HAS_CJK = re.compile(f"[{_CJK}]")
+
+
+def wrap_text(line: str, max_width: float, metrics: TextMetrics) -> List[str]:
+    """Wrap a single line of text to fit within max_width pixels.
+
+    Greedy word wrapping in linear time: every word is measured once and line
+    widths are accumulated. Lines also break between CJK characters, and a
+    word wider than max_width is broken between its characters.
+
+    Args:
+        line: Text without line breaks
+        max_width: Available width in pixels
+        metrics: TextMetrics of the font the text is set in
+
+    Returns:
+        The wrapped lines ([""] for an empty line)
+    """
+    if not line:
+        return [""]
+
+    if metrics.width(line) <= max_width:
+        return [line]
+
+    space_width = metrics.width(" ")
+    wrapped = []
+    current: List[str] = []  # Pieces of the line being filled
+    current_width = 0.0
+    current_length = 0
+    has_cjk = _HAS_CJK.search(line) is not None
+
+    for word in line.split(" "):
+        segments = (_BREAK_SEGMENT.findall(word) or [""]) if has_cjk else (word,)
+        for i, segment in enumerate(segments):
+            # Words are joined by a space (dropped at the start of a line);
+            # segments of the same word are not
+            joiner = " " if i == 0 and current_length else ""
+            width = metrics.width(segment)
+            added_width = (space_width if joiner else 0.0) + width
+            if current_width + added_width <= max_width:
+                current.extend((joiner, segment))
+                current_width += added_width
+                current_length += len(joiner) + len(segment)
+                continue
+            if current_length:
+                wrapped.append("".join(current))
+            if width > max_width and len(segment) > 1:
+                # Unbreakable token wider than a line: break it between characters
+                chunk, chunk_width = "", 0.0
+                for char in segment:
+                    char_width = metrics.width(char)
+                    if chunk and chunk_width + char_width > max_width:
+                        wrapped.append(chunk)
+                        chunk, chunk_width = "", 0.0
+                    chunk += char
+                    chunk_width += char_width
+                segment, width = chunk, chunk_width
+            current, current_width, current_length = [segment], width, len(segment)
+
+    if current_length:
+        wrapped.append("".join(current))
+
+    return wrapped
+
+
+# Default font sizes by layout and master part, computed once per part
+_layout_font_sizes: "weakref.WeakKeyDictionary[Any, Dict[Any, Optional[float]]]" = (
+    weakref.WeakKeyDictionary()
+)
+_master_font_sizes: "weakref.WeakKeyDictionary[Any, Dict[str, int]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_layout_font_sizes(slide_layout: Any) -> Dict[Any, Optional[float]]:
+    """Return the default font size (in points) of each placeholder type of a layout.
+
+    The first placeholder of each type wins; its size is that of the first
+    defRPr with a sz attribute, or None. Computed once per layout.
+    """
+    sizes = _layout_font_sizes.get(slide_layout.part)
+    if sizes is None:
+        sizes = {}
+        for layout_placeholder in slide_layout.placeholders:
+            shape_type = layout_placeholder.placeholder_format.type
+            if shape_type in sizes:
+                continue
+            sizes[shape_type] = next(
+                (
+                    float(sz) / 100.0  # Convert hundredths of a point to points
+                    for elem in layout_placeholder.element.iter()
+                    if "defRPr" in elem.tag and (sz := elem.get("sz"))
+                ),
+                None,
+            )
+        _layout_font_sizes[slide_layout.part] = sizes
+    return sizes
+
+
+def get_master_font_sizes(slide_master: Any) -> Dict[str, int]:
+    """Return the font size of the master's bodyStyle and titleStyle, if set.
+
+    Computed once per slide master.
+    """
+    sizes = _master_font_sizes.get(slide_master.part)
+    if sizes is None:
+        sizes = {}
+        for child in slide_master.element.iter():
+            tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
+            if tag in ("bodyStyle", "titleStyle") and tag not in sizes:
+                for elem in child.iter():
+                    if "sz" in elem.attrib:
+                        sizes[tag] = int(elem.attrib["sz"]) // 100
+                        break
+        _master_font_sizes[slide_master.part] = sizes
+    return sizes
+
+
 class ShapeData:
     """Data structure for shape properties extracted from a PowerPoint shape."""
 
@@ -286,61 +635,7 @@ class ShapeData:
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
-
-        # Common font file variations to try
-        font_variations = [
-            font_name,
-            font_name.lower(),
-            font_name.replace(" ", ""),
-            font_name.replace(" ", "-"),
-        ]
-
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
-            # First try exact matches
-            for variant in font_variations:
-                for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
-
-            # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
-
-        return None
+        return FontIndex.system().find(font_name)
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -374,13 +669,7 @@ class ShapeData:
                 return None
 
             shape_type = shape.placeholder_format.type  # type: ignore
-            for layout_placeholder in slide_layout.placeholders:
-                if layout_placeholder.placeholder_format.type == shape_type:
-                    # Find first defRPr element with sz (size) attribute
-                    for elem in layout_placeholder.element.iter():
-                        if "defRPr" in elem.tag and (sz := elem.get("sz")):
-                            return float(sz) / 100.0  # Convert EMUs to points
-                    break
+            return get_layout_font_sizes(slide_layout).get(shape_type)
         except Exception:
             pass
         return None
@@ -410,72 +699,78 @@ class ShapeData:
 
         # Get placeholder type if applicable
         self.placeholder_type: Optional[str] = None
-        self.default_font_size: Optional[float] = None
+        self._slide_layout = None  # For default_font_size, placeholders only
         if hasattr(shape, "is_placeholder") and shape.is_placeholder:  # type: ignore
             if shape.placeholder_format and shape.placeholder_format.type:  # type: ignore
                 self.placeholder_type = (
                     str(shape.placeholder_format.type).split(".")[-1].split(" ")[0]  # type: ignore
                 )
-
-                # Get default font size from layout
                 if slide and hasattr(slide, "slide_layout"):
-                    self.default_font_size = self.get_default_font_size(
-                        shape, slide.slide_layout
-                    )
+                    self._slide_layout = slide.slide_layout
 
         # Get position information
-        # Use absolute positions if provided (for shapes in groups), otherwise use shape's position
+        # Use absolute positions if provided (for shapes in groups), otherwise use shape's position.
+        # Each is read once: placeholders look up inherited values in the layout.
         left_emu = (
-            absolute_left
-            if absolute_left is not None
-            else (shape.left if hasattr(shape, "left") else 0)
-        )
-        top_emu = (
-            absolute_top
-            if absolute_top is not None
-            else (shape.top if hasattr(shape, "top") else 0)
+            absolute_left if absolute_left is not None else getattr(shape, "left", 0)
         )
+        top_emu = absolute_top if absolute_top is not None else getattr(shape, "top", 0)
+        width_emu = getattr(shape, "width", 0)
+        height_emu = getattr(shape, "height", 0)
 
         self.left: float = round(self.emu_to_inches(left_emu), 2)  # type: ignore
         self.top: float = round(self.emu_to_inches(top_emu), 2)  # type: ignore
-        self.width: float = round(
-            self.emu_to_inches(shape.width if hasattr(shape, "width") else 0),
-            2,  # type: ignore
-        )
-        self.height: float = round(
-            self.emu_to_inches(shape.height if hasattr(shape, "height") else 0),
-            2,  # type: ignore
-        )
+        self.width: float = round(self.emu_to_inches(width_emu), 2)  # type: ignore
+        self.height: float = round(self.emu_to_inches(height_emu), 2)  # type: ignore
 
         # Store EMU positions for overflow calculations
         self.left_emu = left_emu
         self.top_emu = top_emu
-        self.width_emu = shape.width if hasattr(shape, "width") else 0
-        self.height_emu = shape.height if hasattr(shape, "height") else 0
+        self.width_emu = width_emu
+        self.height_emu = height_emu
 
-        # Calculate overflow status
-        self.frame_overflow_bottom: Optional[float] = None
+        # Calculate slide overflow status; frame overflow, paragraphs and
+        # warnings are computed on first access (see the properties below)
         self.slide_overflow_right: Optional[float] = None
         self.slide_overflow_bottom: Optional[float] = None
         self.overlapping_shapes: Dict[
             str, float
         ] = {}  # Dict of shape_id -> overlap area in sq inches
-        self.warnings: List[str] = []
-        self._estimate_frame_overflow()
         self._calculate_slide_overflow()
-        self._detect_bullet_issues()
 
-    @property
-    def paragraphs(self) -> List[ParagraphData]:
-        """Calculate paragraphs from the shape's text frame."""
+    @cached_property
+    def default_font_size(self) -> Optional[float]:
+        """Default font size of the placeholder from the slide layout, or None."""
+        if self._slide_layout is None:
+            return None
+        return self.get_default_font_size(self.shape, self._slide_layout)
+
+    @cached_property
+    def _text_paragraphs(self) -> List[Tuple[int, Any, ParagraphData]]:
+        """(index, paragraph, ParagraphData) of each non-empty paragraph, analyzed once."""
         if not self.shape or not hasattr(self.shape, "text_frame"):
             return []
 
-        paragraphs = []
-        for paragraph in self.shape.text_frame.paragraphs:  # type: ignore
-            if paragraph.text.strip():
-                paragraphs.append(ParagraphData(paragraph))
-        return paragraphs
+        return [
+            (index, paragraph, ParagraphData(paragraph))
+            for index, paragraph in enumerate(self.shape.text_frame.paragraphs)  # type: ignore
+            if paragraph.text.strip()
+        ]
+
+    @cached_property
+    def paragraphs(self) -> List[ParagraphData]:
+        """Calculate paragraphs from the shape's text frame."""
+        return [para_data for _, _, para_data in self._text_paragraphs]
+
+    @cached_property
+    def frame_overflow_bottom(self) -> Optional[float]:
+        """Estimated text overflow below the frame in inches, or None."""
+        return self._estimate_frame_overflow()
+
+    @cached_property
+    def warnings(self) -> List[str]:
+        """Formatting warnings for the shape's paragraphs."""
+        return self._detect_bullet_issues()
 
     def _get_default_font_size(self) -> int:
         """Get default font size from theme text styles or use conservative default."""
@@ -495,12 +790,7 @@ class ShapeData:
                 style_name = "titleStyle"
 
             # Find font size in theme styles
-            for child in slide_master.element.iter():
-                tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-                if tag == style_name:
-                    for elem in child.iter():
-                        if "sz" in elem.attrib:
-                            return int(elem.attrib["sz"]) // 100
+            return get_master_font_sizes(slide_master).get(style_name, 14)
         except Exception:
             pass
 
@@ -531,51 +821,23 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
-    def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
-        if not line:
-            return [""]
-
-        # Use textlength for efficient width calculation
-        if draw.textlength(line, font=font) <= max_width_px:
-            return [line]
+    def _estimate_frame_overflow(self) -> Optional[float]:
+        """Estimate if text overflows the shape bounds using PIL text measurement.
 
-        # Need to wrap - split into words
-        wrapped = []
-        words = line.split(" ")
-        current_line = ""
-
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
-            else:
-                if current_line:
-                    wrapped.append(current_line)
-                current_line = word
-
-        if current_line:
-            wrapped.append(current_line)
-
-        return wrapped
-
-    def _estimate_frame_overflow(self) -> None:
-        """Estimate if text overflows the shape bounds using PIL text measurement."""
+        Returns:
+            Overflow below the frame in inches, or None if there is no significant overflow
+        """
         if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
+            return None
 
         text_frame = self.shape.text_frame  # type: ignore
         if not text_frame or not text_frame.paragraphs:
-            return
+            return None
 
         # Get usable dimensions after accounting for margins
         usable_width_px, usable_height_px = self._get_usable_dimensions(text_frame)
         if usable_width_px <= 0 or usable_height_px <= 0:
-            return
-
-        # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
+            return None
 
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
@@ -583,30 +845,16 @@ class ShapeData:
         # Calculate total height of all paragraphs
         total_height_px = 0
 
-        for para_idx, paragraph in enumerate(text_frame.paragraphs):
-            if not paragraph.text.strip():
-                continue
-
-            para_data = ParagraphData(paragraph)
-
-            # Load font for this paragraph
+        for para_idx, paragraph, para_data in self._text_paragraphs:
+            # Font metrics for this paragraph, shared by all paragraphs in the same font
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
-
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            metrics = get_text_metrics(font_name, font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
             for line in paragraph.text.split("\n"):
-                wrapped = self._wrap_text_line(line, usable_width_px, draw, font)
+                wrapped = wrap_text(line, usable_width_px, metrics)
                 all_wrapped_lines.extend(wrapped)
 
             if all_wrapped_lines:
@@ -634,7 +882,8 @@ class ShapeData:
             overflow_px = total_height_px - usable_height_px
             overflow_inches = round(overflow_px / 96.0, 2)
             if overflow_inches > 0.05:  # Only report significant overflows
-                self.frame_overflow_bottom = overflow_inches
+                return overflow_inches
+        return None
 
     def _calculate_slide_overflow(self) -> None:
         """Calculate if shape overflows the slide boundaries."""
@@ -657,14 +906,15 @@ class ShapeData:
             if overflow_inches > 0.01:  # Only report significant overflows
                 self.slide_overflow_bottom = overflow_inches
 
-    def _detect_bullet_issues(self) -> None:
+    def _detect_bullet_issues(self) -> List[str]:
         """Detect bullet point formatting issues in paragraphs."""
+        warnings: List[str] = []
         if not self.shape or not hasattr(self.shape, "text_frame"):
-            return
+            return warnings
 
         text_frame = self.shape.text_frame  # type: ignore
         if not text_frame or not text_frame.paragraphs:
-            return
+            return warnings
 
         # Common bullet symbols that indicate manual bullets
         bullet_symbols = ["•", "●", "○"]
@@ -673,10 +923,9 @@ class ShapeData:
             text = paragraph.text.strip()
             # Check for manual bullet symbols
             if text and any(text.startswith(symbol + " ") for symbol in bullet_symbols):
-                self.warnings.append(
-                    "manual_bullet_symbol: use proper bullet formatting"
-                )
+                warnings.append("manual_bullet_symbol: use proper bullet formatting")
                 break
+        return warnings
 
     @property
     def has_any_issues(self) -> bool:
@@ -689,8 +938,14 @@ class ShapeData:
             or len(self.warnings) > 0
         )
 
-    def to_dict(self) -> ShapeDict:
-        """Convert to dictionary for JSON serialization."""
+    def to_dict(self, fields: Optional[Collection[str]] = None) -> ShapeDict:
+        """Convert to dictionary for JSON serialization.
+
+        Args:
+            fields: Optional subset of INVENTORY_FIELDS to include (default: all).
+                Fields that are left out are not computed.
+        """
+        fields = check_fields(fields)
         result: ShapeDict = {
             "left": self.left,
             "top": self.top,
@@ -699,46 +954,66 @@ class ShapeData:
         }
 
         # Add optional fields if present
-        if self.placeholder_type:
-            result["placeholder_type"] = self.placeholder_type
+        if "placeholder" in fields:
+            if self.placeholder_type:
+                result["placeholder_type"] = self.placeholder_type
 
-        if self.default_font_size:
-            result["default_font_size"] = self.default_font_size
+            if self.default_font_size:
+                result["default_font_size"] = self.default_font_size
 
         # Add overflow information only if there is overflow
-        overflow_data = {}
-
-        # Add frame overflow if present
-        if self.frame_overflow_bottom is not None:
-            overflow_data["frame"] = {"overflow_bottom": self.frame_overflow_bottom}
-
-        # Add slide overflow if present
-        slide_overflow = {}
-        if self.slide_overflow_right is not None:
-            slide_overflow["overflow_right"] = self.slide_overflow_right
-        if self.slide_overflow_bottom is not None:
-            slide_overflow["overflow_bottom"] = self.slide_overflow_bottom
-        if slide_overflow:
-            overflow_data["slide"] = slide_overflow
-
-        # Only add overflow field if there is overflow
-        if overflow_data:
-            result["overflow"] = overflow_data
+        if "overflow" in fields:
+            overflow_data = {}
+
+            # Add frame overflow if present
+            if self.frame_overflow_bottom is not None:
+                overflow_data["frame"] = {"overflow_bottom": self.frame_overflow_bottom}
+
+            # Add slide overflow if present
+            slide_overflow = {}
+            if self.slide_overflow_right is not None:
+                slide_overflow["overflow_right"] = self.slide_overflow_right
+            if self.slide_overflow_bottom is not None:
+                slide_overflow["overflow_bottom"] = self.slide_overflow_bottom
+            if slide_overflow:
+                overflow_data["slide"] = slide_overflow
+
+            # Only add overflow field if there is overflow
+            if overflow_data:
+                result["overflow"] = overflow_data
 
         # Add overlap field if there are overlapping shapes
-        if self.overlapping_shapes:
+        if "overlap" in fields and self.overlapping_shapes:
             result["overlap"] = {"overlapping_shapes": self.overlapping_shapes}
 
         # Add warnings field if there are warnings
-        if self.warnings:
+        if "warnings" in fields and self.warnings:
             result["warnings"] = self.warnings
 
         # Add paragraphs after placeholder_type
-        result["paragraphs"] = [para.to_dict() for para in self.paragraphs]
+        if "paragraphs" in fields:
+            result["paragraphs"] = [para.to_dict() for para in self.paragraphs]
 
         return result
 
 
+def check_fields(fields: Optional[Collection[str]]) -> Collection[str]:
+    """Return the selected inventory fields (all by default).
+
+    Raises:
+        ValueError: If a field is not one of INVENTORY_FIELDS
+    """
+    if fields is None:
+        return INVENTORY_FIELDS
+    unknown = set(fields) - INVENTORY_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Unknown inventory fields: {', '.join(sorted(unknown))} "
+            f"(expected: {', '.join(sorted(INVENTORY_FIELDS))})"
+        )
+    return fields
+
+
 def is_valid_shape(shape: BaseShape) -> bool:
     """Check if a shape contains meaningful text content."""
     # Must have a text frame with content
@@ -783,8 +1058,8 @@ def collect_shapes_with_absolute_positions(
     if hasattr(shape, "shapes"):  # GroupShape
         result = []
         # Get this group's position
-        group_left = shape.left if hasattr(shape, "left") else 0
-        group_top = shape.top if hasattr(shape, "top") else 0
+        group_left = getattr(shape, "left", 0)
+        group_top = getattr(shape, "top", 0)
 
         # Calculate absolute position for this group
         abs_group_left = parent_left + group_left
@@ -802,8 +1077,8 @@ def collect_shapes_with_absolute_positions(
     # Regular shape - check if it has valid text
     if is_valid_shape(shape):
         # Calculate absolute position
-        shape_left = shape.left if hasattr(shape, "left") else 0
-        shape_top = shape.top if hasattr(shape, "top") else 0
+        shape_left = getattr(shape, "left", 0)
+        shape_top = getattr(shape, "top", 0)
 
         return [
             ShapeWithPosition(
@@ -879,6 +1154,121 @@ def calculate_overlap(
     return False, 0
 
 
+class ActiveIntervals:
+    """Set of vertical extents (top, bottom), queried for those overlapping a range.
+
+    Holds the rectangles that the sweep of find_overlaps() currently crosses.
+    Every extent that will be added is known upfront, which gives a static
+    segment tree over their endpoints: an extent is stored in O(log n) nodes,
+    and the extents containing a point are found on the path to its leaf.
+    overlapping() then costs O(log n + k) for k results. add() and remove()
+    also keep a sorted list of the active starts: O(log n) to find the place,
+    plus an O(n) shift of the list, a memmove that stays cheap next to the
+    comparisons the sweep saves.
+    """
+
+    def __init__(self, intervals: List[Tuple[float, float]]):
+        """
+        Args:
+            intervals: (start, end) of every extent, by index
+        """
+        self.intervals = intervals
+        self._coords = sorted({y for interval in intervals for y in interval})
+        self._size = 1
+        while self._size < len(self._coords):
+            self._size *= 2
+        # Node sets of the tree over the slots [coords[s], coords[s + 1])
+        self._nodes: List[set] = [set() for _ in range(2 * self._size)]
+        self._starts: List[Tuple[float, int]] = []  # Sorted (start, index), active
+
+    def add(self, i: int) -> None:
+        """Add the extent with index i."""
+        bisect.insort(self._starts, (self.intervals[i][0], i))
+        for node in self._nodes_covering(i):
+            node.add(i)
+
+    def remove(self, i: int) -> None:
+        """Remove the extent with index i, which must have been added."""
+        del self._starts[bisect.bisect_left(self._starts, (self.intervals[i][0], i))]
+        for node in self._nodes_covering(i):
+            node.discard(i)
+
+    def overlapping(self, lo: float, hi: float) -> Iterator[int]:
+        """Yield the index of every added extent with start < hi and end > lo."""
+        # Extents starting before lo and reaching past it cover the slot of lo
+        slot = bisect.bisect_right(self._coords, lo) - 1
+        if 0 <= slot < len(self._coords) - 1:
+            node = slot + self._size
+            while node:
+                for i in self._nodes[node]:
+                    if self.intervals[i][0] < lo:
+                        yield i
+                node //= 2
+        # Extents starting in [lo, hi)
+        first = bisect.bisect_left(self._starts, (lo, -1))
+        for k in range(first, len(self._starts)):
+            start, i = self._starts[k]
+            if start >= hi:
+                break
+            if self.intervals[i][1] > lo:
+                yield i
+
+    def _nodes_covering(self, i: int) -> Iterator[set]:
+        """Yield the tree nodes that together cover the slots of extent i."""
+        start, end = self.intervals[i]
+        lo = bisect.bisect_left(self._coords, start) + self._size
+        hi = bisect.bisect_left(self._coords, end) + self._size
+        while lo < hi:
+            if lo & 1:
+                yield self._nodes[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                yield self._nodes[hi]
+            lo //= 2
+            hi //= 2
+
+
+def find_overlaps(
+    rects: List[Tuple[float, float, float, float]], tolerance: float = 0.05
+) -> List[Tuple[int, int, float]]:
+    """Find every pair of overlapping rectangles with a sweep line.
+
+    Rectangles are swept from left to right. Each is compared only with those
+    whose horizontal extent still reaches the sweep line and whose vertical
+    extent overlaps its own (see ActiveIntervals), so it makes O(k) comparisons
+    for k such pairs, plus O(n log n) for the sweep and the queries, rather
+    than O(n^2) comparisons, also for stacks of full-width shapes. Adding and
+    removing active rects also shifts a sorted list, which is O(n) per rect
+    but only a memmove.
+
+    Args:
+        rects: (left, top, width, height) rectangles in inches
+        tolerance: Minimum overlap in inches, as in calculate_overlap()
+
+    Returns:
+        Sorted list of (i, j, overlap_area) with i < j, one per pair of
+        rectangles that calculate_overlap() considers overlapping
+    """
+    order = sorted(range(len(rects)), key=lambda i: rects[i][0])
+    ending: List[Tuple[float, int]] = []  # Heap of (right edge, index) of active rects
+    active = ActiveIntervals([(top, top + height) for _, top, _, height in rects])
+    pairs = []
+    for i in order:
+        left = rects[i][0]
+        # Rects ending before left + tolerance cannot overlap this or any later rect
+        while ending and ending[0][0] - left <= tolerance:
+            active.remove(heapq.heappop(ending)[1])
+        for j in active.overlapping(*active.intervals[i]):
+            overlaps, overlap_area = calculate_overlap(rects[j], rects[i], tolerance)
+            if overlaps:
+                pairs.append((min(i, j), max(i, j), overlap_area))
+        active.add(i)
+        heapq.heappush(ending, (rects[i][0] + rects[i][2], i))
+    pairs.sort()
+    return pairs
+
+
 def detect_overlaps(shapes: List[ShapeData]) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
@@ -888,31 +1278,22 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
     """
-    n = len(shapes)
-
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
-
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
-
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
+    for i, shape in enumerate(shapes):
+        # Ensure shape IDs are set
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
 
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
-
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+    rects = [(shape.left, shape.top, shape.width, shape.height) for shape in shapes]
+    for i, j, overlap_area in find_overlaps(rects):
+        # Add shape IDs with overlap area in square inches
+        shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+        shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
 
 
 def extract_text_inventory(
-    pptx_path: Path, prs: Optional[Any] = None, issues_only: bool = False
+    pptx_path: Path,
+    prs: Optional[Any] = None,
+    issues_only: bool = False,
+    fields: Optional[Collection[str]] = None,
 ) -> InventoryData:
     """Extract text content from all slides in a PowerPoint presentation.
 
@@ -920,96 +1301,268 @@ def extract_text_inventory(
         pptx_path: Path to the PowerPoint file
         prs: Optional Presentation object to use. If not provided, will load from pptx_path.
         issues_only: If True, only include shapes that have overflow or overlap issues
+        fields: Optional subset of INVENTORY_FIELDS the caller needs (default: all).
+            Overlap detection only runs for "overlap" (or issues_only); paragraph
+            data and frame overflow are computed when first accessed either way.
 
     Returns a nested dictionary: {slide-N: {shape-N: ShapeData}}
     Shapes are sorted by visual position (top-to-bottom, left-to-right).
     The ShapeData objects contain the full shape information and can be
     converted to dictionaries for JSON serialization using to_dict().
     """
+    fields = check_fields(fields)
     if prs is None:
         prs = Presentation(str(pptx_path))
     inventory: InventoryData = {}
 
     for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+        slide_inventory = extract_slide_inventory(slide, issues_only, fields)
+        if slide_inventory:
+            inventory[f"slide-{slide_idx}"] = slide_inventory
 
-        if not shapes_with_positions:
-            continue
+    return inventory
+
+
+def extract_slide_inventory(
+    slide: Any,
+    issues_only: bool = False,
+    fields: Optional[Collection[str]] = None,
+) -> Dict[str, ShapeData]:
+    """Extract the text shapes of one slide, as extract_text_inventory() does.
+
+    Returns:
+        Dict of shape-N -> ShapeData, sorted by visual position
+    """
+    fields = check_fields(fields)
+
+    # Collect all valid shapes from this slide with absolute positions
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    # Convert to ShapeData with absolute positions and slide reference
+    shape_data_list = [
+        ShapeData(
+            swp.shape,
+            swp.absolute_left,
+            swp.absolute_top,
+            slide,
+        )
+        for swp in shapes_with_positions
+    ]
+
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    # Detect overlaps using the stable shape IDs
+    if len(sorted_shapes) > 1 and ("overlap" in fields or issues_only):
+        detect_overlaps(sorted_shapes)
+
+    # Filter for issues only if requested (after overlap detection)
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
 
-        # Convert to ShapeData with absolute positions and slide reference
-        shape_data_list = [
-            ShapeData(
-                swp.shape,
-                swp.absolute_left,
-                swp.absolute_top,
-                slide,
+    # Create slide inventory using the stable shape IDs
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
+
+
+class InventoryCache:
+    """Inventories of slides stored on disk, keyed by the content of each slide.
+
+    An entry holds the full to_dict() of every text shape of one slide. Its key
+    hashes everything the inventory of the slide depends on: the XML of the
+    slide, its layout and its master, the slide size, this module and the
+    installed fonts. A slide is therefore analyzed again only after it (or what
+    it inherits from) changed, and entries are shared between presentations,
+    runs and the scripts using the inventory (inventory.py, replace.py and
+    thumbnail.py).
+
+    Empty <a:pPr/> and <a:rPr/> elements are ignored when hashing: python-pptx
+    adds them when the properties of a paragraph or run are read, so they do not
+    change the inventory, but would otherwise change the key of every slide
+    that has been analyzed in memory.
+
+    The directory is kept within INVENTORY_CACHE_MAX_AGE and
+    INVENTORY_CACHE_MAX_BYTES by prune_cache_dir().
+    """
+
+    _EMPTY_PROPERTIES = re.compile(rb"<a:(?:pPr|rPr)/>")
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            cache_dir: Directory of the entries (default: INVENTORY_CACHE_DIR)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else INVENTORY_CACHE_DIR
+        self._puts = 0
+
+    def slide_keys(self, prs: Any) -> List[str]:
+        """Return the cache key of every slide of a presentation, in slide order."""
+        base = hashlib.sha256(_analysis_fingerprint())
+        base.update(f"{prs.slide_width}x{prs.slide_height}".encode())
+
+        # Layouts and masters are shared by many slides: hash each one once
+        part_digests: Dict[Any, bytes] = {}
+
+        def part_digest(part: Any) -> bytes:
+            if part.partname not in part_digests:
+                blob = self._EMPTY_PROPERTIES.sub(b"", part.blob)
+                part_digests[part.partname] = hashlib.sha256(blob).digest()
+            return part_digests[part.partname]
+
+        keys = []
+        for slide in prs.slides:
+            key = base.copy()
+            layout = slide.slide_layout
+            for part in (layout.slide_master.part, layout.part, slide.part):
+                key.update(part_digest(part))
+            keys.append(key.hexdigest())
+        return keys
+
+    def get(self, key: str) -> Optional[Dict[str, ShapeDict]]:
+        """Return the shapes stored for a slide key, or None if there are none."""
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                shapes = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used for prune_cache_dir()
+        except OSError:
+            pass
+        return shapes
+
+    def put(self, key: str, shapes: Dict[str, ShapeDict]) -> None:
+        """Store the shapes of a slide; failing to write the cache is not an error."""
+        path = self.cache_dir / f"{key}.json"
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(shapes, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return
+
+        if self._puts % CACHE_PRUNE_INTERVAL == 0:
+            prune_cache_dir(
+                self.cache_dir,
+                "*.json",
+                INVENTORY_CACHE_MAX_AGE,
+                INVENTORY_CACHE_MAX_BYTES,
             )
-            for swp in shapes_with_positions
-        ]
+        self._puts += 1
 
-        # Sort by visual position and assign stable IDs in one step
-        sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
 
-        # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
-            detect_overlaps(sorted_shapes)
+@lru_cache(maxsize=None)
+def _analysis_fingerprint() -> bytes:
+    """Hash of this module and the installed fonts, part of every cache key."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(FontIndex.system().fingerprint().encode())
+    return digest.digest()
 
-        # Filter for issues only if requested (after overlap detection)
-        if issues_only:
-            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
 
-        if not sorted_shapes:
-            continue
+def select_fields(
+    shape_dict: ShapeDict, fields: Optional[Collection[str]] = None
+) -> ShapeDict:
+    """Return the keys of a full shape dict that belong to the selected fields."""
+    fields = check_fields(fields)
+    excluded = {
+        key for field, keys in FIELD_KEYS.items() if field not in fields for key in keys
+    }
+    return {key: value for key, value in shape_dict.items() if key not in excluded}
 
-        # Create slide inventory using the stable shape IDs
-        inventory[f"slide-{slide_idx}"] = {
-            shape_data.shape_id: shape_data for shape_data in sorted_shapes
-        }
 
-    return inventory
+def has_issues(shape_dict: ShapeDict) -> bool:
+    """Same as ShapeData.has_any_issues, for a shape dict with all fields."""
+    return any(key in shape_dict for key in ("overflow", "overlap", "warnings"))
 
 
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+def get_inventory_as_dict(
+    pptx_path: Path,
+    issues_only: bool = False,
+    fields: Optional[Collection[str]] = None,
+    prs: Optional[Any] = None,
+    cache: Optional[InventoryCache] = None,
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
     dictionaries instead of ShapeData objects, useful for testing and direct
     JSON serialization.
 
+    With a cache, slides whose key is in the cache are not analyzed at all. The
+    others are analyzed in full and stored, unless only some fields were
+    requested: then just those are computed, and nothing is stored.
+
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        fields: Optional subset of INVENTORY_FIELDS to include (default: all)
+        prs: Optional Presentation object to use. If not provided, will load from pptx_path.
+        cache: Optional InventoryCache to read and store slide inventories
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
-    inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
+    fields = check_fields(fields)
+    if prs is None:
+        prs = Presentation(str(pptx_path))
+    slide_keys = cache.slide_keys(prs) if cache else [None] * len(prs.slides)
+    complete = INVENTORY_FIELDS.issubset(fields)
 
-    # Convert ShapeData objects to dictionaries
     dict_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        dict_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
+    for slide_idx, (slide, key) in enumerate(zip(prs.slides, slide_keys)):
+        shapes = cache.get(key) if cache else None
+        if shapes is None and cache and complete:
+            shapes = {
+                shape_key: shape_data.to_dict()
+                for shape_key, shape_data in extract_slide_inventory(slide).items()
+            }
+            cache.put(key, shapes)
+
+        if shapes is None:
+            # Convert ShapeData objects to dictionaries
+            shapes = {
+                shape_key: shape_data.to_dict(fields)
+                for shape_key, shape_data in extract_slide_inventory(
+                    slide, issues_only, fields
+                ).items()
+            }
+        else:
+            # A full inventory of the slide: keep what was asked for
+            shapes = {
+                shape_key: select_fields(shape_dict, fields)
+                for shape_key, shape_dict in shapes.items()
+                if not issues_only or has_issues(shape_dict)
+            }
+
+        if shapes:
+            dict_inventory[f"slide-{slide_idx}"] = shapes
 
     return dict_inventory
 
 
-def save_inventory(inventory: InventoryData, output_path: Path) -> None:
+def save_inventory(
+    inventory: Union[InventoryData, InventoryDict], output_path: Path
+) -> None:
     """Save inventory to JSON file with proper formatting.
 
-    Converts ShapeData objects to dictionaries for JSON serialization.
+    Converts ShapeData objects to dictionaries for JSON serialization; an
+    inventory from get_inventory_as_dict() is written as is.
     """
     # Convert ShapeData objects to dictionaries
     json_inventory: InventoryDict = {}
     for slide_key, shapes in inventory.items():
         json_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
+            shape_key: (
+                shape_data.to_dict() if isinstance(shape_data, ShapeData) else shape_data
+            )
+            for shape_key, shape_data in shapes.items()
         }
 
     with open(output_path, "w", encoding="utf-8") as f:
@@ -10,13 +10,30 @@ Slides can be repeated (e.g., 34 appears twice).
 """
 
 import argparse
-import shutil
+import hashlib
+import random
+import re
 import sys
 from copy import deepcopy
 from pathlib import Path
 
-import six
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import XmlPart, _Relationship
+from pptx.opc.packuri import PackURI
+from pptx.opc.serialized import _ContentTypesItem
+from pptx.parts.slide import SlidePart
+
+# Package (raw-copying zip writer) lives with the shared OOXML tools
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ooxml" / "scripts"))
+from package import Package  # noqa: E402
+
+# Splits a partname into prefix, number and extension, e.g. /ppt/charts/chart + 3 + .xml
+PARTNAME_NUMBER = re.compile(r"^(.*?)(\d*)((?:\.[^./]*)?)$")
+P14_CREATION_ID = "{http://schemas.microsoft.com/office/powerpoint/2010/main}creationId"
+MAX_SLIDE_ID = 2147483647
 
 
 def main():
@@ -72,78 +89,193 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
         sys.exit(1)
 
 
+class SlideCloner:
+    """
+    Clone slides of a presentation, together with the parts they own.
+
+    A clone is a deep copy of the whole slide XML (shapes, background,
+    transitions and timing) in a new slide part. Its relationships keep the
+    rIds of the original, so the XML needs no rewriting:
+    - targets in SHARED_RELATIONSHIPS (media, the layout, linked slides) are
+      shared with the original; media parts with identical content are shared
+      as one part
+    - notes and comments (SKIPPED_RELATIONSHIPS) stay with the original
+    - every other part (charts with their workbooks and styles, SmartArt
+      diagram parts, embedded objects, tags) is copied, recursively, so that
+      editing a clone never changes the original
+
+    Part names and slide IDs are allocated from counters kept by the cloner,
+    so clone_many() costs the same for every copy whatever the size of the
+    presentation. Parts added to the presentation by other means while a
+    cloner is in use may get conflicting names; use a new cloner then.
+    """
+
+    MEDIA_RELATIONSHIPS = {
+        RT.IMAGE,
+        RT.MEDIA,
+        RT.AUDIO,
+        RT.VIDEO,
+        "http://schemas.microsoft.com/office/2007/relationships/media",
+        "http://schemas.microsoft.com/office/2007/relationships/hdphoto",
+    }
+    SHARED_RELATIONSHIPS = MEDIA_RELATIONSHIPS | {
+        RT.SLIDE_LAYOUT,
+        RT.SLIDE,
+        RT.SLIDE_MASTER,
+        RT.NOTES_MASTER,
+        RT.THEME,
+    }
+    SKIPPED_RELATIONSHIPS = {RT.NOTES_SLIDE, RT.COMMENTS}
+
+    def __init__(self, pres):
+        self.pres = pres
+        package = pres.part.package
+        self._used_partnames = {str(part.partname) for part in package.iter_parts()}
+        self._next_numbers = {}  # (prefix, extension) -> first number worth trying
+        self._media = {}  # SHA-1 of media content -> shared part
+        self._media_digests = {}  # Partname of a media part -> SHA-1 of its content
+
+    def clone(self, index):
+        """Append a clone of the slide at index; return the new Slide."""
+        return self.clone_many(index, 1)[0]
+
+    def clone_many(self, index, n):
+        """Append n clones of the slide at index; return the new Slides."""
+        source = self.pres.slides[index].part
+        sld_id_lst = self.pres.slides._sldIdLst
+        next_id = sld_id_lst._next_id
+        rels = [
+            (rId, rel)
+            for rId, rel in source.rels.items()
+            if rel.reltype not in self.SKIPPED_RELATIONSHIPS
+        ]
+
+        slides = []
+        for _ in range(n):
+            element = deepcopy(source._element)
+            for creation_id in element.iter(P14_CREATION_ID):
+                # Identifies the slide, e.g. when merging edits; PowerPoint gives
+                # duplicated slides a new one too
+                creation_id.set("val", str(random.getrandbits(32)))
+            slide_part = SlidePart(
+                self._new_partname(source.partname),
+                source.content_type,
+                source.package,
+                element,
+            )
+            self._copy_rels(rels, slide_part, {})
+
+            rId = self.pres.part.rels._add_relationship(RT.SLIDE, slide_part)
+            if next_id > MAX_SLIDE_ID:
+                sld_id_lst.add_sldId(rId)
+            else:
+                sld_id_lst._add_sldId(id=next_id, rId=rId)
+                next_id += 1
+            slides.append(slide_part.slide)
+        return slides
+
+    def _copy_rels(self, rels, part, copies):
+        """Add the (rId, _Relationship) pairs rels to part, under the same rIds."""
+        for rId, rel in rels:
+            target_mode = RTM.INTERNAL
+            if rel.is_external:
+                target, target_mode = rel.target_ref, RTM.EXTERNAL
+            elif rel.reltype in self.MEDIA_RELATIONSHIPS:
+                target = self._shared_media(rel.target_part)
+            elif rel.reltype in self.SHARED_RELATIONSHIPS:
+                target = rel.target_part
+            else:
+                target = self._copy_part(rel.target_part, copies)
+            part.rels._rels[rId] = _Relationship(
+                part.rels._base_uri, rId, rel.reltype, target_mode, target
+            )
+
+    def _copy_part(self, part, copies):
+        """Return a copy of part and the parts it owns, each copied once per clone."""
+        if part.partname in copies:
+            return copies[part.partname]
+        partname = self._new_partname(part.partname)
+        if isinstance(part, XmlPart):
+            copy = type(part)(
+                partname, part.content_type, part.package, deepcopy(part._element)
+            )
+        else:
+            copy = type(part)(partname, part.content_type, part.package, part.blob)
+        copies[part.partname] = copy
+        self._copy_rels(
+            [
+                (rId, rel)
+                for rId, rel in part.rels.items()
+                if rel.reltype not in self.SKIPPED_RELATIONSHIPS
+            ],
+            copy,
+            copies,
+        )
+        return copy
+
+    def _shared_media(self, part):
+        """Return the part shared by all clones for media with the content of part."""
+        if part.partname not in self._media_digests:
+            self._media_digests[part.partname] = hashlib.sha1(part.blob).digest()
+        return self._media.setdefault(self._media_digests[part.partname], part)
+
+    def _new_partname(self, like):
+        """Return an unused partname numbered like an existing one, e.g. chart3.xml."""
+        prefix, _, extension = PARTNAME_NUMBER.match(str(like)).groups()
+        number = self._next_numbers.get((prefix, extension), 1)
+        while f"{prefix}{number}{extension}" in self._used_partnames:
+            number += 1
+        self._next_numbers[(prefix, extension)] = number + 1
+        partname = f"{prefix}{number}{extension}"
+        self._used_partnames.add(partname)
+        return PackURI(partname)
+
+
 def duplicate_slide(pres, index):
     """Duplicate a slide in the presentation."""
-    source = pres.slides[index]
-
-    # Use source's layout to preserve formatting
-    new_slide = pres.slides.add_slide(source.slide_layout)
-
-    # Collect all image and media relationships from the source slide
-    image_rels = {}
-    for rel_id, rel in six.iteritems(source.part.rels):
-        if "image" in rel.reltype or "media" in rel.reltype:
-            image_rels[rel_id] = rel
-
-    # CRITICAL: Clear placeholder shapes to avoid duplicates
-    for shape in new_slide.shapes:
-        sp = shape.element
-        sp.getparent().remove(sp)
-
-    # Copy all shapes from source
-    for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
-
-        # Handle picture shapes - need to update the blip reference
-        # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
-                )
+    return SlideCloner(pres).clone(index)
 
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
-        try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
 
-    return new_slide
+def delete_slides(pres, sld_ids):
+    """Delete slides from the presentation, given their p:sldId elements.
 
+    Relationships to the deleted slides are dropped at once, after counting the
+    remaining references in a single pass (Part.drop_rel() would rescan the
+    presentation XML for every slide).
+    """
+    sld_id_lst = pres.slides._sldIdLst
+    for sld_id in sld_ids:
+        sld_id_lst.remove(sld_id)
+    referenced = set(pres.part._element.xpath("//@r:id"))
+    for sld_id in sld_ids:
+        if sld_id.rId not in referenced:
+            pres.part.rels.pop(sld_id.rId)
 
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
 
+def plan_slide_order(slide_sequence):
+    """
+    Decide which copy of a template slide fills each position of the sequence.
 
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
+    The first occurrence of a template slide uses the slide itself, each later
+    occurrence one of its duplicates. Computed in one pass over the sequence.
 
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
+    Args:
+        slide_sequence: List of slide indices (0-based) to include
 
-    # Insert at target position
-    slides.insert(target_index, slide_element)
+    Returns:
+        tuple: (duplicates, order) where duplicates maps each repeated template
+        index to the number of duplicates it needs, in order of first
+        occurrence, and order holds one (template_idx, copy) pair per position,
+        copy 0 being the original and copy k its k-th duplicate
+    """
+    uses = {}  # template_idx -> occurrences so far
+    order = []
+    for template_idx in slide_sequence:
+        copy = uses.get(template_idx, 0)
+        order.append((template_idx, copy))
+        uses[template_idx] = copy + 1
+    duplicates = {idx: count - 1 for idx, count in uses.items() if count > 1}
+    return duplicates, order
 
 
 def rearrange_presentation(template_path, output_path, slide_sequence):
@@ -155,12 +287,8 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
         output_path: Path for output PPTX file
         slide_sequence: List of slide indices (0-based) to include
     """
-    # Copy template to preserve dimensions and theme
-    if template_path != output_path:
-        shutil.copy2(template_path, output_path)
-        prs = Presentation(output_path)
-    else:
-        prs = Presentation(template_path)
+    # Start from the template to preserve dimensions and theme
+    prs = Presentation(template_path)
 
     total_slides = len(prs.slides)
 
@@ -169,63 +297,71 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
         if idx < 0 or idx >= total_slides:
             raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
 
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
+    duplicates, order = plan_slide_order(slide_sequence)
+    sld_id_lst = prs.slides._sldIdLst
+    template_sld_ids = list(sld_id_lst)
 
-    # Step 1: DUPLICATE repeated slides
+    # Step 1: DUPLICATE repeated slides; copies[idx] lists the p:sldId elements
+    # of a template slide and then of its duplicates
     print(f"Processing {len(slide_sequence)} slides from template...")
-    for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
-            print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
-        else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
-            print(f"  [{i}] Using original slide {template_idx}")
-
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
+    copies = {idx: [template_sld_ids[idx]] for idx, _ in order}
+    cloner = SlideCloner(prs)
+    for template_idx, count in duplicates.items():
+        print(f"  Slide {template_idx}: creating {count} duplicate(s)")
+        cloner.clone_many(template_idx, count)
+        copies[template_idx].extend(sld_id_lst[-count:])
+
+    # Step 2: DELETE unwanted slides
+    final_sld_ids = [copies[idx][copy] for idx, copy in order]
+    kept = set(final_sld_ids)
+    unused = [sld_id for sld_id in sld_id_lst if sld_id not in kept]
+    print(f"\nDeleting {len(unused)} unused slides...")
+    delete_slides(prs, unused)
+
+    # Step 3: REORDER to final sequence, assigning the list once
+    print(f"Reordering {len(final_sld_ids)} slides to final sequence...")
+    sld_id_lst[:] = final_sld_ids
 
     # Save the presentation
-    prs.save(output_path)
+    save_presentation(prs, template_path, output_path)
     print(f"\nSaved rearranged presentation to: {output_path}")
     print(f"Final presentation has {len(prs.slides)} slides")
 
 
+def save_presentation(prs, template_path, output_path):
+    """
+    Save a presentation opened from template_path, reusing the template's zip members.
+
+    Presentation.save() recompresses every part, including all images and
+    media. Here the parts are written through Package instead: members whose
+    content is unchanged from the template are copied still compressed, so
+    only the rewritten XML parts are compressed again.
+
+    Args:
+        prs: Presentation opened from template_path and modified in memory
+        template_path: Path to the PPTX file prs was opened from
+        output_path: Path for the output PPTX file (may be template_path)
+    """
+    package = prs.part.package
+    parts = list(package.iter_parts())
+    with Package(template_path) as output:
+        written = {
+            "[Content_Types].xml": serialize_part_xml(_ContentTypesItem.xml_for(parts)),
+            "_rels/.rels": package._rels.xml,
+        }
+        for part in parts:
+            written[part.partname.lstrip("/")] = part.blob
+            if part._rels:
+                written[part.partname.rels_uri.lstrip("/")] = part.rels.xml
+
+        for name, data in written.items():
+            output.write(name, data)
+        # Parts no longer referenced, e.g. deleted slides
+        for name in output.parts():
+            if name not in written:
+                output.delete(name)
+        output.save(output_path)
+
+
 if __name__ == "__main__":
     main()
@@ -7,14 +7,24 @@ Usage:
 The replacements JSON should have the structure output by inventory.py.
 ALL text shapes identified by inventory.py will have their text cleared
 unless "paragraphs" is specified in the replacements for that shape.
+
+Text overflow is checked with the inventory cache shared with inventory.py:
+only slides whose content is new are analyzed, before and after replacing.
 """
 
+import io
 import json
 import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-from inventory import InventoryData, extract_text_inventory
+from inventory import (
+    InventoryCache,
+    InventoryData,
+    InventoryDict,
+    extract_text_inventory,
+    get_inventory_as_dict,
+)
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
@@ -140,21 +150,23 @@ def apply_font_properties(run, para_data: Dict[str, Any]):
             print(f"  WARNING: Unknown theme color name '{theme_name}'")
 
 
-def detect_frame_overflow(inventory: InventoryData) -> Dict[str, Dict[str, float]]:
+def detect_frame_overflow(inventory: InventoryDict) -> Dict[str, Dict[str, float]]:
     """Detect text overflow in shapes (text exceeding shape bounds).
 
+    Takes an inventory as returned by get_inventory_as_dict().
     Returns dict of slide_key -> shape_key -> overflow_inches.
     Only includes shapes that have text overflow.
     """
     overflow_map = {}
 
     for slide_key, shapes_dict in inventory.items():
-        for shape_key, shape_data in shapes_dict.items():
+        for shape_key, shape_dict in shapes_dict.items():
             # Check for frame overflow (text exceeding shape bounds)
-            if shape_data.frame_overflow_bottom is not None:
+            frame_overflow = shape_dict.get("overflow", {}).get("frame", {})
+            if "overflow_bottom" in frame_overflow:
                 if slide_key not in overflow_map:
                     overflow_map[slide_key] = {}
-                overflow_map[slide_key][shape_key] = shape_data.frame_overflow_bottom
+                overflow_map[slide_key][shape_key] = frame_overflow["overflow_bottom"]
 
     return overflow_map
 
@@ -211,24 +223,8 @@ def check_duplicate_keys(pairs):
     return result
 
 
-def apply_replacements(pptx_file: str, json_file: str, output_file: str):
-    """Apply text replacements from JSON to PowerPoint presentation."""
-
-    # Load presentation
-    prs = Presentation(pptx_file)
-
-    # Get inventory of all text shapes (returns ShapeData objects)
-    # Pass prs to use same Presentation instance
-    inventory = extract_text_inventory(Path(pptx_file), prs)
-
-    # Detect text overflow in original presentation
-    original_overflow = detect_frame_overflow(inventory)
-
-    # Load replacement data with duplicate key detection
-    with open(json_file, "r") as f:
-        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
-
-    # Validate replacements
+def check_replacements(inventory: InventoryData, replacements: Dict):
+    """Validate replacements against the inventory; print and raise on errors."""
     errors = validate_replacements(inventory, replacements)
     if errors:
         print("ERROR: Invalid shapes in replacement JSON:")
@@ -240,10 +236,13 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
         )
         raise ValueError(f"Found {len(errors)} validation error(s)")
 
-    # Track statistics
-    shapes_processed = 0
-    shapes_cleared = 0
-    shapes_replaced = 0
+
+def replace_text(prs, inventory: InventoryData, replacements: Dict) -> Dict[str, int]:
+    """Clear every shape of the inventory and fill in the replacement paragraphs.
+
+    Returns counts of the shapes processed, cleared and replaced.
+    """
+    stats = {"processed": 0, "cleared": 0, "replaced": 0}
 
     # Process each slide from inventory
     for slide_key, shapes_dict in inventory.items():
@@ -258,7 +257,7 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
 
         # Process each shape from inventory
         for shape_key, shape_data in shapes_dict.items():
-            shapes_processed += 1
+            stats["processed"] += 1
 
             # Get the shape directly from ShapeData
             shape = shape_data.shape
@@ -270,14 +269,14 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
             text_frame = shape.text_frame  # type: ignore
 
             text_frame.clear()  # type: ignore
-            shapes_cleared += 1
+            stats["cleared"] += 1
 
             # Check for replacement paragraphs
             replacement_shape_data = replacements.get(slide_key, {}).get(shape_key, {})
             if "paragraphs" not in replacement_shape_data:
                 continue
 
-            shapes_replaced += 1
+            stats["replaced"] += 1
 
             # Add replacement paragraphs
             for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
@@ -288,20 +287,18 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
 
                 apply_paragraph_properties(p, para_data)
 
-    # Check for issues after replacements
-    # Save to a temporary file and reload to avoid modifying the presentation during inventory
-    # (extract_text_inventory accesses font.color which adds empty <a:solidFill/> elements)
-    import tempfile
+    return stats
 
-    with tempfile.NamedTemporaryFile(suffix=".pptx", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        prs.save(str(tmp_path))
 
-    try:
-        updated_inventory = extract_text_inventory(tmp_path)
-        updated_overflow = detect_frame_overflow(updated_inventory)
-    finally:
-        tmp_path.unlink()  # Clean up temp file
+def check_output(
+    original_overflow: Dict[str, Dict[str, float]], updated_inventory: InventoryDict
+):
+    """Compare the replaced inventory with the original; print and raise on issues.
+
+    Fails if the text overflow of any shape got worse or if any shape has
+    formatting warnings.
+    """
+    updated_overflow = detect_frame_overflow(updated_inventory)
 
     # Check if any text overflow got worse
     overflow_errors = []
@@ -321,10 +318,9 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     # Collect warnings from updated shapes
     warnings = []
     for slide_key, shapes_dict in updated_inventory.items():
-        for shape_key, shape_data in shapes_dict.items():
-            if shape_data.warnings:
-                for warning in shape_data.warnings:
-                    warnings.append(f"{slide_key}/{shape_key}: {warning}")
+        for shape_key, shape_dict in shapes_dict.items():
+            for warning in shape_dict.get("warnings", []):
+                warnings.append(f"{slide_key}/{shape_key}: {warning}")
 
     # Fail if there are any issues
     if overflow_errors or warnings:
@@ -342,15 +338,54 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
             f"Found {len(overflow_errors)} overflow error(s) and {len(warnings)} warning(s)"
         )
 
+
+def apply_replacements(pptx_file: str, json_file: str, output_file: str):
+    """Apply text replacements from JSON to PowerPoint presentation."""
+
+    # Load presentation
+    prs = Presentation(pptx_file)
+    cache = InventoryCache()
+
+    # Get inventory of all text shapes (returns ShapeData objects)
+    # Pass prs to use same Presentation instance; applying the replacements
+    # only needs the shapes, not the overflow and overlap analysis
+    inventory = extract_text_inventory(Path(pptx_file), prs, fields={"position"})
+
+    # Detect text overflow in original presentation. It is analyzed in its own
+    # Presentation instance, as reading paragraph properties adds empty
+    # elements to the XML, and only for slides that are not in the cache
+    original_overflow = detect_frame_overflow(
+        get_inventory_as_dict(Path(pptx_file), cache=cache)
+    )
+
+    # Load replacement data with duplicate key detection
+    with open(json_file, "r") as f:
+        replacements = json.load(f, object_pairs_hook=check_duplicate_keys)
+
+    # Validate replacements
+    check_replacements(inventory, replacements)
+
+    stats = replace_text(prs, inventory, replacements)
+
+    # Check for issues after replacements
+    # Analyze a reloaded copy to avoid modifying the presentation during inventory;
+    # slides left as they were (or as in an earlier run) come from the cache
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    check_output(
+        original_overflow,
+        get_inventory_as_dict(Path(output_file), prs=Presentation(buffer), cache=cache),
+    )
+
     # Save the presentation
     prs.save(output_file)
 
     # Report results
     print(f"Saved updated presentation to: {output_file}")
     print(f"Processed {len(prs.slides)} slides")
-    print(f"  - Shapes processed: {shapes_processed}")
-    print(f"  - Shapes cleared: {shapes_cleared}")
-    print(f"  - Shapes replaced: {shapes_replaced}")
+    print(f"  - Shapes processed: {stats['processed']}")
+    print(f"  - Shapes cleared: {stats['cleared']}")
+    print(f"  - Shapes replaced: {stats['replaced']}")
 
 
 def main():
@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""Fill one PowerPoint template with many replacement payloads.
+
+Batch mode of replace.py, for generating many decks from one template. Every
+worker process parses the template and takes its inventory once, and the
+overflow of the template is analyzed once for the whole batch. Each payload
+is then applied as replace.py does:
+- the text of the inventoried shapes is restored from pristine copies taken
+  when the template was parsed, instead of parsing the template again
+- the replacements are validated and applied with replace.py's functions
+- the overflow check compares the filled slides with the template's overflow,
+  analyzing only slides whose content is not in the inventory cache
+- the output is written straight from the template file: only the slides with
+  text shapes are serialized, every other part is copied as its
+  still-compressed bytes (see ooxml/scripts/package.py)
+
+A payload that is invalid or fails the checks is recorded in the report and
+produces no output; the other decks are not affected. A worker that dies
+fails only the deck it was filling: the pool is restarted and the other
+payloads are filled as usual.
+
+Usage:
+    python replace_batch.py <template.pptx> <payloads> <output_dir> [--workers N] [--no-cache]
+
+<payloads> is either:
+- a directory of replacement JSON files (as for replace.py): <name>.json is
+  written to <output_dir>/<name>.pptx
+- a JSON Lines file, or - for standard input, with one replacement object per
+  line: line N is written to <output_dir>/deck-<N>.pptx, or to the path given
+  by an "output" key of the object
+
+The report is streamed to <output_dir>/batch-report.jsonl, one JSON object per
+deck in completion order:
+    {"input": ..., "output": ..., "status": "ok" | "failed",
+     "stage": None | "input" | "replace" | "check" | "save" | "worker",
+     "error": None | "ValueError: ...",
+     "log": stdout and stderr of a failure,
+     "timings": {"replace": s, "check": s, "save": s, "total": s}}
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from inventory import InventoryCache, extract_text_inventory, get_inventory_as_dict
+from pptx import Presentation
+from pptx.opc.oxml import serialize_part_xml
+from replace import (
+    check_duplicate_keys,
+    check_output,
+    check_replacements,
+    detect_frame_overflow,
+    replace_text,
+)
+
+# Add the ooxml scripts directory for the zip-native Package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ooxml" / "scripts"))
+from package import Package  # noqa: E402
+
+REPORT_NAME = "batch-report.jsonl"
+PROGRESS_INTERVAL = 5.0  # Seconds between throughput reports
+STAGES = ("replace", "check", "save")
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(
+        description="Fill a PowerPoint template with many replacement JSON payloads.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python replace_batch.py template.pptx payloads/ decks/
+    Writes decks/<name>.pptx for every payloads/<name>.json
+
+  generate-payloads | python replace_batch.py template.pptx - decks/ --workers 8
+    Fills one deck per line of JSON read from standard input
+
+Each payload has the structure used by replace.py. Failed decks are listed
+in decks/batch-report.jsonl with the stage and the error.
+        """,
+    )
+    parser.add_argument("template", help="Template PowerPoint file (.pptx)")
+    parser.add_argument(
+        "payloads",
+        help="Directory of replacement JSON files, JSON Lines file, or - for stdin",
+    )
+    parser.add_argument("output_dir", help="Directory for the filled decks")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Analyze every slide instead of reusing cached slide inventories",
+    )
+    args = parser.parse_args()
+
+    template_path = Path(args.template)
+    if not template_path.exists():
+        print(f"Error: Template file '{template_path}' not found")
+        sys.exit(1)
+    if args.payloads != "-" and not Path(args.payloads).exists():
+        print(f"Error: Payloads '{args.payloads}' not found")
+        sys.exit(1)
+
+    try:
+        results = fill_template(
+            template_path,
+            sys.stdin if args.payloads == "-" else args.payloads,
+            args.output_dir,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+        )
+    except Exception as e:
+        print(f"Error filling template: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
+
+    if any(result["status"] != "ok" for result in results):
+        sys.exit(1)
+
+
+class TemplateFiller:
+    """A template parsed once, filled with one payload after another.
+
+    replace_text() only changes the text bodies of the inventoried shapes, so
+    restoring those from pristine copies returns the presentation to the
+    template. The overflow analysis of a filled deck runs on the same
+    Presentation after its slides have been serialized for the output: the
+    empty properties it adds to the XML are discarded by the next restore.
+    """
+
+    def __init__(
+        self,
+        template_path: Path,
+        original_overflow: Optional[Dict[str, Dict[str, float]]] = None,
+        cache: Optional[InventoryCache] = None,
+    ):
+        """
+        Args:
+            template_path: Path to the template PowerPoint file
+            original_overflow: template_overflow() of the template, if known
+            cache: Optional InventoryCache for the overflow analysis
+        """
+        self.template_path = Path(template_path)
+        self.cache = cache
+        if original_overflow is None:
+            original_overflow = template_overflow(self.template_path, cache)
+        self.original_overflow = original_overflow
+
+        self.prs = Presentation(str(self.template_path))
+        # Read before the slides are accessed: python-pptx then renames the
+        # slide parts in slide order, which may differ from the file
+        member_names = {
+            part: part.partname.lstrip("/")
+            for part in self.prs.part.package.iter_parts()
+        }
+        self.inventory = extract_text_inventory(
+            self.template_path, self.prs, fields={"position"}
+        )
+
+        self._text_bodies: List[Tuple[Any, Any]] = []  # (p:sp, pristine p:txBody)
+        self._slide_parts: Dict[str, Any] = {}  # Member name -> part, text slides
+        for slide_key, shapes in self.inventory.items():
+            slide_part = self.prs.slides[int(slide_key.split("-")[1])].part
+            self._slide_parts[member_names[slide_part]] = slide_part
+            for shape_data in shapes.values():
+                sp = shape_data.shape._element  # type: ignore
+                self._text_bodies.append((sp, deepcopy(sp.txBody)))
+
+        self.package = Package(self.template_path)
+
+    def close(self):
+        """Close the template file."""
+        self.package.close()
+
+    def replace(self, replacements: Dict) -> Dict[str, int]:
+        """Restore the template text, then validate and apply replacements.
+
+        Returns:
+            The shape counts of replace_text()
+        """
+        for sp, text_body in self._text_bodies:
+            sp.replace(sp.txBody, deepcopy(text_body))
+        check_replacements(self.inventory, replacements)
+        return replace_text(self.prs, self.inventory, replacements)
+
+    def check(self) -> Dict[str, bytes]:
+        """Check the replaced slides for worse overflow and formatting warnings.
+
+        Returns:
+            The XML of every slide with text shapes, by zip member name,
+            serialized before the analysis changes it
+        """
+        slides = {
+            name: serialize_part_xml(part._element)
+            for name, part in self._slide_parts.items()
+        }
+        check_output(
+            self.original_overflow,
+            get_inventory_as_dict(self.template_path, prs=self.prs, cache=self.cache),
+        )
+        return slides
+
+    def save(self, slides: Dict[str, bytes], output: Path):
+        """Write the template with the slides returned by check() to output."""
+        for name, blob in slides.items():
+            self.package.write(name, blob)
+        self.package.save(output)
+
+
+def template_overflow(
+    template_path: Path, cache: Optional[InventoryCache] = None
+) -> Dict[str, Dict[str, float]]:
+    """Return the frame overflow of the template, as replace.py measures it."""
+    inventory = get_inventory_as_dict(Path(template_path), cache=cache)
+    return detect_frame_overflow(inventory)
+
+
+def fill_deck(filler: TemplateFiller, name: str, replacements: Dict, output: Path):
+    """
+    Fill one deck from the template and save it to output.
+
+    Exceptions are caught and recorded, so one bad payload cannot abort a batch.
+
+    Returns:
+        dict: The report entry for this deck
+    """
+    result = _new_result(name, output)
+    timings = result["timings"]
+    started = time.perf_counter()
+    log = io.StringIO()
+    stage = None
+
+    @contextlib.contextmanager
+    def timed(name):
+        nonlocal stage
+        stage = name
+        stage_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[name] = round(time.perf_counter() - stage_started, 4)
+
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            with timed("replace"):
+                filler.replace(replacements)
+            with timed("check"):
+                slides = filler.check()
+            with timed("save"):
+                filler.save(slides, output)
+        result["status"] = "ok"
+    except Exception as e:
+        result.update(stage=stage, error=f"{type(e).__name__}: {e}", log=log.getvalue())
+    timings["total"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def read_payloads(payloads) -> Iterator[Tuple[str, str, Any, Optional[str]]]:
+    """
+    Yield (input name, output name, replacements, error) for each payload.
+
+    Args:
+        payloads: A directory of .json files, a JSON Lines file or an open
+            text stream of JSON Lines (read as the batch proceeds)
+
+    error is set, and replacements None, if the payload could not be read.
+    """
+    if isinstance(payloads, (str, os.PathLike)) and Path(payloads).is_dir():
+        for path in sorted(Path(payloads).glob("*.json")):
+            try:
+                replacements = json.loads(
+                    path.read_text(), object_pairs_hook=check_duplicate_keys
+                )
+                yield str(path), f"{path.stem}.pptx", replacements, None
+            except (OSError, ValueError) as e:
+                yield str(path), f"{path.stem}.pptx", None, f"{type(e).__name__}: {e}"
+        return
+
+    with contextlib.ExitStack() as stack:
+        if isinstance(payloads, (str, os.PathLike)):
+            source = str(payloads)
+            lines = stack.enter_context(open(payloads, encoding="utf-8"))
+        else:
+            source = getattr(payloads, "name", "<stream>")
+            lines = payloads
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            name, output_name = f"{source}:{line_number}", f"deck-{line_number}.pptx"
+            try:
+                replacements = json.loads(line, object_pairs_hook=check_duplicate_keys)
+                if not isinstance(replacements, dict):
+                    raise ValueError("Payload is not a JSON object")
+                output_name = str(replacements.pop("output", output_name))
+                yield name, output_name, replacements, None
+            except ValueError as e:
+                yield name, output_name, None, f"{type(e).__name__}: {e}"
+
+
+def fill_template(
+    template_path: Path,
+    payloads,
+    output_dir: Path,
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> List[Dict]:
+    """
+    Fill the template with every payload and save the decks into output_dir.
+
+    Args:
+        template_path: Path to the template PowerPoint file
+        payloads: See read_payloads()
+        output_dir: Directory for the decks and the report
+        workers: Number of worker processes (default: CPU count). With 1, all
+            decks are filled in this process.
+        use_cache: Whether the overflow analysis uses the InventoryCache
+
+    Returns:
+        list: One report entry (a dict, see the module docstring) per payload,
+        in payload order
+    """
+    template_path = Path(template_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    cache = InventoryCache() if use_cache else None
+
+    started = time.perf_counter()
+    original_overflow = template_overflow(template_path, cache)
+    print(f"Analyzed template {template_path} in {time.perf_counter() - started:.2f}s")
+
+    results: Dict[int, Dict] = {}
+    # Future -> job: (index, name, replacements, output), kept to submit again
+    pending: Dict[Any, Tuple[int, str, Dict, Path]] = {}
+    lost: List[Tuple[int, str, Dict, Path]] = []  # Jobs of a broken pool
+    retry: Deque[Tuple[int, str, Dict, Path]] = deque()  # Jobs to submit again
+    stage_totals = dict.fromkeys(STAGES, 0.0)
+    last_report = time.perf_counter()
+
+    def report_throughput(final=False):
+        elapsed = time.perf_counter() - started
+        failed = sum(result["status"] != "ok" for result in results.values())
+        rate = len(results) / elapsed if elapsed else 0.0
+        print(
+            f"{'Filled' if final else '  ...'} {len(results)} decks "
+            f"({failed} failed) in {elapsed:.1f}s: {rate:.1f} decks/s"
+        )
+
+    def start_pool(size):
+        return ProcessPoolExecutor(
+            max_workers=size,
+            initializer=_start_worker,
+            initargs=(template_path, original_overflow, use_cache),
+        )
+
+    with open(output_dir / REPORT_NAME, "w") as report, contextlib.ExitStack() as stack:
+
+        def record(index, result):
+            nonlocal last_report
+            results[index] = result
+            for stage in STAGES:
+                stage_totals[stage] += result["timings"].get(stage, 0.0)
+            report.write(json.dumps(result) + "\n")
+            report.flush()
+            if time.perf_counter() - last_report >= PROGRESS_INTERVAL:
+                last_report = time.perf_counter()
+                report_throughput()
+
+        def finish(future):
+            job = pending.pop(future)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                lost.append(job)
+                return
+            except Exception as e:
+                # The worker could not load the template
+                result = _worker_failure(job, e)
+            record(job[0], result)
+
+        def restart():
+            # A worker died and took the pool down with it, failing every deck
+            # still in the pool. The pool hands out payloads in order and at
+            # most workers + 1 at a time, so the one that crashed is among the
+            # first lost: fill each of those in a process of its own, so that
+            # a repeated crash fails only its own deck, and submit the others
+            # again to a new pool.
+            nonlocal executor
+            executor.shutdown()
+            for future in list(pending):
+                finish(future)
+            jobs = sorted(lost, key=lambda job: job[0])
+            lost.clear()
+            _fill_alone(jobs[: workers + 1], start_pool, record)
+            retry.extendleft(reversed(jobs[workers + 1 :]))
+            executor = start_pool(workers)
+
+        def read_jobs():
+            seen = set()
+            for index, (name, output_name, replacements, error) in enumerate(
+                read_payloads(payloads)
+            ):
+                output = output_dir / output_name
+                if error is None and output_name in seen:
+                    error = f"ValueError: Two payloads would be written to {output_name}"
+                seen.add(output_name)
+
+                if error is not None:
+                    result = _new_result(name, output)
+                    result.update(stage="input", error=error)
+                    record(index, result)
+                else:
+                    yield index, name, replacements, output
+
+        jobs = read_jobs()
+        if workers == 1:
+            filler = TemplateFiller(template_path, original_overflow, cache)
+            stack.callback(filler.close)
+            for index, name, replacements, output in jobs:
+                record(index, fill_deck(filler, name, replacements, output))
+        else:
+            executor = start_pool(workers)
+            stack.callback(lambda: executor.shutdown())
+            while True:
+                if lost:
+                    restart()
+                    continue
+                # Payloads are read as the batch proceeds: keep every worker
+                # busy, but only a few payloads in memory
+                job = None
+                if len(pending) < 2 * workers:
+                    job = retry.popleft() if retry else next(jobs, None)
+                if job is None:
+                    if not pending:
+                        break
+                    for future in wait(pending, return_when=FIRST_COMPLETED).done:
+                        finish(future)
+                    continue
+                try:
+                    future = executor.submit(_fill_in_worker, *job[1:])
+                except BrokenProcessPool:
+                    lost.append(job)
+                    continue
+                pending[future] = job
+
+    report_throughput(final=True)
+    if results:
+        print(
+            "Mean per deck: "
+            + ", ".join(
+                f"{stage} {total / len(results):.3f}s"
+                for stage, total in stage_totals.items()
+            )
+        )
+    failed = sum(result["status"] != "ok" for result in results.values())
+    if failed:
+        print(f"{failed} deck(s) failed, see {output_dir / REPORT_NAME}")
+    return [results[index] for index in sorted(results)]
+
+
+# Template of a worker process, loaded once by _start_worker()
+_filler: Optional[TemplateFiller] = None
+
+
+def _start_worker(template_path, original_overflow, use_cache):
+    global _filler
+    _filler = TemplateFiller(
+        template_path, original_overflow, InventoryCache() if use_cache else None
+    )
+
+
+def _fill_in_worker(name, replacements, output):
+    assert _filler is not None
+    return fill_deck(_filler, name, replacements, output)
+
+
+def _fill_alone(jobs, start_pool, record):
+    """Fill each job in a single-process pool of its own, concurrently."""
+    executors = {}
+    try:
+        for job in jobs:
+            executor = start_pool(1)
+            executors[executor.submit(_fill_in_worker, *job[1:])] = (job, executor)
+        for future in as_completed(executors):
+            job, executor = executors[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = _worker_failure(job, e)
+            record(job[0], result)
+    finally:
+        for _, executor in executors.values():
+            executor.shutdown()
+
+
+def _worker_failure(job, error):
+    """Return the report entry of a job whose worker died or failed to start."""
+    _, name, _, output = job
+    result = _new_result(name, output)
+    result.update(stage="worker", error=f"{type(error).__name__}: {error}")
+    return result
+
+
+def _new_result(name, output):
+    return {
+        "input": name,
+        "output": str(output),
+        "status": "failed",
+        "stage": None,
+        "error": None,
+        "log": None,
+        "timings": {},
+    }
+
+
+if __name__ == "__main__":
+    main()
@@ -18,8 +18,13 @@ Grid limits by column count:
 - 5 cols: max 30 slides per grid (5×6) [default]
 - 6 cols: max 42 slides per grid (6×7)
 
+Rendered slides are cached in the temporary directory, keyed by the content of
+each slide and of everything it uses (layout, master, theme, media). Only
+slides that changed since an earlier run are rendered again; use --no-cache to
+render every slide.
+
 Usage:
-    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders]
+    python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders] [--no-cache]
 
 Examples:
     python thumbnail.py presentation.pptx
@@ -41,21 +46,38 @@ Examples:
 """
 
 import argparse
+import hashlib
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
-from inventory import extract_text_inventory
+import lxml.etree
+from inventory import (
+    CACHE_PRUNE_INTERVAL,
+    FontIndex,
+    InventoryCache,
+    get_inventory_as_dict,
+    prune_cache_dir,
+)
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
 
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
+RENDER_CHUNK_PAGES = 8  # Pages rendered by each pdftoppm process
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
+SLIDE_IMAGE_CACHE_DIR = Path(tempfile.gettempdir()) / "pptx_slide_images"
+SLIDE_IMAGE_CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds since an image was last used
+SLIDE_IMAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
 
 # Grid layout constants
 GRID_PADDING = 20  # Padding between thumbnails
@@ -86,6 +108,11 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Render every slide instead of reusing cached slide images",
+    )
 
     args = parser.parse_args()
 
@@ -119,7 +146,12 @@ def main():
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
             # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
+            slide_images = convert_to_images(
+                input_path,
+                Path(temp_dir),
+                CONVERSION_DPI,
+                None if args.no_cache else SlideImageCache(CONVERSION_DPI),
+            )
             if not slide_images:
                 print("Error: No slides found")
                 sys.exit(1)
@@ -165,7 +197,12 @@ def get_placeholder_regions(pptx_path):
     slide_dimensions is a tuple of (width_inches, height_inches).
     """
     prs = Presentation(str(pptx_path))
-    inventory = extract_text_inventory(pptx_path, prs)
+    # Only the boxes are needed: slides inventoried before (e.g. by inventory.py
+    # or replace.py) are read from the cache, the others skip overlap detection
+    # and paragraph analysis
+    inventory = get_inventory_as_dict(
+        pptx_path, fields={"position"}, prs=prs, cache=InventoryCache()
+    )
     placeholder_regions = {}
 
     # Get actual slide dimensions in inches (EMU to inches conversion)
@@ -177,14 +214,14 @@ def get_placeholder_regions(pptx_path):
         slide_idx = int(slide_key.split("-")[1])
         regions = []
 
-        for shape_key, shape_data in shapes.items():
+        for shape_key, shape_dict in shapes.items():
             # The inventory only contains shapes with text, so all shapes should be highlighted
             regions.append(
                 {
-                    "left": shape_data.left,
-                    "top": shape_data.top,
-                    "width": shape_data.width,
-                    "height": shape_data.height,
+                    "left": shape_dict["left"],
+                    "top": shape_dict["top"],
+                    "width": shape_dict["width"],
+                    "height": shape_dict["height"],
                 }
             )
 
@@ -194,8 +231,19 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
+def convert_to_images(pptx_path, temp_dir, dpi, cache=None):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    The PDF is rasterized by parallel pdftoppm workers, each rendering a range
+    of RENDER_CHUNK_PAGES pages. Returns immediately after the first range is
+    rendered, with one Future per slide that resolves to the path of its image,
+    so that thumbnails and grids can be made while later pages are rendered.
+
+    With a SlideImageCache, slides found in the cache are not rendered: they
+    are hidden in a temporary copy of the presentation, so that only the other
+    slides are converted (with their slide numbers unchanged), and the new
+    images are added to the cache.
+    """
     # Detect hidden slides
     print("Analyzing presentation...")
     prs = Presentation(str(pptx_path))
@@ -212,45 +260,80 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
-    # Convert to PDF
-    print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
-
-    # Convert PDF to images
-    print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Image conversion failed")
+    # Find the visible slides to render and the cached images of the others
+    slide_keys = cache.slide_keys(prs) if cache else [None] * total_slides
+    cached_images = {}
+    for slide_num, key in enumerate(slide_keys, 1):
+        image = cache.get(key) if cache and slide_num not in hidden_slides else None
+        if image is not None:
+            cached_images[slide_num] = image
+    to_render = [
+        slide_num
+        for slide_num in range(1, total_slides + 1)
+        if slide_num not in hidden_slides and slide_num not in cached_images
+    ]
+    if cached_images:
+        print(f"Cached slides: {len(cached_images)}, to render: {len(to_render)}")
+
+    rendered_images = []
+    if to_render:
+        source_path = pptx_path
+        if cached_images:
+            # Render a copy in which the cached slides are hidden as well
+            for slide_num in cached_images:
+                prs.slides[slide_num - 1].element.set("show", "0")
+            source_path = temp_dir / "render" / pptx_path.name
+            source_path.parent.mkdir()
+            prs.save(str(source_path))
+
+        pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
+
+        # Convert to PDF
+        print("Converting to PDF...")
+        result = subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(temp_dir),
+                str(source_path),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0 or not pdf_path.exists():
+            raise RuntimeError("PDF conversion failed")
+
+        # Convert PDF to images
+        page_count = get_page_count(pdf_path)
+        print(f"Converting {page_count} pages to images at {dpi} DPI...")
+        rendered_images = render_pages(pdf_path, page_count, temp_dir, dpi)
+
+        if cache:
+
+            def store(image, key):
+                if image.exception() is None:
+                    cache.put(key, image.result())
 
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+            for slide_num, image in zip(to_render, rendered_images):
+                image.add_done_callback(
+                    lambda image, key=slide_keys[slide_num - 1]: store(image, key)
+                )
+
+    # Images of the visible slides: pages are in slide order
+    visible_images = {
+        slide_num: _completed(path) for slide_num, path in cached_images.items()
+    }
+    visible_images.update(zip(to_render, rendered_images))
 
     # Create full list with placeholders for hidden slides
     all_images = []
-    visible_idx = 0
 
     # Get placeholder dimensions from first visible slide
     if visible_images:
-        with Image.open(visible_images[0]) as img:
+        with Image.open(visible_images[min(visible_images)].result()) as img:
             placeholder_size = img.size
     else:
         placeholder_size = (1920, 1080)
@@ -261,16 +344,191 @@ def convert_to_images(pptx_path, temp_dir, dpi):
             placeholder_path = temp_dir / f"hidden-{slide_num:03d}.jpg"
             placeholder_img = create_hidden_slide_placeholder(placeholder_size)
             placeholder_img.save(placeholder_path, "JPEG")
-            all_images.append(placeholder_path)
-        else:
+            all_images.append(_completed(placeholder_path))
+        elif slide_num in visible_images:
             # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
+            all_images.append(visible_images[slide_num])
 
     return all_images
 
 
+class SlideImageCache:
+    """Rendered slide images stored on disk, keyed by what each slide looks like.
+
+    The key of a slide hashes its XML and, recursively, every part it uses
+    through relationships: layout, master, theme, images and other media,
+    charts. Notes and links to other slides are left out, as they are not
+    rendered. It also covers the slide size, the default text style of the
+    presentation, the DPI and the installed fonts, and the position of the
+    slide if it shows its slide number. Entries are shared between
+    presentations and runs.
+
+    The directory is kept within SLIDE_IMAGE_CACHE_MAX_AGE and
+    SLIDE_IMAGE_CACHE_MAX_BYTES by prune_cache_dir(), least recently used
+    images first.
+    """
+
+    # Relationships that do not change how a slide is rendered
+    _SKIPPED_RELATIONSHIPS = {RT.NOTES_SLIDE, RT.SLIDE}
+
+    def __init__(self, dpi, cache_dir=None):
+        """
+        Args:
+            dpi: Resolution the slides are rendered at
+            cache_dir: Directory of the entries (default: SLIDE_IMAGE_CACHE_DIR)
+        """
+        self.dpi = dpi
+        self.cache_dir = Path(cache_dir) if cache_dir else SLIDE_IMAGE_CACHE_DIR
+        self._puts = 0
+
+    def slide_keys(self, prs):
+        """Return the cache key of every slide of a presentation, in slide order."""
+        base = hashlib.sha256(
+            f"{self.dpi}\0{prs.slide_width}x{prs.slide_height}".encode()
+        )
+        base.update(FontIndex.system().fingerprint().encode())
+        default_text_style = prs.part._element.find(qn("p:defaultTextStyle"))
+        if default_text_style is not None:
+            base.update(lxml.etree.tostring(default_text_style))
+
+        # Parts are shared by many slides (layouts, masters, media): hash each once
+        part_digests = {}
+
+        def part_digest(part):
+            if part.partname in part_digests:
+                # A cycle of relationships is hashed by name
+                return part_digests[part.partname] or str(part.partname).encode()
+            part_digests[part.partname] = None
+            digest = hashlib.sha256(part.blob)
+            for rid in sorted(part.rels):
+                rel = part.rels[rid]
+                if rel.reltype in self._SKIPPED_RELATIONSHIPS or (
+                    # A master lists all its layouts; slides hash their own
+                    rel.reltype == RT.SLIDE_LAYOUT
+                    and part.content_type.endswith("slideMaster+xml")
+                ):
+                    continue
+                digest.update(f"\0{rid}\0{rel.reltype}\0".encode())
+                if rel.is_external:
+                    digest.update(rel.target_ref.encode())
+                else:
+                    digest.update(part_digest(rel.target_part))
+            part_digests[part.partname] = digest.digest()
+            return part_digests[part.partname]
+
+        keys = []
+        for slide_idx, slide in enumerate(prs.slides):
+            key = base.copy()
+            key.update(part_digest(slide.part))
+            if b'type="slidenum"' in slide.part.blob:
+                key.update(f"\0slide {slide_idx + 1}".encode())
+            keys.append(key.hexdigest())
+        return keys
+
+    def get(self, key):
+        """Return the path of the image stored for a slide key, or None."""
+        path = self.cache_dir / f"{key}.jpg"
+        try:
+            os.utime(path)  # Mark as recently used for prune_cache_dir()
+        except OSError:
+            return None
+        return path
+
+    def put(self, key, image_path):
+        """Store a copy of a slide image; failing to write the cache is not an error."""
+        path = self.cache_dir / f"{key}.jpg"
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(image_path, temp_path)
+            os.replace(temp_path, path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return
+
+        if self._puts % CACHE_PRUNE_INTERVAL == 0:
+            prune_cache_dir(
+                self.cache_dir,
+                "*.jpg",
+                SLIDE_IMAGE_CACHE_MAX_AGE,
+                SLIDE_IMAGE_CACHE_MAX_BYTES,
+            )
+        self._puts += 1
+
+
+def get_page_count(pdf_path):
+    """Return the number of pages of a PDF, read by pdfinfo."""
+    result = subprocess.run(["pdfinfo", str(pdf_path)], capture_output=True, text=True)
+    for line in result.stdout.splitlines():
+        if line.startswith("Pages:"):
+            return int(line.split(":", 1)[1])
+    raise RuntimeError("Could not read the page count of the PDF")
+
+
+def render_pages(pdf_path, page_count, temp_dir, dpi, workers=None):
+    """Rasterize the pages of a PDF to JPEGs with parallel pdftoppm processes.
+
+    Pages are rendered in ranges of RENDER_CHUNK_PAGES, in page order, by up to
+    workers processes (default: CPU count).
+
+    Returns:
+        list: One Future per page, resolving to the path of its image once the
+        range holding the page is rendered
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = [
+        (first, min(first + RENDER_CHUNK_PAGES - 1, page_count))
+        for first in range(1, page_count + 1, RENDER_CHUNK_PAGES)
+    ]
+    pages = [Future() for _ in range(page_count)]
+    if not ranges:
+        return pages
+
+    def render_range(first, last):
+        prefix = temp_dir / f"slide-{first}"
+        result = subprocess.run(
+            [
+                "pdftoppm",
+                "-jpeg",
+                "-r",
+                str(dpi),
+                "-f",
+                str(first),
+                "-l",
+                str(last),
+                str(pdf_path),
+                str(prefix),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        # Files are named <prefix>-<page number, zero-padded>.jpg
+        images = sorted(temp_dir.glob(f"{prefix.name}-*.jpg"))
+        if result.returncode != 0 or len(images) != last - first + 1:
+            raise RuntimeError("Image conversion failed")
+        return images
+
+    def publish(first, last, rendered):
+        try:
+            images = rendered.result()
+        except Exception as e:
+            for page in range(first, last + 1):
+                pages[page - 1].set_exception(e)
+            return
+        for page, image in zip(range(first, last + 1), images):
+            pages[page - 1].set_result(image)
+
+    executor = ThreadPoolExecutor(max_workers=min(workers, len(ranges)))
+    for first, last in ranges:
+        rendered = executor.submit(render_range, first, last)
+        rendered.add_done_callback(
+            lambda rendered, first=first, last=last: publish(first, last, rendered)
+        )
+    # Let the queued ranges run on; the pages are waited for through their Futures
+    executor.shutdown(wait=False)
+    return pages
+
+
 def create_grids(
     image_paths,
     cols,
@@ -279,7 +537,12 @@ def create_grids(
     placeholder_regions=None,
     slide_dimensions=None,
 ):
-    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid."""
+    """Create multiple thumbnail grids from slide images, max cols×(cols+1) images per grid.
+
+    image_paths may hold Futures of the paths (see convert_to_images). Slide
+    images are turned into thumbnails in parallel as they arrive, and each grid
+    is saved as soon as its thumbnails are ready.
+    """
     # Maximum images per grid is cols × (cols + 1) for better proportions
     max_images_per_grid = cols * (cols + 1)
     grid_files = []
@@ -288,55 +551,128 @@ def create_grids(
         f"Creating grids with {cols} columns (max {max_images_per_grid} images per grid)"
     )
 
-    # Split images into chunks
-    for chunk_idx, start_idx in enumerate(
-        range(0, len(image_paths), max_images_per_grid)
-    ):
-        end_idx = min(start_idx + max_images_per_grid, len(image_paths))
-        chunk_images = image_paths[start_idx:end_idx]
+    image_paths = [
+        path if isinstance(path, Future) else _completed(path) for path in image_paths
+    ]
 
-        # Create grid for this chunk
-        grid = create_grid(
-            chunk_images, cols, width, start_idx, placeholder_regions, slide_dimensions
-        )
+    # Get dimensions; all slides of a presentation have the same size
+    with Image.open(image_paths[0].result()) as img:
+        aspect = img.height / img.width
+    height = int(width * aspect)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        thumbnails = [
+            executor.submit(
+                lambda path, slide_num: create_thumbnail(
+                    path.result(),
+                    width,
+                    height,
+                    (placeholder_regions or {}).get(slide_num),
+                    slide_dimensions,
+                ),
+                path,
+                slide_num,
+            )
+            for slide_num, path in enumerate(image_paths)
+        ]
+
+        # Split images into chunks
+        for chunk_idx, start_idx in enumerate(
+            range(0, len(image_paths), max_images_per_grid)
+        ):
+            end_idx = min(start_idx + max_images_per_grid, len(image_paths))
+
+            # Create grid for this chunk
+            grid = create_grid(
+                thumbnails[start_idx:end_idx], cols, width, height, start_idx
+            )
 
-        # Generate output filename
-        if len(image_paths) <= max_images_per_grid:
-            # Single grid - use base filename without suffix
-            grid_filename = output_path
-        else:
-            # Multiple grids - insert index before extension with dash
-            stem = output_path.stem
-            suffix = output_path.suffix
-            grid_filename = output_path.parent / f"{stem}-{chunk_idx + 1}{suffix}"
-
-        # Save grid
-        grid_filename.parent.mkdir(parents=True, exist_ok=True)
-        grid.save(str(grid_filename), quality=JPEG_QUALITY)
-        grid_files.append(str(grid_filename))
+            # Generate output filename
+            if len(image_paths) <= max_images_per_grid:
+                # Single grid - use base filename without suffix
+                grid_filename = output_path
+            else:
+                # Multiple grids - insert index before extension with dash
+                stem = output_path.stem
+                suffix = output_path.suffix
+                grid_filename = output_path.parent / f"{stem}-{chunk_idx + 1}{suffix}"
+
+            # Save grid
+            grid_filename.parent.mkdir(parents=True, exist_ok=True)
+            grid.save(str(grid_filename), quality=JPEG_QUALITY)
+            grid_files.append(str(grid_filename))
 
     return grid_files
 
 
+def create_thumbnail(image_path, width, height, regions=None, slide_dimensions=None):
+    """Load a slide image as a thumbnail, with placeholder regions outlined.
+
+    The JPEG is decoded in draft mode, which lets the decoder scale it down by
+    up to 8x to no less than the thumbnail size, before the final LANCZOS resize.
+    """
+    with Image.open(image_path) as img:
+        # Get original dimensions before draft decoding
+        orig_w, orig_h = img.size
+        img.draft("RGB", (width, height))
+        img.load()
+
+        # Apply placeholder outlines if enabled
+        if regions:
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            # Calculate scale factors using actual slide dimensions
+            if slide_dimensions:
+                slide_width_inches, slide_height_inches = slide_dimensions
+            else:
+                # Fallback: estimate from image size at CONVERSION_DPI
+                slide_width_inches = orig_w / CONVERSION_DPI
+                slide_height_inches = orig_h / CONVERSION_DPI
+
+            x_scale = img.width / slide_width_inches
+            y_scale = img.height / slide_height_inches
+
+            # Thicker proportional stroke width, relative to the full-size image
+            stroke_width = max(
+                1, round(max(5, min(orig_w, orig_h) // 150) * img.width / orig_w)
+            )
+
+            # Outline each placeholder region in bright red; the outline is
+            # opaque, so it is drawn straight onto the image
+            draw = ImageDraw.Draw(img)
+            for region in regions:
+                # Convert from inches to pixels in the decoded image
+                px_left = int(region["left"] * x_scale)
+                px_top = int(region["top"] * y_scale)
+                px_width = int(region["width"] * x_scale)
+                px_height = int(region["height"] * y_scale)
+                draw.rectangle(
+                    [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+                    outline=(255, 0, 0),
+                    width=stroke_width,
+                )
+
+        img.thumbnail((width, height), Image.Resampling.LANCZOS)
+        return img
+
+
 def create_grid(
-    image_paths,
+    thumbnails,
     cols,
     width,
+    height,
     start_slide_num=0,
-    placeholder_regions=None,
-    slide_dimensions=None,
 ):
-    """Create thumbnail grid from slide images with optional placeholder outlining."""
+    """Create thumbnail grid from Futures of slide thumbnails (see create_thumbnail).
+
+    Thumbnails are pasted in order, each as soon as it is ready.
+    """
     font_size = int(width * FONT_SIZE_RATIO)
     label_padding = int(font_size * LABEL_PADDING_RATIO)
 
-    # Get dimensions
-    with Image.open(image_paths[0]) as img:
-        aspect = img.height / img.width
-    height = int(width * aspect)
-
     # Calculate grid size
-    rows = (len(image_paths) + cols - 1) // cols
+    rows = (len(thumbnails) + cols - 1) // cols
     grid_w = cols * width + (cols + 1) * GRID_PADDING
     grid_h = rows * (height + font_size + label_padding * 2) + (rows + 1) * GRID_PADDING
 
@@ -353,7 +689,7 @@ def create_grid(
         font = ImageFont.load_default()
 
     # Place thumbnails
-    for i, img_path in enumerate(image_paths):
+    for i, thumbnail in enumerate(thumbnails):
         row, col = i // cols, i % cols
         x = col * width + (col + 1) * GRID_PADDING
         y_base = (
@@ -374,76 +710,31 @@ def create_grid(
         # Add thumbnail below label with proportional spacing
         y_thumbnail = y_base + label_padding + font_size + label_padding
 
-        with Image.open(img_path) as img:
-            # Get original dimensions before thumbnail
-            orig_w, orig_h = img.size
-
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
-
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
+        img = thumbnail.result()
+        w, h = img.size
+        tx = x + (width - w) // 2
+        ty = y_thumbnail + (height - h) // 2
+        grid.paste(img, (tx, ty))
+
+        # Add border
+        if BORDER_WIDTH > 0:
+            draw.rectangle(
+                [
+                    (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
+                    (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
+                ],
+                outline="gray",
+                width=BORDER_WIDTH,
+            )
 
-            img.thumbnail((width, height), Image.Resampling.LANCZOS)
-            w, h = img.size
-            tx = x + (width - w) // 2
-            ty = y_thumbnail + (height - h) // 2
-            grid.paste(img, (tx, ty))
+    return grid
 
-            # Add border
-            if BORDER_WIDTH > 0:
-                draw.rectangle(
-                    [
-                        (tx - BORDER_WIDTH, ty - BORDER_WIDTH),
-                        (tx + w + BORDER_WIDTH - 1, ty + h + BORDER_WIDTH - 1),
-                    ],
-                    outline="gray",
-                    width=BORDER_WIDTH,
-                )
 
-    return grid
+def _completed(value):
+    """Return a Future that already holds value."""
+    future = Future()
+    future.set_result(value)
+    return future
 
 
 if __name__ == "__main__":